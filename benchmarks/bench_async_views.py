@@ -0,0 +1,213 @@
+"""Цей модуль порівнює пропускну здатність синхронних та асинхронних поглядів під ASGI.
+
+Запити виконуються ASGI-обробником Django в одному процесі, --clients
+клієнтів одночасно. Повільний клієнт (--client-delay) надсилає тіло запиту
+частинами та повільно приймає відповідь, а --query-delay імітує мережеву
+затримку кожного запиту до бази даних. Потрібна база даних з застосованими
+міграціями:
+
+    DJANGO_SETTINGS_MODULE=... python benchmarks/bench_async_views.py --requests 300
+"""
+
+import os
+import sys
+import time
+import asyncio
+import argparse
+import importlib
+from pathlib import Path
+from time import perf_counter
+from urllib.parse import urlencode
+
+import django
+
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "spa.settings")
+django.setup()
+
+from django.conf import settings  # noqa: E402
+from django.db import connection, connections  # noqa: E402
+from django.urls import clear_url_caches  # noqa: E402
+from django.db.backends import utils  # noqa: E402
+from django.core.handlers.asgi import ASGIHandler  # noqa: E402
+from captcha.models import CaptchaStore  # noqa: E402
+
+from comments.cache import get_cache  # noqa: E402
+from comments.models import Author, Comment  # noqa: E402
+
+
+MODES = {"sync": False, "async": True}
+CHUNK_SIZE = 64
+ORDER_DIRS = ("desc", "asc")
+
+
+def seed(comments: int) -> None:
+    """Ця функція додає кореневі коментарі, якщо їх менше за задану кількість."""
+    author, _ = Author.objects.get_or_create(
+        username="bench_user", email="bench_user@gmail.com"
+    )
+    existing = Comment.objects.filter(parent_id__isnull=True).count()
+    for i in range(existing, comments):
+        Comment.objects.create(text=f"Benchmark comment #{i}", author=author)
+
+
+def slow_down_queries(delay: float) -> None:
+    """Ця функція додає затримку до виконання кожного запиту до бази даних."""
+    execute = utils.CursorWrapper._execute
+
+    def delayed_execute(self, *args, **kwargs):
+        time.sleep(delay)
+        return execute(self, *args, **kwargs)
+
+    utils.CursorWrapper._execute = delayed_execute
+
+
+def get_handler(async_views: bool) -> ASGIHandler:
+    """Ця функція повертає обробник з синхронними або асинхронними поглядами."""
+    settings.COMMENTS_ASYNC_VIEWS = async_views
+    importlib.reload(importlib.import_module("comments.urls"))
+    importlib.reload(importlib.import_module("spa.urls"))
+    clear_url_caches()
+    return ASGIHandler()
+
+
+def get_requests(workload: str, count: int) -> list[tuple[str, str, bytes]]:
+    """Ця функція повертає запити навантаження: метод, шлях з параметрами та тіло."""
+    if workload == "list":
+        return [
+            ("GET", f"/?page={i % 4 + 1}&orderdir={ORDER_DIRS[i % 2]}", b"")
+            for i in range(count)
+        ]
+    requests = []
+    for i in range(count):
+        hashkey = CaptchaStore.generate_key()
+        body = urlencode(
+            {
+                "username": "bench_user",
+                "email": "bench_user@gmail.com",
+                "text": f"Benchmark reply #{i}",
+                "captcha_0": hashkey,
+                "captcha_1": CaptchaStore.objects.get(
+                    hashkey=hashkey
+                ).response,
+            }
+        ).encode()
+        requests.append(("POST", "/add/", body))
+    return requests
+
+
+async def send_request(
+    handler: ASGIHandler, method: str, url: str, body: bytes, delay: float
+) -> int:
+    """Ця функція виконує запит повільного клієнта та повертає код відповіді."""
+    path, _, query = url.partition("?")
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": method,
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": query.encode(),
+        "root_path": "",
+        "headers": [
+            (b"host", b"localhost"),
+            (b"content-type", b"application/x-www-form-urlencoded"),
+            (b"content-length", str(len(body)).encode()),
+        ],
+        "client": ("127.0.0.1", 50000),
+        "server": ("localhost", 80),
+    }
+    chunks = [
+        body[i : i + CHUNK_SIZE] for i in range(0, len(body), CHUNK_SIZE)
+    ] or [b""]
+    status = []
+
+    async def receive() -> dict:
+        await asyncio.sleep(delay)
+        chunk = chunks.pop(0)
+        return {
+            "type": "http.request",
+            "body": chunk,
+            "more_body": bool(chunks),
+        }
+
+    async def send(message: dict) -> None:
+        if message["type"] == "http.response.start":
+            status.append(message["status"])
+        else:
+            await asyncio.sleep(delay)
+
+    await handler(scope, receive, send)
+    return status[0]
+
+
+async def run(
+    handler: ASGIHandler, requests: list, clients: int, delay: float
+) -> tuple[float, dict[int, int]]:
+    """Ця функція виконує запити клієнтами та повертає запити за секунду і коди відповідей."""
+    queue = list(reversed(requests))
+    statuses: dict[int, int] = {}
+
+    async def client() -> None:
+        while queue:
+            status = await send_request(handler, *queue.pop(), delay)
+            statuses[status] = statuses.get(status, 0) + 1
+
+    start = perf_counter()
+    await asyncio.gather(*(client() for _ in range(clients)))
+    return len(requests) / (perf_counter() - start), statuses
+
+
+def main() -> None:
+    """Ця функція виводить кількість запитів за секунду для кожного режиму."""
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=300)
+    parser.add_argument("--clients", type=int, default=50)
+    parser.add_argument("--comments", type=int, default=100)
+    parser.add_argument(
+        "--workload", choices=("list", "add"), nargs="+", default=["list"]
+    )
+    parser.add_argument(
+        "--client-delay",
+        type=float,
+        default=0.01,
+        help="Seconds per body chunk sent and received by a client.",
+    )
+    parser.add_argument(
+        "--query-delay",
+        type=float,
+        default=0.002,
+        help="Seconds added to every database query (a network stand-in).",
+    )
+    args = parser.parse_args()
+
+    seed(args.comments)
+    if connection.vendor == "sqlite":
+        # Concurrent writers wait for the database lock instead of failing
+        # when a deferred transaction is upgraded to a write.
+        connection.settings_dict["OPTIONS"]["timeout"] = 60
+        type(connections["default"])._start_transaction_under_autocommit = (
+            lambda self: self.cursor().execute("BEGIN IMMEDIATE")
+        )
+    if args.query_delay:
+        slow_down_queries(args.query_delay)
+    # Requests are sent without a CSRF token.
+    settings.MIDDLEWARE = [
+        name for name in settings.MIDDLEWARE if "csrf" not in name.lower()
+    ]
+    for workload in args.workload:
+        for mode, async_views in MODES.items():
+            requests = get_requests(workload, args.requests)
+            handler = get_handler(async_views)
+            get_cache().clear()
+            rate, statuses = asyncio.run(
+                run(handler, requests, args.clients, args.client_delay)
+            )
+            print(f"{workload:>4} {mode:>5}: {rate:8.1f} requests/s", statuses)
+
+
+if __name__ == "__main__":
+    main()
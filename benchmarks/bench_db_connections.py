@@ -0,0 +1,105 @@
+"""Цей модуль порівнює кількість запитів за секунду без та з повторним використанням з'єднань.
+
+Запити виконуються через WSGI-обробник Django, тому з'єднання закриваються
+(або залишаються відкритими) так само, як на сервері. Затримка --connect-delay
+імітує TLS та автентифікацію MySQL, якщо замість нього використовується
+SQLite. Потрібна база даних з застосованими міграціями:
+
+    DJANGO_SETTINGS_MODULE=... python benchmarks/bench_db_connections.py --requests 500
+"""
+
+import os
+import sys
+import time
+import argparse
+from pathlib import Path
+from time import perf_counter
+
+import django
+
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "spa.settings")
+django.setup()
+
+from django.db import connection  # noqa: E402
+from django.urls import reverse  # noqa: E402
+from django.test import RequestFactory  # noqa: E402
+from django.core.handlers.wsgi import WSGIHandler  # noqa: E402
+from django.db.backends.signals import connection_created  # noqa: E402
+
+from comments.models import Author, Comment  # noqa: E402
+
+
+MODES = {
+    "close": {"CONN_MAX_AGE": 0, "CONN_HEALTH_CHECKS": False},
+    "reuse": {"CONN_MAX_AGE": 60, "CONN_HEALTH_CHECKS": True},
+}
+
+
+def seed(comments: int) -> None:
+    """Ця функція додає кореневі коментарі, якщо їх менше за задану кількість."""
+    author, _ = Author.objects.get_or_create(
+        username="bench_user", email="bench_user@gmail.com"
+    )
+    existing = Comment.objects.filter(parent_id__isnull=True).count()
+    for i in range(existing, comments):
+        Comment.objects.create(text=f"Benchmark comment #{i}", author=author)
+
+
+def slow_down_connecting(delay: float) -> None:
+    """Ця функція додає затримку до відкриття кожного з'єднання."""
+    get_new_connection = connection.get_new_connection
+
+    def get_delayed_connection(conn_params: dict):
+        time.sleep(delay)
+        return get_new_connection(conn_params)
+
+    connection.get_new_connection = get_delayed_connection
+
+
+def run(handler: WSGIHandler, path: str, requests: int) -> tuple[float, int]:
+    """Ця функція виконує запити та повертає їх кількість за секунду і кількість з'єднань."""
+    opened = []
+    connection_created.connect(
+        lambda **kwargs: opened.append(1), weak=False, dispatch_uid="bench"
+    )
+    factory = RequestFactory()
+    start = perf_counter()
+    for _ in range(requests):
+        environ = factory.get(path, HTTP_HOST="localhost").environ
+        response = handler(environ, lambda status, headers: None)
+        # Closing the response sends request_finished, as a server does.
+        response.close()
+    seconds = perf_counter() - start
+    connection_created.disconnect(dispatch_uid="bench")
+    return requests / seconds, len(opened)
+
+
+def main() -> None:
+    """Ця функція виводить кількість запитів за секунду для кожного режиму."""
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--comments", type=int, default=25)
+    parser.add_argument(
+        "--connect-delay",
+        type=float,
+        default=0.0,
+        help="Seconds added to every new connection (a handshake stand-in).",
+    )
+    args = parser.parse_args()
+
+    seed(args.comments)
+    if args.connect_delay:
+        slow_down_connecting(args.connect_delay)
+    handler = WSGIHandler()
+    path = f"{reverse('api-list')}?fields=id"
+    for mode, options in MODES.items():
+        connection.close()
+        connection.settings_dict.update(options)
+        rate, opened = run(handler, path, args.requests)
+        print(f"{mode:>6}: {rate:8.1f} requests/s, {opened} connections")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""Цей модуль порівнює плани EXPLAIN та час запитів списку без та з індексами.
+
+Скрипт наповнює базу даних коментарями (за замовчуванням 1 000 000 кореневих
+коментарів) та змінює індекси, тому запускайте його лише на окремій базі:
+
+    DJANGO_SETTINGS_MODULE=... python benchmarks/bench_list_indexes.py --comments 1000000
+"""
+
+import os
+import sys
+import argparse
+from pathlib import Path
+from time import perf_counter
+
+import django
+
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "spa.settings")
+django.setup()
+
+from django.db import connection  # noqa: E402
+
+from comments import services  # noqa: E402
+from comments.models import Author, Comment  # noqa: E402
+from comments.tree import rebuild_comment_paths  # noqa: E402
+
+
+ORDERINGS = [
+    services.get_ordering_string(order_by, order_dir)
+    for order_by in ("u", "e", "c")
+    for order_dir in ("asc", "desc")
+]
+
+
+def seed(comments: int, authors: int, batch_size: int = 10_000) -> None:
+    """Ця функція додає авторів та кореневі коментарі до заданої кількості."""
+    if Author.objects.count() < authors:
+        Author.objects.bulk_create(
+            (
+                Author(username=f"user_{i}", email=f"user_{i}@gmail.com")
+                for i in range(Author.objects.count(), authors)
+            ),
+            batch_size=batch_size,
+        )
+    author_ids = list(Author.objects.values_list("id", flat=True))
+
+    existing = Comment.objects.count()
+    for start in range(existing, comments, batch_size):
+        Comment.objects.bulk_create(
+            Comment(
+                text=f"Benchmark comment #{i}",
+                author_id=author_ids[i * 7919 % len(author_ids)],
+            )
+            for i in range(start, min(start + batch_size, comments))
+        )
+        print(f"Seeded {min(start + batch_size, comments)} comments", end="\r")
+    filled = rebuild_comment_paths(batch_size=batch_size)
+    print(f"\nFilled tree paths of {filled} comments")
+    filled = services.repair_comment_author_fields()
+    print(f"Filled author sort keys of {filled} comments")
+
+
+def set_indexes(enabled: bool) -> None:
+    """Ця функція створює або видаляє індекси з мета-опцій моделей."""
+    with connection.schema_editor() as editor:
+        for model in (Author, Comment):
+            for index in model._meta.indexes:
+                if enabled:
+                    editor.add_index(model, index)
+                else:
+                    editor.remove_index(model, index)
+
+
+def time_query(queryset, repeat: int) -> float:
+    """Ця функція повертає найкращий час виконання запиту (мс)."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = perf_counter()
+        list(queryset.all())
+        best = min(best, perf_counter() - start)
+    return best * 1000
+
+
+def report(label: str, page: int, repeat: int) -> None:
+    """Ця функція виводить плани та час запитів списку та пошуку автора."""
+    print(f"\n===== {label} =====")
+    roots = Comment.objects.all().filter(parent_id__isnull=True)
+    offset = (page - 1) * 25
+    for ordering in ORDERINGS:
+        queryset = roots.order_by(ordering)[offset : offset + 25]
+        print(f"\n--- ORDER BY {ordering}, page {page}")
+        print(queryset.explain())
+        print(f"time: {time_query(queryset, repeat):.2f} ms")
+
+    author = Author.objects.order_by("-id").first()
+    lookup = Author.objects.filter(username=author.username, email=author.email)
+    print("\n--- get_author lookup")
+    print(lookup.explain())
+    print(f"time: {time_query(lookup, repeat):.2f} ms")
+
+
+def main() -> None:
+    """Ця функція наповнює базу та виводить порівняння без та з індексами."""
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--comments", type=int, default=1_000_000)
+    parser.add_argument("--authors", type=int, default=100_000)
+    parser.add_argument("--page", type=int, default=1)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    seed(args.comments, args.authors)
+    set_indexes(False)
+    try:
+        report("without indexes", args.page, args.repeat)
+    finally:
+        set_indexes(True)
+    report("with indexes", args.page, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
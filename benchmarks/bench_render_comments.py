@@ -0,0 +1,101 @@
+"""Цей модуль вимірює вартість відображення одного коментаря у дереві з 10 000 вузлів.
+
+Запуск: python benchmarks/bench_render_comments.py [--nodes 10000]
+"""
+
+import os
+import sys
+import argparse
+from pathlib import Path
+from time import perf_counter
+
+import django
+
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "spa.settings")
+django.setup()
+
+from django.utils import timezone  # noqa: E402
+from django.template.loader import render_to_string  # noqa: E402
+
+from comments.models import Author, Comment  # noqa: E402
+from comments.templatetags.comment_filters import render_comments  # noqa: E402
+
+
+def build_tree(nodes: int, branching: int) -> Comment:
+    """Ця функція будує незбережене дерево коментарів з заданою кількістю вузлів.
+
+    Args:
+        nodes (int): Кількість вузлів дерева.
+        branching (int): Кількість відповідей у кожного коментаря (1 - ланцюжок).
+
+    Returns:
+        Comment: Кореневий коментар дерева.
+    """
+    author = Author(username="benchmark", email="benchmark@gmail.com")
+    comments = []
+    for comment_id in range(1, nodes + 1):
+        comment = Comment(
+            id=comment_id,
+            text=f"Benchmark comment #{comment_id}",
+            created=timezone.now(),
+            author=author,
+        )
+        comment.children = []
+        if comments:
+            comments[(comment_id - 2) // branching].children.append(comment)
+        comments.append(comment)
+    return comments[0]
+
+
+def render_comments_recursively(comment: Comment) -> str:
+    """Ця функція відображає дерево попереднім рекурсивним способом."""
+    html = render_to_string(
+        "comments/utils/_comment.html", {"comment": comment}
+    )
+    for child_comment in comment.children:
+        html += f"<div class='child-comments'>{render_comments_recursively(child_comment)}</div>"
+    return html + "</div>"
+
+
+def measure(render, root: Comment, nodes: int, repeat: int) -> tuple[float, str]:
+    """Ця функція повертає найкращий час на вузол (мкс) та отриманий HTML."""
+    best, html = float("inf"), ""
+    for _ in range(repeat):
+        start = perf_counter()
+        html = render(root)
+        best = min(best, perf_counter() - start)
+    return best / nodes * 1_000_000, html
+
+
+def main() -> None:
+    """Ця функція запускає вимірювання та виводить результати."""
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--nodes", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"Rendering a tree of {args.nodes} comments (best of {args.repeat})")
+    for shape, branching in (("wide", 10), ("deep", 1)):
+        root = build_tree(args.nodes, branching)
+        new_cost, new_html = measure(
+            render_comments, root, args.nodes, args.repeat
+        )
+        try:
+            old_cost, old_html = measure(
+                render_comments_recursively, root, args.nodes, args.repeat
+            )
+            assert old_html == new_html, "Rendered HTML differs"
+            old_result = f"{old_cost:8.1f} us/node"
+        except RecursionError:
+            old_result = "RecursionError"
+
+        print(
+            f"{shape:>5} tree | recursive: {old_result:>16} | "
+            f"iterative: {new_cost:8.1f} us/node"
+        )
+
+
+if __name__ == "__main__":
+    main()
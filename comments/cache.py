@@ -0,0 +1,169 @@
+"""Цей модуль використовується для доступу до кешу додатку 'comments'.
+
+Окрім самого кешу модуль надає ключі в просторі імен додатку, версії для
+інвалідації групи записів та обчислення значення одним процесом
+(single-flight), що захищає базу від лавини однакових запитів, коли запис
+зникає з кешу. Усе зберігається в спільному кеші (CACHES), тому однаково
+працює для всіх процесів.
+
+З репліками бази даних кеш не повинен повертати клієнту, закріпленому за
+основною базою, застарілі дані, а дані з репліки, яка ще могла не отримати
+останній запис, не зберігаються (див. can_read_cached та can_store).
+"""
+
+import time
+from collections.abc import Callable, Iterable
+from typing import Any
+
+from django.conf import settings
+from django.core.cache import BaseCache, caches
+
+from general.db.routers import reads_from_replica
+
+
+KEY_NAMESPACE = "comments"
+VERSION_KEY = "version:{}:{}"
+LOCK_KEY = "{}:lock"
+RECENT_WRITE_KEY = "recent-write"
+# Returned by the cache for missing keys, so None can be a cached value.
+MISSING = object()
+
+
+def get_cache() -> BaseCache:
+    """Ця функція повертає кеш, у якому зберігаються дані додатку.
+
+    Returns:
+        BaseCache: Кеш із налаштування COMMENTS_CACHE_ALIAS.
+    """
+    return caches[settings.COMMENTS_CACHE_ALIAS]
+
+
+def make_key(*parts: Any) -> str:
+    """Ця функція повертає ключ кешу в просторі імен додатку.
+
+    Args:
+        *parts (Any): Частини ключа (наприклад, 'thread-html', id, версія).
+
+    Returns:
+        str: Ключ виду 'comments:part:part'.
+    """
+    return ":".join([KEY_NAMESPACE, *map(str, parts)])
+
+
+def get_versions(name: str, ids: Iterable[Any]) -> dict[Any, int]:
+    """Ця функція повертає поточні версії записів групи, створюючи відсутні.
+
+    Початкова версія - поточний час у наносекундах, тому після витіснення
+    лічильника з кешу записи старих версій не можуть бути використані
+    повторно.
+
+    Args:
+        name (str): Назва групи (наприклад, 'thread').
+        ids (Iterable[Any]): Ідентифікатори записів групи.
+
+    Returns:
+        dict[Any, int]: Версія для кожного ідентифікатора.
+    """
+    cache = get_cache()
+    keys = {make_key(VERSION_KEY.format(name, id_)): id_ for id_ in ids}
+    versions = {
+        keys[key]: version for key, version in cache.get_many(keys).items()
+    }
+    for key, id_ in keys.items():
+        if id_ not in versions:
+            cache.add(key, time.time_ns(), timeout=None)
+            versions[id_] = cache.get(key)
+    return versions
+
+
+def bump_versions(name: str, ids: Iterable[Any]) -> None:
+    """Ця функція збільшує версії записів, що робить їхні закешовані значення застарілими.
+
+    Args:
+        name (str): Назва групи.
+        ids (Iterable[Any]): Ідентифікатори записів групи.
+    """
+    cache = get_cache()
+    # Replicas may lag behind this write for up to the pin period.
+    cache.set(
+        make_key(RECENT_WRITE_KEY), 1, settings.DATABASE_PRIMARY_PIN_SECONDS
+    )
+    for id_ in ids:
+        key = make_key(VERSION_KEY.format(name, id_))
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.add(key, time.time_ns(), timeout=None)
+
+
+def can_read_cached() -> bool:
+    """Ця функція повертає, чи можна віддати поточному контексту дані з кешу.
+
+    Якщо є репліки, контекст, що читає з основної бази (клієнт закріплений
+    після запису, запит записав дані, фоновий потік), має бачити свої зміни,
+    тому читає з бази даних, а не з кешу, заповненого з реплік.
+
+    Returns:
+        bool: Чи можна використати закешоване значення.
+    """
+    return not settings.DATABASE_REPLICAS or reads_from_replica()
+
+
+def can_store() -> bool:
+    """Ця функція повертає, чи можна зберегти в кеш щойно обчислене значення.
+
+    Значення, прочитане з репліки протягом DATABASE_PRIMARY_PIN_SECONDS
+    після запису (bump_versions), могло не побачити цей запис, тому не
+    зберігається під новою версією.
+
+    Returns:
+        bool: Чи можна зберегти значення.
+    """
+    if not reads_from_replica():
+        return True
+    return get_cache().get(make_key(RECENT_WRITE_KEY)) is None
+
+
+def get_or_compute(
+    key: str, compute: Callable[[], Any], timeout: int | None
+) -> Any:
+    """Ця функція повертає значення з кешу, обчислюючи його одним процесом.
+
+    Якщо значення немає, процес, що першим захопив блокування (cache.add),
+    обчислює та зберігає його, а інші чекають на результат не довше
+    COMMENTS_CACHE_LOCK_WAIT секунд, після чого обчислюють значення самі.
+
+    Args:
+        key (str): Ключ кешу.
+        compute (Callable[[], Any]): Функція, що обчислює значення.
+        timeout (int | None): Час життя значення в секундах.
+
+    Returns:
+        Any: Значення з кешу або обчислене значення.
+    """
+    if not can_read_cached():
+        return compute()
+    cache = get_cache()
+    value = cache.get(key, MISSING)
+    if value is not MISSING:
+        return value
+
+    lock_key = LOCK_KEY.format(key)
+    if cache.add(lock_key, 1, settings.COMMENTS_CACHE_LOCK_TIMEOUT):
+        try:
+            value = compute()
+            # add() keeps a value that was changed meanwhile (e.g. incr).
+            if can_store():
+                cache.add(key, value, timeout)
+        finally:
+            cache.delete(lock_key)
+        return value
+
+    deadline = time.monotonic() + settings.COMMENTS_CACHE_LOCK_WAIT
+    while time.monotonic() < deadline:
+        time.sleep(settings.COMMENTS_CACHE_LOCK_POLL_INTERVAL)
+        value = cache.get(key, MISSING)
+        if value is not MISSING:
+            return value
+    # The lock holder is too slow or failed.
+    return compute()
@@ -0,0 +1,354 @@
+"""Цей модуль використовується для обслуговування викликів CAPTCHA та їхнього пулу."""
+
+import time
+import logging
+import threading
+from abc import ABC, abstractmethod
+from datetime import timedelta
+from typing import NamedTuple
+
+from django.conf import settings
+from django.utils import timezone
+from django.db import close_old_connections
+from captcha.views import captcha_image
+from captcha.models import CaptchaStore
+from captcha.conf import settings as captcha_settings
+
+from .cache import get_cache
+
+
+logger = logging.getLogger(__name__)
+
+POOL_HEAD_KEY = "comments:captcha-pool:head"
+POOL_TAIL_KEY = "comments:captcha-pool:tail"
+POOL_ITEM_KEY = "comments:captcha-pool:item:{}"
+POOL_HITS_KEY = "comments:captcha-pool:hits"
+POOL_MISSES_KEY = "comments:captcha-pool:misses"
+CAPTCHA_IMAGE_KEY = "comments:captcha-image:{}"
+
+
+class CaptchaPruneStats(NamedTuple):
+    """Названий Tuple, який містить результат очищення викликів CAPTCHA."""
+
+    deleted: int
+    batches: int
+    seconds: float
+
+
+def prune_expired_captchas(
+    batch_size: int = 1000,
+    max_batches: int | None = None,
+    pause: float = 0.0,
+) -> CaptchaPruneStats:
+    """Ця функція видаляє прострочені виклики CAPTCHA пачками.
+
+    Кожна пачка - окремий короткий запит DELETE за первинними ключами, тому
+    таблиця не блокується надовго. Прострочені виклики - найстаріші рядки,
+    тому вони шукаються з початку первинного ключа.
+
+    Args:
+        batch_size (int): Кількість викликів в одній пачці.
+        max_batches (int | None): Максимальна кількість пачок (None - без обмеження).
+        pause (float): Пауза між пачками в секундах.
+
+    Returns:
+        CaptchaPruneStats: Кількість видалених рядків, пачок та витрачений час.
+    """
+    start = time.perf_counter()
+    now = timezone.now()
+    expired = CaptchaStore.objects.filter(expiration__lte=now).order_by("id")
+    deleted = batches = 0
+
+    while max_batches is None or batches < max_batches:
+        ids = list(expired.values_list("id", flat=True)[:batch_size])
+        if not ids:
+            break
+        deleted += CaptchaStore.objects.filter(id__in=ids).delete()[0]
+        batches += 1
+        if len(ids) < batch_size:
+            break
+        if pause:
+            time.sleep(pause)
+
+    stats = CaptchaPruneStats(deleted, batches, time.perf_counter() - start)
+    logger.info(
+        f"Pruned {stats.deleted} expired captchas in {stats.batches} "
+        f"batches ({stats.seconds:.3f} s)"
+    )
+    return stats
+
+
+class PeriodicTask(ABC, threading.Thread):
+    """Фоновий потік, що виконує метод 'task' кожні 'interval' секунд."""
+
+    def __init__(self, name: str, interval: float) -> None:
+        """Цей метод ініціалізує потік.
+
+        Args:
+            name (str): Ім'я потоку.
+            interval (float): Інтервал між виконаннями в секундах.
+        """
+        super().__init__(name=name, daemon=True)
+        self.interval = interval
+        self.runs = 0
+        self.stopped = threading.Event()
+
+    def run(self) -> None:
+        """Цей метод виконує завдання кожні 'interval' секунд до зупинки потоку."""
+        while not self.stopped.wait(self.interval):
+            try:
+                self.task()
+            except Exception:
+                logger.exception(f"Failed to run {self.name}")
+                continue
+            finally:
+                close_old_connections()
+            self.runs += 1
+
+    @abstractmethod
+    def task(self) -> None:
+        """Цей метод виконує одне завдання потоку."""
+
+    def stop(self) -> None:
+        """Цей метод зупиняє потік після поточного завдання."""
+        self.stopped.set()
+
+
+class CaptchaSweeper(PeriodicTask):
+    """Фоновий потік, що періодично видаляє прострочені виклики CAPTCHA.
+
+    Сумарні показники доступні в атрибутах 'runs', 'total_deleted' та
+    'total_seconds'.
+    """
+
+    def __init__(self, interval: float, batch_size: int) -> None:
+        """Цей метод ініціалізує потік.
+
+        Args:
+            interval (float): Інтервал між очищеннями в секундах.
+            batch_size (int): Кількість викликів в одній пачці.
+        """
+        super().__init__("captcha-sweeper", interval)
+        self.batch_size = batch_size
+        self.total_deleted = 0
+        self.total_seconds = 0.0
+
+    def task(self) -> None:
+        """Цей метод видаляє прострочені виклики та оновлює показники."""
+        stats = prune_expired_captchas(self.batch_size)
+        self.total_deleted += stats.deleted
+        self.total_seconds += stats.seconds
+
+
+class CaptchaPoolRefiller(PeriodicTask):
+    """Фоновий потік, що періодично поповнює пул готових викликів CAPTCHA."""
+
+    def __init__(self, interval: float, size: int, batch_size: int) -> None:
+        """Цей метод ініціалізує потік.
+
+        Args:
+            interval (float): Інтервал між поповненнями в секундах.
+            size (int): Цільовий розмір пулу.
+            batch_size (int): Максимальна кількість викликів за одне поповнення.
+        """
+        super().__init__("captcha-pool-refiller", interval)
+        self.size = size
+        self.batch_size = batch_size
+        self.total_added = 0
+
+    def task(self) -> None:
+        """Цей метод поповнює пул та оновлює показники."""
+        self.total_added += refill_captcha_pool(self.size, self.batch_size)
+
+
+_threads: dict[str, PeriodicTask] = {}
+_threads_lock = threading.Lock()
+
+
+def start_captcha_threads() -> list[PeriodicTask]:
+    """Ця функція запускає увімкнені фонові потоки (по одному на процес).
+
+    Очищення вмикається налаштуванням COMMENTS_CAPTCHA_SWEEP_INTERVAL, а
+    поповнення пулу - налаштуванням COMMENTS_CAPTCHA_POOL_REFILL_INTERVAL.
+
+    Returns:
+        list[PeriodicTask]: Запущені потоки.
+    """
+    factories = {}
+    if settings.COMMENTS_CAPTCHA_SWEEP_INTERVAL:
+        factories["sweeper"] = lambda: CaptchaSweeper(
+            settings.COMMENTS_CAPTCHA_SWEEP_INTERVAL,
+            settings.COMMENTS_CAPTCHA_PRUNE_BATCH_SIZE,
+        )
+    if settings.COMMENTS_CAPTCHA_POOL_REFILL_INTERVAL:
+        factories["refiller"] = lambda: CaptchaPoolRefiller(
+            settings.COMMENTS_CAPTCHA_POOL_REFILL_INTERVAL,
+            settings.COMMENTS_CAPTCHA_POOL_SIZE,
+            settings.COMMENTS_CAPTCHA_POOL_REFILL_BATCH_SIZE,
+        )
+
+    with _threads_lock:
+        for name, factory in factories.items():
+            if name not in _threads:
+                _threads[name] = factory()
+                _threads[name].start()
+        return [_threads[name] for name in factories]
+
+
+def get_captcha_challenge() -> str:
+    """Ця функція повертає ключ нового виклику CAPTCHA (з пулу, якщо він не порожній).
+
+    Returns:
+        str: Ключ виклику (hashkey).
+    """
+    return pop_captcha_from_pool() or CaptchaStore.generate_key()
+
+
+def pop_captcha_from_pool() -> str | None:
+    """Ця функція видає готовий виклик з пулу та рахує влучання і промахи.
+
+    Термін дії виданого виклику відраховується від моменту видачі.
+
+    Returns:
+        str | None: Ключ виклику або None, якщо пул порожній.
+    """
+    cache = get_cache()
+    cache.add(POOL_HEAD_KEY, 0, timeout=None)
+    item_key = POOL_ITEM_KEY.format(cache.incr(POOL_HEAD_KEY))
+    hashkey = cache.get(item_key)
+    cache.delete(item_key)
+
+    now = timezone.now()
+    if hashkey and CaptchaStore.objects.filter(
+        hashkey=hashkey, expiration__gt=now
+    ).update(
+        expiration=now + timedelta(minutes=captcha_settings.CAPTCHA_TIMEOUT)
+    ):
+        increment_counter_(POOL_HITS_KEY)
+        return hashkey
+    increment_counter_(POOL_MISSES_KEY)
+    return None
+
+
+def refill_captcha_pool(size: int, limit: int | None = None) -> int:
+    """Ця функція додає до пулу виклики та їхні зображення до заданого розміру.
+
+    Рахуються лише живі виклики: прострочені записи (після періоду без
+    запитів) спочатку пропускаються, тому пул не вважається повним, коли в
+    ньому нічого немає.
+
+    Args:
+        size (int): Цільовий розмір пулу.
+        limit (int | None): Максимальна кількість нових викликів (швидкість поповнення).
+
+    Returns:
+        int: Кількість доданих викликів.
+    """
+    cache = get_cache()
+    cache.add(POOL_HEAD_KEY, 0, timeout=None)
+    cache.add(POOL_TAIL_KEY, 0, timeout=None)
+    live = trim_captcha_pool_()
+    head = cache.get(POOL_HEAD_KEY)
+    if head > cache.get(POOL_TAIL_KEY):
+        # Pops of an empty pool moved the head past the tail.
+        cache.set(POOL_TAIL_KEY, head, timeout=None)
+
+    added = 0
+    while live + added < size and (limit is None or added < limit):
+        hashkey = create_pooled_captcha_()
+        index = cache.incr(POOL_TAIL_KEY)
+        cache.set(
+            POOL_ITEM_KEY.format(index),
+            hashkey,
+            settings.COMMENTS_CAPTCHA_POOL_TIMEOUT,
+        )
+        added += 1
+    return added
+
+
+def create_pooled_captcha_() -> str:
+    """Ця функція створює виклик CAPTCHA та зберігає в кеш його зображення.
+
+    Returns:
+        str: Ключ виклику.
+    """
+    challenge, response = captcha_settings.get_challenge()()
+    store = CaptchaStore.objects.create(
+        challenge=challenge,
+        response=response,
+        expiration=timezone.now()
+        + timedelta(seconds=settings.COMMENTS_CAPTCHA_POOL_TIMEOUT),
+    )
+    get_cache().set(
+        CAPTCHA_IMAGE_KEY.format(store.hashkey),
+        captcha_image(None, store.hashkey).content,
+        settings.COMMENTS_CAPTCHA_POOL_TIMEOUT
+        + captcha_settings.CAPTCHA_TIMEOUT * 60,
+    )
+    return store.hashkey
+
+
+def get_captcha_image(hashkey: str) -> bytes | None:
+    """Ця функція повертає готове зображення виклику з кешу або None."""
+    return get_cache().get(CAPTCHA_IMAGE_KEY.format(hashkey))
+
+
+def get_captcha_pool_size() -> int:
+    """Ця функція повертає кількість живих (не прострочених) викликів у пулі."""
+    return len(get_pool_items_()[1])
+
+
+def get_pool_items_() -> tuple[list[int], dict[str, str]]:
+    """Ця функція повертає індекси пулу від голови до хвоста та живі записи."""
+    cache = get_cache()
+    values = cache.get_many([POOL_HEAD_KEY, POOL_TAIL_KEY])
+    head, tail = values.get(POOL_HEAD_KEY, 0), values.get(POOL_TAIL_KEY, 0)
+    indexes = list(range(head + 1, tail + 1))
+    items = cache.get_many([POOL_ITEM_KEY.format(index) for index in indexes])
+    return indexes, items
+
+
+def trim_captcha_pool_() -> int:
+    """Ця функція пропускає прострочені записи на початку пулу.
+
+    Записи додаються з однаковим часом життя, тому прострочені завжди
+    знаходяться на початку. Голова зсувається атомарним incr, тому виклик,
+    виданий одночасно, не буде виданий ще раз (у гіршому разі пропускається
+    живий запис, який згодом просто стане простроченим).
+
+    Returns:
+        int: Кількість живих записів у пулі.
+    """
+    indexes, items = get_pool_items_()
+    expired = next(
+        (
+            number
+            for number, index in enumerate(indexes)
+            if POOL_ITEM_KEY.format(index) in items
+        ),
+        len(indexes),
+    )
+    if expired:
+        get_cache().incr(POOL_HEAD_KEY, expired)
+    return len(items)
+
+
+def get_captcha_pool_stats() -> dict[str, int]:
+    """Ця функція повертає розмір пулу та лічильники влучань і промахів.
+
+    Returns:
+        dict[str, int]: Показники 'size', 'hits' та 'misses'.
+    """
+    counters = get_cache().get_many([POOL_HITS_KEY, POOL_MISSES_KEY])
+    return {
+        "size": get_captcha_pool_size(),
+        "hits": counters.get(POOL_HITS_KEY, 0),
+        "misses": counters.get(POOL_MISSES_KEY, 0),
+    }
+
+
+def increment_counter_(key: str) -> None:
+    """Ця функція збільшує лічильник у кеші, створюючи його за потреби."""
+    cache = get_cache()
+    cache.add(key, 0, timeout=None)
+    cache.incr(key)
@@ -0,0 +1,113 @@
+"""Цей модуль використовується для збереження даних невалідної форми між запитами.
+
+Дані зберігаються для кожного клієнта окремо: у підписаному cookie, а якщо
+вони не вміщуються в cookie - у кеші під випадковим ключем із cookie.
+Тому вони не залежать від процесу або потоку, що обробляє запит.
+"""
+
+import secrets
+
+from django import http
+from django.conf import settings
+from django.core import signing
+
+from .cache import get_cache
+
+
+FORM_DATA_COOKIE = "comments_form_data"
+FORM_DATA_SALT = "comments.form_state"
+FORM_DATA_KEY = "comments:form-data:{}"
+
+
+def save_form_data(
+    response: http.HttpResponse, data: http.QueryDict, field_names: list[str]
+) -> bool:
+    """Ця функція зберігає дані полів форми для наступного запиту клієнта.
+
+    Args:
+        response (http.HttpResponse): Відповідь, до якої додається cookie.
+        data (http.QueryDict): Дані форми (наприклад, request.POST).
+        field_names (list[str]): Імена полів, що зберігаються.
+
+    Returns:
+        bool: Чи збережені дані (False, якщо вони більші за COMMENTS_FORM_DATA_MAX_SIZE).
+    """
+    values = {name: data.getlist(name) for name in field_names if name in data}
+    value = signing.dumps(values, salt=FORM_DATA_SALT, compress=True)
+    if len(value) > settings.COMMENTS_FORM_DATA_MAX_SIZE:
+        return False
+
+    if len(value) > settings.COMMENTS_FORM_DATA_COOKIE_MAX_SIZE:
+        token = secrets.token_urlsafe()
+        get_cache().set(
+            FORM_DATA_KEY.format(token),
+            values,
+            settings.COMMENTS_FORM_DATA_TIMEOUT,
+        )
+        value = signing.dumps({"token": token}, salt=FORM_DATA_SALT)
+
+    response.set_cookie(
+        FORM_DATA_COOKIE,
+        value,
+        max_age=settings.COMMENTS_FORM_DATA_TIMEOUT,
+        httponly=True,
+        samesite="Lax",
+    )
+    return True
+
+
+def has_form_data(request: http.HttpRequest) -> bool:
+    """Ця функція повертає, чи є в запиті збережені дані форми."""
+    return FORM_DATA_COOKIE in request.COOKIES
+
+
+def load_form_data(request: http.HttpRequest) -> http.QueryDict | None:
+    """Ця функція повертає збережені дані форми клієнта.
+
+    Args:
+        request (http.HttpRequest): Запит із cookie даних форми.
+
+    Returns:
+        http.QueryDict | None: Дані форми або None, якщо їх немає (або вони підроблені).
+    """
+    if not has_form_data(request):
+        return None
+    try:
+        values = signing.loads(
+            request.COOKIES[FORM_DATA_COOKIE],
+            salt=FORM_DATA_SALT,
+            max_age=settings.COMMENTS_FORM_DATA_TIMEOUT,
+        )
+    except signing.BadSignature:
+        return None
+    if "token" in values:
+        values = get_cache().get(FORM_DATA_KEY.format(values["token"]))
+        if values is None:
+            return None
+
+    data = http.QueryDict(mutable=True)
+    for name, field_values in values.items():
+        data.setlist(name, field_values)
+    return data
+
+
+def clear_form_data(
+    request: http.HttpRequest, response: http.HttpResponse
+) -> None:
+    """Ця функція видаляє збережені дані форми клієнта (cookie та запис у кеші).
+
+    Args:
+        request (http.HttpRequest): Запит із cookie даних форми.
+        response (http.HttpResponse): Відповідь, з якої видаляється cookie.
+    """
+    if not has_form_data(request):
+        return
+    response.delete_cookie(FORM_DATA_COOKIE, samesite="Lax")
+    try:
+        values = signing.loads(
+            request.COOKIES[FORM_DATA_COOKIE], salt=FORM_DATA_SALT
+        )
+    except signing.BadSignature:
+        return
+    if "token" in values:
+        get_cache().delete(FORM_DATA_KEY.format(values["token"]))
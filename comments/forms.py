@@ -1,19 +1,58 @@
 """Цей модуль використовується для розміщення класів форм додатку 'comments'."""
 
-import base64
-
 from django import forms
+from django.db import transaction
+from django.core.exceptions import BadRequest
 from django.shortcuts import get_object_or_404
-from django.core.files.base import ContentFile
+from django.core.files import File
 from captcha.fields import CaptchaField, CaptchaTextInput
 from django.contrib.auth.validators import UnicodeUsernameValidator
 
 from .models import Author, Comment
+from .uploads import get_file_from_data_url
+from .images import schedule_comment_image_processing
+from .fragment_cache import bump_thread_versions
+from .pagination import increment_root_comment_count
+from .page_cache import invalidate_list_pages
 
 
 FIELD_WIDGET_ATTRS = {"class": "form-control mb-1"}
 
 
+class LazyCaptchaTextInput(CaptchaTextInput):
+    """Віджет CAPTCHA, що не створює виклик під час відображення форми.
+
+    Виклик (ключ та зображення) запитується скриптом у представлення
+    'captcha-refresh' лише тоді, коли користувач починає заповнювати
+    форму, тому відображення сторінки не записує нічого в базу даних.
+    """
+
+    template_name = "comments/widgets/lazy_captcha.html"
+    is_lazy = True
+
+    def render(self, name, value, attrs=None, renderer=None) -> str:
+        """Цей метод повертає HTML віджета з порожнім ключем CAPTCHA.
+
+        Args:
+            name (str): Ім'я поля.
+            value (Any): Значення поля (ігнорується, бо ключ уже використаний).
+            attrs (dict | None): Атрибути віджета.
+            renderer (BaseRenderer | None): Рендерер форми.
+
+        Returns:
+            str: HTML віджета.
+        """
+        return super(CaptchaTextInput, self).render(
+            name, [None, None], attrs, renderer
+        )
+
+    def get_context(self, name, value, attrs) -> dict:
+        """Цей метод повертає контекст шаблону з URL-адресою нового виклику."""
+        context = super(CaptchaTextInput, self).get_context(name, value, attrs)
+        context["refresh_url"] = self.refresh_url()
+        return context
+
+
 class CommentModelForm(forms.ModelForm):
     """Форма моделі для моделі коментарів для створення коментаря."""
 
@@ -28,8 +67,11 @@ class CommentModelForm(forms.ModelForm):
         required=True,
         widget=forms.EmailInput(attrs=FIELD_WIDGET_ATTRS),
     )
-    captcha = CaptchaField(widget=CaptchaTextInput(attrs=FIELD_WIDGET_ATTRS))
+    captcha = CaptchaField(
+        widget=LazyCaptchaTextInput(attrs=FIELD_WIDGET_ATTRS)
+    )
 
+    @transaction.atomic
     def save(
         self,
         comment_parent_id: str | None,
@@ -42,6 +84,9 @@ class CommentModelForm(forms.ModelForm):
             comment_parent_id (str): Ідентифікатор батьківського коментаря.
             canvas_url (str): URL-адреса зображення в форматі base64.
             commit (bool): Зберегти коментар у базі даних.
+
+        Raises:
+            BadRequest: Якщо гілка коментарів занадто глибока.
         """
         comment: Comment = super().save(commit)
 
@@ -49,6 +94,8 @@ class CommentModelForm(forms.ModelForm):
             comment.parent = get_object_or_404(
                 Comment, id=int(comment_parent_id)
             )
+            if comment.parent.depth + 1 >= Comment.MAX_DEPTH:
+                raise BadRequest("The comment thread is too deep.")
         comment.author = self.get_author()
 
         if canvas_url:
@@ -57,6 +104,18 @@ class CommentModelForm(forms.ModelForm):
                 self.get_image_file_from_(canvas_url, comment.file.name),
             )
         comment.save()
+        if comment.file:
+            transaction.on_commit(
+                lambda: schedule_comment_image_processing(comment.id)
+            )
+
+        if comment.parent_id:
+            comment.update_ancestor_counters()
+            ancestor_ids = comment.get_ancestor_ids()
+            transaction.on_commit(lambda: bump_thread_versions(ancestor_ids))
+        else:
+            transaction.on_commit(increment_root_comment_count)
+        transaction.on_commit(invalidate_list_pages)
 
     def get_author(self) -> Author:
         """Цей метод повертає нового або існуючого автора.
@@ -70,17 +129,16 @@ class CommentModelForm(forms.ModelForm):
         )
         return author
 
-    def get_image_file_from_(
-        self, canvas_url: str, filename: str
-    ) -> ContentFile:
-        """Returns content file from decoded canvas_url."""
+    def get_image_file_from_(self, canvas_url: str, filename: str) -> File:
         """Цей метод повертає файл зображення з декодованої URL-адреси canvas_url.
 
+        Raises:
+            BadRequest: Якщо URL-адреса неправильна або зображення завелике.
+
         Returns:
             Файл: зображення.
         """
-        image_data = canvas_url.split(",")[1]
-        return ContentFile(base64.b64decode(image_data), name=filename)
+        return get_file_from_data_url(canvas_url, filename)
 
     class Meta:
         """Мета-опції для CommentModelForm."""
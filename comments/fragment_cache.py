@@ -0,0 +1,69 @@
+"""Цей модуль використовується для кешування відображених гілок коментарів."""
+
+from collections.abc import Iterable
+
+from django.conf import settings
+
+from .models import Comment
+from .cache import (
+    bump_versions,
+    can_read_cached,
+    can_store,
+    get_cache,
+    get_versions,
+    make_key,
+)
+from .tree import load_comment_trees
+from .templatetags.comment_filters import render_comments
+
+
+THREAD_VERSION_NAME = "thread"
+
+
+def render_comment_threads(roots: Iterable[Comment]) -> list[Comment]:
+    """Ця функція додає до кореневих коментарів HTML їхніх гілок (атрибут 'thread_html').
+
+    Гілки, яких немає в кеші для поточної версії, завантажуються одним
+    запитом, відображаються та зберігаються в кеш. Гілки обрізаються до
+    COMMENTS_INLINE_DEPTH рівнів та COMMENTS_INLINE_REPLIES відповідей.
+
+    Args:
+        roots (Iterable[Comment]): Кореневі коментарі.
+
+    Returns:
+        list[Comment]: Кореневі коментарі з атрибутом 'thread_html'.
+    """
+    roots = list(roots)
+    cache = get_cache()
+    versions = get_versions(THREAD_VERSION_NAME, [root.id for root in roots])
+    keys = {
+        root.id: make_key("thread-html", root.id, versions[root.id])
+        for root in roots
+    }
+    fragments = cache.get_many(keys.values()) if can_read_cached() else {}
+
+    missed_roots = [root for root in roots if keys[root.id] not in fragments]
+    rendered = {
+        keys[root.id]: render_comments(root)
+        for root in load_comment_trees(
+            missed_roots,
+            settings.COMMENTS_INLINE_DEPTH,
+            settings.COMMENTS_INLINE_REPLIES,
+        )
+    }
+    if can_store():
+        cache.set_many(rendered, settings.COMMENTS_THREAD_CACHE_TIMEOUT)
+    fragments.update(rendered)
+
+    for root in roots:
+        root.thread_html = fragments[keys[root.id]]
+    return roots
+
+
+def bump_thread_versions(comment_ids: Iterable[int]) -> None:
+    """Ця функція збільшує версії гілок, що робить їхні фрагменти застарілими.
+
+    Args:
+        comment_ids (Iterable[int]): Ідентифікатори коментарів (предків відповіді).
+    """
+    bump_versions(THREAD_VERSION_NAME, comment_ids)
@@ -0,0 +1,171 @@
+"""Цей модуль використовується для зменшення та перекодування прикріплених зображень.
+
+Зображення обробляються після збереження коментаря в обмеженому пулі
+потоків, тому процес, що обробляє запит, не чекає на Pillow.
+"""
+
+import logging
+import threading
+from io import BytesIO
+from pathlib import PurePosixPath
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.db import close_old_connections
+from PIL import Image, ImageOps, UnidentifiedImageError
+
+from .models import Comment
+from .page_cache import invalidate_list_pages
+from .fragment_cache import bump_thread_versions
+
+
+logger = logging.getLogger(__name__)
+
+MAX_IMAGE_SIZE = (320, 240)
+FILE_EXTENSIONS = {"WEBP": "webp", "JPEG": "jpg"}
+
+_executor: ThreadPoolExecutor | None = None
+_executor_lock = threading.Lock()
+_slots: threading.BoundedSemaphore | None = None
+
+
+def optimize_image(file) -> bytes | None:
+    """Ця функція зменшує зображення до MAX_IMAGE_SIZE та перекодовує його без метаданих.
+
+    Формат та якість задаються налаштуваннями COMMENTS_IMAGE_FORMAT та
+    COMMENTS_IMAGE_QUALITY. Анімовані зображення не змінюються.
+
+    Args:
+        file: Файл зображення, відкритий для читання.
+
+    Returns:
+        bytes | None: Нове зображення або None, якщо файл не є статичним зображенням.
+    """
+    try:
+        image = Image.open(file)
+    except UnidentifiedImageError:
+        return None
+    if getattr(image, "is_animated", False):
+        return None
+
+    # Lets JPEG decode at a reduced scale instead of the full size.
+    image.draft("RGB", (max(MAX_IMAGE_SIZE),) * 2)
+    image = ImageOps.exif_transpose(image)
+    image.thumbnail(MAX_IMAGE_SIZE)
+
+    image_format = settings.COMMENTS_IMAGE_FORMAT
+    has_alpha = image_format == "WEBP" and "A" in image.getbands()
+    image = image.convert("RGBA" if has_alpha else "RGB")
+
+    output = BytesIO()
+    # Only the pixels are written, so EXIF and other metadata are dropped.
+    image.save(
+        output, image_format, quality=settings.COMMENTS_IMAGE_QUALITY
+    )
+    return output.getvalue()
+
+
+def process_comment_image(comment_id: int) -> int | None:
+    """Ця функція замінює прикріплене зображення коментаря на оптимізоване.
+
+    Нове зображення зберігається, лише якщо воно менше за оригінал. Розмір
+    оригіналу записується в поле 'file_original_size' (також для файлів, що
+    не є зображеннями), що позначає файл як оброблений.
+
+    Args:
+        comment_id (int): Ідентифікатор коментаря.
+
+    Returns:
+        int | None: Кількість заощаджених байтів або None, якщо файл не оброблено.
+    """
+    comment = Comment.objects.filter(id=comment_id).first()
+    if comment is None or not comment.file:
+        return None
+
+    storage, old_name = comment.file.storage, comment.file.name
+    original_size = storage.size(old_name)
+    with storage.open(old_name, "rb") as file:
+        data = optimize_image(file)
+    if data is None:
+        # Marks the file as processed, so it is not opened again.
+        Comment.objects.filter(id=comment_id).update(
+            file_original_size=original_size
+        )
+        return None
+
+    new_name = old_name
+    if len(data) < original_size:
+        extension = FILE_EXTENSIONS[settings.COMMENTS_IMAGE_FORMAT]
+        new_name = storage.save(
+            str(PurePosixPath(old_name).with_suffix(f".{extension}")),
+            ContentFile(data),
+        )
+
+    updated = Comment.objects.filter(id=comment_id, file=old_name).update(
+        file=new_name, file_original_size=original_size
+    )
+    if new_name != old_name:
+        storage.delete(old_name if updated else new_name)
+    if new_name != old_name and updated:
+        # Cached threads and pages still link to the deleted file.
+        bump_thread_versions([*comment.get_ancestor_ids(), comment.id])
+        invalidate_list_pages()
+
+    saved = original_size - len(data) if new_name != old_name else 0
+    logger.info(
+        f"Optimized image of comment #{comment_id}: "
+        f"{original_size} -> {original_size - saved} bytes"
+    )
+    return saved
+
+
+def schedule_comment_image_processing(comment_id: int) -> bool:
+    """Ця функція додає обробку зображення коментаря до пулу потоків.
+
+    Пул має COMMENTS_IMAGE_WORKERS потоків і не більше
+    COMMENTS_IMAGE_QUEUE_SIZE завдань у черзі. Якщо черга заповнена, обробка
+    пропускається (її виконає команда optimize_comment_images).
+
+    Args:
+        comment_id (int): Ідентифікатор коментаря.
+
+    Returns:
+        bool: Чи додане завдання до пулу.
+    """
+    executor = get_image_executor()
+    if not _slots.acquire(blocking=False):
+        logger.warning(f"Image queue is full, skipped comment #{comment_id}")
+        return False
+    executor.submit(run_image_task_, comment_id)
+    return True
+
+
+def run_image_task_(comment_id: int) -> None:
+    """Ця функція обробляє зображення у потоці пулу та звільняє місце в черзі."""
+    try:
+        process_comment_image(comment_id)
+    except Exception:
+        logger.exception(f"Failed to optimize image of comment #{comment_id}")
+    finally:
+        close_old_connections()
+        _slots.release()
+
+
+def get_image_executor() -> ThreadPoolExecutor:
+    """Ця функція повертає пул потоків обробки зображень (один на процес).
+
+    Разом з пулом створюється семафор, що обмежує кількість завдань у ньому.
+    """
+    global _executor, _slots
+    with _executor_lock:
+        if _executor is None:
+            _slots = threading.BoundedSemaphore(
+                settings.COMMENTS_IMAGE_WORKERS
+                + settings.COMMENTS_IMAGE_QUEUE_SIZE
+            )
+            _executor = ThreadPoolExecutor(
+                settings.COMMENTS_IMAGE_WORKERS,
+                thread_name_prefix="comment-images",
+            )
+    return _executor
@@ -0,0 +1,34 @@
+"""Цей модуль містить команду для перенесення прикріплених файлів у сховище за хешем."""
+
+from django.core.management.base import BaseCommand, CommandParser
+
+from comments.storage import dedupe_comment_files
+
+
+class Command(BaseCommand):
+    """Команда, що зберігає однакові прикріплені файли один раз."""
+
+    help = (
+        "Moves attached comment files to content-addressed names "
+        "and removes duplicates."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        """Цей метод додає аргументи команди."""
+        parser.add_argument(
+            "--delete-orphans",
+            action="store_true",
+            help="Also delete files no comment refers to "
+            "(do not run while files are being uploaded).",
+        )
+
+    def handle(self, *args, **options) -> None:
+        """Цей метод переносить файли та виводить кількість звільнених байтів."""
+        stats = dedupe_comment_files(options["delete_orphans"])
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Moved {stats.moved} files ({stats.duplicates} duplicates, "
+                f"{stats.orphans} orphans deleted), "
+                f"freed {stats.bytes_freed} bytes."
+            )
+        )
@@ -0,0 +1,30 @@
+"""Цей модуль містить команду для оптимізації ще не оброблених прикріплених зображень."""
+
+from django.core.management.base import BaseCommand
+
+from comments.models import Comment
+from comments.images import process_comment_image
+
+
+class Command(BaseCommand):
+    """Команда, що зменшує та перекодовує прикріплені зображення коментарів."""
+
+    help = "Optimizes attached images that were not processed yet."
+
+    def handle(self, *args, **options) -> None:
+        """Цей метод обробляє файли та виводить кількість заощаджених байтів."""
+        comment_ids = (
+            Comment.objects.exclude(file="")
+            .filter(file__isnull=False, file_original_size__isnull=True)
+            .values_list("id", flat=True)
+            .iterator()
+        )
+        processed = saved = 0
+        for comment_id in comment_ids:
+            saved += process_comment_image(comment_id) or 0
+            processed += 1
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Processed {processed} files, saved {saved} bytes."
+            )
+        )
@@ -0,0 +1,45 @@
+"""Цей модуль містить команду для видалення прострочених викликів CAPTCHA."""
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandParser
+
+from comments.captcha_store import prune_expired_captchas
+
+
+class Command(BaseCommand):
+    """Команда, що видаляє прострочені виклики CAPTCHA пачками."""
+
+    help = "Deletes expired captcha challenges in small batches."
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        """Цей метод додає аргументи команди."""
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=settings.COMMENTS_CAPTCHA_PRUNE_BATCH_SIZE,
+            help="Number of challenges deleted per query.",
+        )
+        parser.add_argument(
+            "--max-batches",
+            type=int,
+            default=None,
+            help="Stop after this many batches.",
+        )
+        parser.add_argument(
+            "--pause",
+            type=float,
+            default=0.0,
+            help="Seconds to sleep between batches.",
+        )
+
+    def handle(self, *args, **options) -> None:
+        """Цей метод видаляє виклики та виводить кількість рядків і витрачений час."""
+        stats = prune_expired_captchas(
+            options["batch_size"], options["max_batches"], options["pause"]
+        )
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Deleted {stats.deleted} expired captchas in "
+                f"{stats.batches} batches ({stats.seconds:.3f} s)."
+            )
+        )
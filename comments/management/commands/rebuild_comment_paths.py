@@ -0,0 +1,38 @@
+"""Цей модуль містить команду для перебудови матеріалізованих шляхів коментарів."""
+
+from django.core.management.base import (
+    BaseCommand,
+    CommandError,
+    CommandParser,
+)
+
+from comments.tree import rebuild_comment_paths
+
+
+class Command(BaseCommand):
+    """Команда, що перебудовує шляхи та глибини всіх коментарів."""
+
+    help = "Rebuilds the materialized tree paths of all comments."
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        """Цей метод додає аргументи команди."""
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Number of comments processed per query.",
+        )
+
+    def handle(self, *args, **options) -> None:
+        """Цей метод перебудовує шляхи та виводить кількість оновлених коментарів.
+
+        Raises:
+            CommandError: Якщо якась гілка глибша за Comment.MAX_DEPTH.
+        """
+        try:
+            updated = rebuild_comment_paths(batch_size=options["batch_size"])
+        except ValueError as error:
+            raise CommandError(error)
+        self.stdout.write(
+            self.style.SUCCESS(f"Rebuilt tree paths of {updated} comments.")
+        )
@@ -0,0 +1,27 @@
+"""Цей модуль містить команду для перерахунку лічильників відповідей коментарів."""
+
+from django.core.management.base import BaseCommand, CommandParser
+
+from comments.tree import recount_comment_replies
+
+
+class Command(BaseCommand):
+    """Команда, що виправляє лічильники відповідей та час активності коментарів."""
+
+    help = "Recounts replies and last activity of all comments."
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        """Цей метод додає аргументи команди."""
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=100,
+            help="Number of top-level threads processed per query.",
+        )
+
+    def handle(self, *args, **options) -> None:
+        """Цей метод перераховує лічильники та виводить кількість виправлених коментарів."""
+        updated = recount_comment_replies(batch_size=options["batch_size"])
+        self.stdout.write(
+            self.style.SUCCESS(f"Recounted replies of {updated} comments.")
+        )
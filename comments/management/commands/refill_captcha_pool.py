@@ -0,0 +1,62 @@
+"""Цей модуль містить команду для поповнення пулу готових викликів CAPTCHA."""
+
+from django.conf import settings
+from django.core.cache.backends.locmem import LocMemCache
+from django.core.management.base import (
+    BaseCommand,
+    CommandError,
+    CommandParser,
+)
+
+from comments.cache import get_cache
+from comments.captcha_store import get_captcha_pool_stats, refill_captcha_pool
+
+
+class Command(BaseCommand):
+    """Команда, що поповнює пул викликів CAPTCHA та виводить його показники."""
+
+    help = "Refills the pool of pre-rendered captchas and prints its stats."
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        """Цей метод додає аргументи команди."""
+        parser.add_argument(
+            "--size",
+            type=int,
+            default=settings.COMMENTS_CAPTCHA_POOL_SIZE,
+            help="Target number of captchas in the pool.",
+        )
+        parser.add_argument(
+            "--limit",
+            type=int,
+            default=None,
+            help="Maximum number of captchas rendered by this run.",
+        )
+        parser.add_argument(
+            "--stats",
+            action="store_true",
+            help="Only print the pool stats.",
+        )
+
+    def handle(self, *args, **options) -> None:
+        """Цей метод поповнює пул та виводить розмір, влучання та промахи.
+
+        Raises:
+            CommandError: Якщо кеш локальний для процесу (locmem), тобто пул
+                команди не побачить жоден процес сервера.
+        """
+        if isinstance(get_cache(), LocMemCache):
+            raise CommandError(
+                "The comments cache is per-process (locmem), so the server "
+                "would never see this pool. Set a shared CACHE_BACKEND or "
+                "use COMMENTS_CAPTCHA_POOL_REFILL_INTERVAL instead."
+            )
+        if not options["stats"]:
+            added = refill_captcha_pool(options["size"], options["limit"])
+            self.stdout.write(
+                self.style.SUCCESS(f"Added {added} captchas to the pool.")
+            )
+        stats = get_captcha_pool_stats()
+        self.stdout.write(
+            f"Pool size: {stats['size']}, hits: {stats['hits']}, "
+            f"misses: {stats['misses']}"
+        )
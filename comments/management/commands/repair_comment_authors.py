@@ -0,0 +1,18 @@
+"""Цей модуль містить команду для виправлення скопійованих даних авторів у коментарях."""
+
+from django.core.management.base import BaseCommand
+
+from comments.services import repair_comment_author_fields
+
+
+class Command(BaseCommand):
+    """Команда, що синхронізує ключі сортування коментарів з їхніми авторами."""
+
+    help = "Copies author username/email into comments where they drifted."
+
+    def handle(self, *args, **options) -> None:
+        """Цей метод виправляє коментарі та виводить їхню кількість."""
+        repaired = repair_comment_author_fields()
+        self.stdout.write(
+            self.style.SUCCESS(f"Repaired author fields of {repaired} comments.")
+        )
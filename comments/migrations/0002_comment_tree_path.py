@@ -0,0 +1,84 @@
+# Generated by Django 4.2.2 on 2026-10-18 13:52
+
+from django.db import migrations, models
+from django.utils.http import int_to_base36
+
+
+# Copied from comments.models, so later changes there do not alter history.
+PATH_STEP_LENGTH = 7
+MAX_PATH_LENGTH = 700
+
+
+def check_comment_depths(apps, schema_editor):
+    # Runs before the columns are added, since MySQL cannot roll back DDL.
+    Comment = apps.get_model('comments', 'Comment')
+    depths, too_deep = {}, []
+    rows = (
+        Comment.objects.order_by('id')
+        .values_list('id', 'parent_id')
+        .iterator(chunk_size=2000)
+    )
+    for comment_id, parent_id in rows:
+        depth = depths.get(parent_id, -1) + 1
+        depths[comment_id] = depth
+        if (depth + 1) * PATH_STEP_LENGTH > MAX_PATH_LENGTH:
+            too_deep.append(comment_id)
+    if too_deep:
+        raise ValueError(
+            f'{len(too_deep)} comments are nested deeper than '
+            f'{MAX_PATH_LENGTH // PATH_STEP_LENGTH} levels and their tree '
+            f'paths would not fit in {MAX_PATH_LENGTH} characters. Move or '
+            f'delete them before migrating, ids: {too_deep[:100]}'
+        )
+
+
+def fill_comment_paths(apps, schema_editor):
+    # Parents have smaller ids, so they always get a path before replies.
+    Comment = apps.get_model('comments', 'Comment')
+    last_id = 0
+    while True:
+        batch = list(
+            Comment.objects.filter(id__gt=last_id)
+            .order_by('id')
+            .only('id', 'parent_id', 'path', 'depth')[:1000]
+        )
+        if not batch:
+            return
+
+        paths = dict(
+            Comment.objects.filter(
+                id__in={c.parent_id for c in batch if c.parent_id}
+            ).values_list('id', 'path')
+        )
+        for comment in batch:
+            parent_path = paths.get(comment.parent_id, '')
+            comment.path = parent_path + int_to_base36(comment.id).rjust(
+                PATH_STEP_LENGTH, '0'
+            )
+            comment.depth = len(parent_path) // PATH_STEP_LENGTH
+            paths[comment.id] = comment.path
+
+        Comment.objects.bulk_update(batch, ['path', 'depth'])
+        last_id = batch[-1].id
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('comments', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RunPython(check_comment_depths, migrations.RunPython.noop),
+        migrations.AddField(
+            model_name='comment',
+            name='depth',
+            field=models.PositiveSmallIntegerField(default=0, editable=False, verbose_name='Tree depth'),
+        ),
+        migrations.AddField(
+            model_name='comment',
+            name='path',
+            field=models.CharField(blank=True, db_index=True, default='', editable=False, max_length=700, verbose_name='Tree path'),
+        ),
+        migrations.RunPython(fill_comment_paths, migrations.RunPython.noop),
+    ]
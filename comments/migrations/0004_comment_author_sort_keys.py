@@ -0,0 +1,43 @@
+# Generated by Django 4.2.2 on 2026-10-18 13:58
+
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+
+
+def fill_comment_author_fields(apps, schema_editor):
+    Comment = apps.get_model('comments', 'Comment')
+    Author = apps.get_model('comments', 'Author')
+    author = Author.objects.filter(pk=OuterRef('author_id'))
+    Comment.objects.update(
+        author_username=Subquery(author.values('username')[:1]),
+        author_email=Subquery(author.values('email')[:1]),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('comments', '0003_list_ordering_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='comment',
+            name='author_email',
+            field=models.EmailField(blank=True, default='', editable=False, max_length=254, verbose_name='Author email address'),
+        ),
+        migrations.AddField(
+            model_name='comment',
+            name='author_username',
+            field=models.CharField(blank=True, default='', editable=False, max_length=100, verbose_name='Author username'),
+        ),
+        migrations.RunPython(fill_comment_author_fields, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='comment',
+            index=models.Index(fields=['parent', 'author_username', 'id'], name='comment_parent_username_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='comment',
+            index=models.Index(fields=['parent', 'author_email', 'id'], name='comment_parent_email_idx'),
+        ),
+    ]
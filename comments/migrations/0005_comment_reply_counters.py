@@ -0,0 +1,78 @@
+# Generated by Django 4.2.2 on 2026-10-18 14:00
+
+from functools import reduce
+from operator import or_
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+def fill_comment_reply_counters(apps, schema_editor):
+    # Whole threads are loaded per batch of roots (by path prefix).
+    Comment = apps.get_model('comments', 'Comment')
+    fields = ('reply_count', 'descendant_count', 'last_activity')
+    last_id = 0
+    while True:
+        root_paths = list(
+            Comment.objects.filter(parent_id__isnull=True, id__gt=last_id)
+            .order_by('id')
+            .values_list('id', 'path')[:100]
+        )
+        if not root_paths:
+            return
+
+        comments = list(
+            Comment.objects.filter(
+                reduce(
+                    or_,
+                    (models.Q(path__startswith=p) for _, p in root_paths),
+                )
+            ).only('id', 'parent_id', 'path', 'created', *fields)
+        )
+        counters = {
+            comment.id: [0, 0, comment.created] for comment in comments
+        }
+        # Deeper comments first, so each child is final before its parent.
+        for comment in sorted(comments, key=lambda c: -len(c.path)):
+            if comment.parent_id in counters:
+                _, descendants, activity = counters[comment.id]
+                parent = counters[comment.parent_id]
+                parent[0] += 1
+                parent[1] += descendants + 1
+                parent[2] = max(parent[2], activity)
+
+        for comment in comments:
+            for field, value in zip(fields, counters[comment.id]):
+                setattr(comment, field, value)
+        Comment.objects.bulk_update(comments, fields)
+        last_id = root_paths[-1][0]
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('comments', '0004_comment_author_sort_keys'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='comment',
+            name='descendant_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='All replies count'),
+        ),
+        migrations.AddField(
+            model_name='comment',
+            name='last_activity',
+            field=models.DateTimeField(default=django.utils.timezone.now, editable=False, verbose_name='Last activity datetime'),
+        ),
+        migrations.AddField(
+            model_name='comment',
+            name='reply_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Direct replies count'),
+        ),
+        migrations.RunPython(fill_comment_reply_counters, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='comment',
+            index=models.Index(fields=['parent', 'last_activity', 'id'], name='comment_parent_activity_idx'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.2 on 2026-10-18 14:14
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('comments', '0005_comment_reply_counters'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='comment',
+            name='file_original_size',
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True, verbose_name='Attached file original size'),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 4.2.2 on 2026-10-18 14:17
+
+import comments.storage
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('comments', '0006_comment_file_original_size'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='comment',
+            name='file',
+            field=models.FileField(blank=True, db_index=True, null=True, storage=comments.storage.get_comment_file_storage, upload_to='comment_files/', verbose_name='Attached comment file'),
+        ),
+    ]
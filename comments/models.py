@@ -1,6 +1,15 @@
 """Цей модуль використовується для розміщення моделей додатку 'comments'."""
 
 from django.db import models
+from django.utils import timezone
+from django.db.models.functions import Greatest
+from django.utils.http import base36_to_int, int_to_base36
+
+from .storage import get_comment_file_storage
+
+
+PATH_STEP_LENGTH = 7
+MAX_PATH_LENGTH = 700
 
 
 class Author(models.Model):
@@ -31,6 +40,13 @@ class Author(models.Model):
         ordering = ["username"]
         verbose_name = "Comment author"
         verbose_name_plural = "Comment authors"
+        indexes = [
+            # Also serves username-only lookups (leftmost prefix).
+            models.Index(
+                fields=["username", "email"], name="author_username_email_idx"
+            ),
+            models.Index(fields=["email"], name="author_email_idx"),
+        ]
 
 
 class _CommentCustomManager(models.Manager):
@@ -54,12 +70,22 @@ class Comment(models.Model):
     text = models.TextField(
         blank=False, null=False, verbose_name="Comment body"
     )
+    # Indexed because the storage counts references to a file before deleting.
     file = models.FileField(
         upload_to="comment_files/",
+        storage=get_comment_file_storage,
         blank=True,
+        db_index=True,
         null=True,
         verbose_name="Attached comment file",
     )
+    # Size of the attached file before the server-side image optimization.
+    file_original_size = models.PositiveIntegerField(
+        null=True,
+        blank=True,
+        editable=False,
+        verbose_name="Attached file original size",
+    )
     created = models.DateTimeField(
         auto_now_add=True, verbose_name="Created datetime"
     )
@@ -77,8 +103,51 @@ class Comment(models.Model):
         Author, on_delete=models.CASCADE, verbose_name="Comment author"
     )
 
+    # Sort keys copied from the author, so the list can be ordered without a join.
+    author_username = models.CharField(
+        max_length=100,
+        blank=True,
+        default="",
+        editable=False,
+        verbose_name="Author username",
+    )
+    author_email = models.EmailField(
+        blank=True,
+        default="",
+        editable=False,
+        verbose_name="Author email address",
+    )
+
+    # Reply counters, maintained when a reply is saved.
+    reply_count = models.PositiveIntegerField(
+        default=0, editable=False, verbose_name="Direct replies count"
+    )
+    descendant_count = models.PositiveIntegerField(
+        default=0, editable=False, verbose_name="All replies count"
+    )
+    last_activity = models.DateTimeField(
+        default=timezone.now,
+        editable=False,
+        verbose_name="Last activity datetime",
+    )
+
+    # Materialized path of the comment (ancestor ids + own id in base36).
+    path = models.CharField(
+        max_length=MAX_PATH_LENGTH,
+        blank=True,
+        default="",
+        db_index=True,
+        editable=False,
+        verbose_name="Tree path",
+    )
+    depth = models.PositiveSmallIntegerField(
+        default=0, editable=False, verbose_name="Tree depth"
+    )
+
     objects = _CommentCustomManager()
 
+    MAX_DEPTH = MAX_PATH_LENGTH // PATH_STEP_LENGTH
+
     def __str__(self) -> str:
         """Цей магічний метод повертає рядкове представлення моделі коментарів.
 
@@ -87,9 +156,120 @@ class Comment(models.Model):
         """
         return f"{self.pk} from {self.author}"
 
+    def save(self, *args, **kwargs) -> None:
+        """Цей метод зберігає коментар, копіюючи ключі сортування автора та заповнюючи шлях."""
+        if self._state.adding:
+            self.author_username = self.author.username
+            self.author_email = self.author.email
+        super().save(*args, **kwargs)
+        if not self.path:
+            # These fields depend on the generated id and 'created' datetime.
+            self.set_tree_path()
+            self.last_activity = self.created
+            Comment.objects.filter(pk=self.pk).update(
+                path=self.path,
+                depth=self.depth,
+                last_activity=self.last_activity,
+            )
+
+    def set_tree_path(self) -> None:
+        """Цей метод обчислює шлях та глибину коментаря за батьківським коментарем."""
+        parent_path = self.parent.path if self.parent_id else ""
+        self.path = parent_path + get_path_step_for_(self.pk)
+        self.depth = len(self.path) // PATH_STEP_LENGTH - 1
+
+    def update_ancestor_counters(self) -> None:
+        """Цей метод оновлює лічильники відповідей та час активності предків коментаря."""
+        ancestor_ids = self.get_ancestor_ids()
+        if not ancestor_ids:
+            return
+        Comment.objects.filter(id=self.parent_id).update(
+            reply_count=models.F("reply_count") + 1
+        )
+        Comment.objects.filter(id__in=ancestor_ids).update(
+            descendant_count=models.F("descendant_count") + 1,
+            last_activity=Greatest(
+                "last_activity", models.Value(self.created)
+            ),
+        )
+
+    def get_ancestor_ids(self) -> list[int]:
+        """Цей метод повертає ідентифікатори предків коментаря (від кореня).
+
+        Returns:
+            list[int]: Ідентифікатори предків коментаря.
+        """
+        return get_ids_from_(self.path)[:-1]
+
+    @property
+    def file_bytes_saved(self) -> int | None:
+        """Ця властивість повертає кількість байтів, заощаджених оптимізацією файлу.
+
+        Returns:
+            int | None: Різниця розмірів або None, якщо файл ще не оброблений.
+        """
+        if not self.file or self.file_original_size is None:
+            return None
+        return self.file_original_size - self.file.size
+
+    def get_descendants(self) -> models.QuerySet:
+        """Цей метод повертає QuerySet нащадків коментаря (один індексований запит).
+
+        Returns:
+            QuerySet: Всі нащадки коментаря.
+        """
+        return Comment.objects.filter(
+            path__startswith=self.path, depth__gt=self.depth
+        )
+
     class Meta:
         """Мета-опції для моделі коментарів."""
 
         ordering = ["-created"]
         verbose_name = "Comment"
         verbose_name_plural = "Comments"
+        indexes = [
+            models.Index(
+                fields=["parent", "created", "id"],
+                name="comment_parent_created_idx",
+            ),
+            models.Index(
+                fields=["parent", "author_username", "id"],
+                name="comment_parent_username_idx",
+            ),
+            models.Index(
+                fields=["parent", "author_email", "id"],
+                name="comment_parent_email_idx",
+            ),
+            models.Index(
+                fields=["parent", "last_activity", "id"],
+                name="comment_parent_activity_idx",
+            ),
+        ]
+
+
+def get_path_step_for_(comment_id: int) -> str:
+    """Ця функція повертає крок матеріалізованого шляху для ідентифікатора коментаря.
+
+    Args:
+        comment_id (int): Ідентифікатор коментаря.
+
+    Returns:
+        str: Ідентифікатор у base36 фіксованої довжини.
+    """
+    return int_to_base36(comment_id).rjust(PATH_STEP_LENGTH, "0")
+
+
+def get_ids_from_(path: str) -> list[int]:
+    """Ця функція повертає ідентифікатори коментарів з матеріалізованого шляху.
+
+    Args:
+        path (str): Матеріалізований шлях.
+
+    Returns:
+        list[int]: Ідентифікатори коментарів від кореня.
+    """
+    return [
+        base36_to_int(path[i : i + PATH_STEP_LENGTH])
+        for i in range(0, len(path), PATH_STEP_LENGTH)
+    ]
@@ -0,0 +1,97 @@
+"""Цей модуль використовується для кешування всієї сторінки списку коментарів.
+
+Сторінка однакова для всіх анонімних читачів, окрім токена CSRF та
+повідомлень. Тому в кеш зберігається шаблон сторінки з "дірками" на їхніх
+місцях, а під час відповіді дірки заповнюються даними поточного запиту.
+Усі сторінки стають застарілими після створення будь-якого коментаря.
+"""
+
+import re
+import hashlib
+
+from django import http
+from django.conf import settings
+from django.contrib.messages import get_messages
+from django.middleware.csrf import get_token
+from django.template.loader import render_to_string
+
+from .cache import (
+    bump_versions,
+    can_read_cached,
+    can_store,
+    get_cache,
+    get_versions,
+    make_key,
+)
+
+
+PAGE_VERSION_NAME = "list-page"
+CSRF_HOLE = "page-cache-csrf-token"
+MESSAGES_HOLE = "<!-- page-cache:messages -->"
+CSRF_INPUT = re.compile(r'(name="csrfmiddlewaretoken" value=")[^"]*"')
+# The markers are placed around the messages in the '_base.html' template.
+MESSAGES_REGION = re.compile(
+    r"<!-- messages -->.*?<!-- /messages -->", re.DOTALL
+)
+
+
+def get_page_cache_key(ordering: str, page: str, site_url: str = "") -> str:
+    """Ця функція повертає ключ сторінки для поточної версії списку.
+
+    Args:
+        ordering (str): Рядок сортування (services.get_ordering_string).
+        page (str): Номер сторінки або курсор.
+        site_url (str): Схема та хост запиту (сторінка містить абсолютну адресу).
+
+    Returns:
+        str: Ключ кешу.
+    """
+    version = get_list_page_version()
+    scope = hashlib.sha256(
+        f"{site_url}{ordering}?{page}".encode()
+    ).hexdigest()
+    return make_key("list-page", version, scope)
+
+
+def get_list_page_version() -> int:
+    """Ця функція повертає поточну версію сторінок списку."""
+    return get_versions(PAGE_VERSION_NAME, ["list"])["list"]
+
+
+def get_cached_page(key: str, request: http.HttpRequest) -> str | None:
+    """Ця функція повертає сторінку з кешу з заповненими дірками або None."""
+    if not can_read_cached():
+        return None
+    template = get_cache().get(key)
+    if template is None:
+        return None
+    return fill_holes_(template, request)
+
+
+def cache_page(key: str, content: str) -> None:
+    """Ця функція зберігає сторінку в кеш, замінюючи токен CSRF та повідомлення дірками.
+
+    Args:
+        key (str): Ключ кешу (get_page_cache_key).
+        content (str): HTML відображеної сторінки.
+    """
+    if not can_store():
+        return
+    template = CSRF_INPUT.sub(rf'\g<1>{CSRF_HOLE}"', content)
+    template = MESSAGES_REGION.sub(MESSAGES_HOLE, template)
+    get_cache().set(key, template, settings.COMMENTS_PAGE_CACHE_TIMEOUT)
+
+
+def fill_holes_(template: str, request: http.HttpRequest) -> str:
+    """Ця функція вставляє в шаблон сторінки токен CSRF та повідомлення запиту."""
+    messages_html = ""
+    if MESSAGES_HOLE in template and len(get_messages(request)):
+        messages_html = render_to_string("_messages.html", request=request)
+    return template.replace(CSRF_HOLE, get_token(request)).replace(
+        MESSAGES_HOLE, messages_html
+    )
+
+
+def invalidate_list_pages() -> None:
+    """Ця функція робить застарілими всі закешовані сторінки списку."""
+    bump_versions(PAGE_VERSION_NAME, ["list"])
@@ -0,0 +1,250 @@
+"""Цей модуль використовується для розміщення пагінаторів додатку 'comments'."""
+
+from typing import Any
+
+from django.conf import settings
+from django.core import signing
+from django.core.paginator import Paginator
+from django.db.models import Model, Q, QuerySet
+from django.utils.functional import cached_property
+
+from .models import Comment
+from .cache import get_cache, get_or_compute, make_key
+
+
+CURSOR_SALT = "comments.pagination.cursor"
+ROOT_COUNT_KEY = make_key("root-count")
+
+
+def get_root_comment_count() -> int:
+    """Ця функція повертає кількість кореневих коментарів з лічильника в кеші.
+
+    Якщо лічильника немає (або минув його TTL), кількість рахується запитом
+    COUNT(*) (одним процесом) та зберігається в кеш на
+    COMMENTS_ROOT_COUNT_TIMEOUT секунд.
+
+    Returns:
+        int: Кількість кореневих коментарів.
+    """
+    return get_or_compute(
+        ROOT_COUNT_KEY,
+        Comment.objects.filter(parent_id__isnull=True).count,
+        settings.COMMENTS_ROOT_COUNT_TIMEOUT,
+    )
+
+
+def increment_root_comment_count() -> None:
+    """Ця функція збільшує лічильник кореневих коментарів (якщо він є в кеші)."""
+    try:
+        get_cache().incr(ROOT_COUNT_KEY)
+    except ValueError:
+        pass  # The counter will be recounted on the next read.
+
+
+class RootCommentPaginator(Paginator):
+    """Пагінатор кореневих коментарів без запиту COUNT(*) на кожній сторінці.
+
+    Кількість береться з лічильника get_root_comment_count, а налаштування
+    COMMENTS_MAX_PAGES обмежує кількість доступних сторінок.
+    """
+
+    @cached_property
+    def count(self) -> int:
+        """Ця властивість повертає (обмежену) кількість кореневих коментарів."""
+        count = get_root_comment_count()
+        if settings.COMMENTS_MAX_PAGES:
+            count = min(count, settings.COMMENTS_MAX_PAGES * self.per_page)
+        return count
+
+
+class InvalidCursor(Exception):
+    """Виняток, що виникає при підробленому або невідповідному курсорі."""
+
+
+class CursorPage:
+    """Сторінка курсорної пагінації (без номера сторінки та загальної кількості)."""
+
+    is_cursor_page = True
+
+    def __init__(
+        self,
+        object_list: list[Model],
+        paginator: "CursorPaginator",
+        has_next: bool,
+        has_previous: bool,
+    ) -> None:
+        """Цей метод ініціалізує сторінку та курсори сусідніх сторінок.
+
+        Args:
+            object_list (list[Model]): Об'єкти сторінки.
+            paginator (CursorPaginator): Пагінатор, що створив сторінку.
+            has_next (bool): Чи існує наступна сторінка.
+            has_previous (bool): Чи існує попередня сторінка.
+        """
+        self.object_list = object_list
+        self.paginator = paginator
+        self._has_next = has_next
+        self._has_previous = has_previous
+
+    def __len__(self) -> int:
+        """Цей магічний метод повертає кількість об'єктів на сторінці."""
+        return len(self.object_list)
+
+    def __iter__(self):
+        """Цей магічний метод повертає ітератор об'єктів сторінки."""
+        return iter(self.object_list)
+
+    def has_next(self) -> bool:
+        """Цей метод повертає, чи існує наступна сторінка."""
+        return self._has_next
+
+    def has_previous(self) -> bool:
+        """Цей метод повертає, чи існує попередня сторінка."""
+        return self._has_previous
+
+    def has_other_pages(self) -> bool:
+        """Цей метод повертає, чи існують інші сторінки."""
+        return self._has_next or self._has_previous
+
+    @property
+    def next_cursor(self) -> str | None:
+        """Ця властивість повертає курсор наступної сторінки."""
+        if not self._has_next:
+            return None
+        return self.paginator.get_cursor_for_(self.object_list[-1], "next")
+
+    @property
+    def previous_cursor(self) -> str | None:
+        """Ця властивість повертає курсор попередньої сторінки."""
+        if not self._has_previous:
+            return None
+        return self.paginator.get_cursor_for_(self.object_list[0], "prev")
+
+
+class CursorPaginator:
+    """Пагінатор за ключем (keyset): глибокі сторінки коштують як перша.
+
+    Об'єкти сортуються за переданим полем з додатковим сортуванням за 'id',
+    а курсор - підписаний (захищений від підробки) рядок з ідентифікатором
+    останнього або першого об'єкта сторінки. Значення поля сортування
+    (наприклад, email автора) в курсор не потрапляє.
+    """
+
+    def __init__(self, queryset: QuerySet, per_page: int, ordering: str):
+        """Цей метод ініціалізує пагінатор.
+
+        Args:
+            queryset (QuerySet): Об'єкти для пагінації.
+            per_page (int): Кількість об'єктів на сторінці.
+            ordering (str): Рядок сортування Django (наприклад, '-created').
+        """
+        self.queryset = queryset
+        self.per_page = per_page
+        self.ordering = ordering
+        self.field = ordering.lstrip("-")
+        self.descending = ordering.startswith("-")
+
+    def page(self, cursor: str | None) -> CursorPage:
+        """Цей метод повертає сторінку для переданого курсора.
+
+        Args:
+            cursor (str | None): Курсор або None для першої сторінки.
+
+        Raises:
+            InvalidCursor: Якщо курсор підроблений або не відповідає сортуванню.
+
+        Returns:
+            CursorPage: Сторінка об'єктів.
+        """
+        if not cursor:
+            objects = self.get_ordered_(self.queryset)[: self.per_page + 1]
+            return self.make_page_of_(list(objects), has_previous=False)
+
+        value, pk, direction = self.decode_(cursor)
+        if direction == "next":
+            objects = list(
+                self.get_ordered_(
+                    self.queryset.filter(self.get_after_filter_(value, pk))
+                )[: self.per_page + 1]
+            )
+            return self.make_page_of_(objects, has_previous=True)
+
+        objects = list(
+            self.get_ordered_(
+                self.queryset.filter(self.get_before_filter_(value, pk)),
+                reverse=True,
+            )[: self.per_page + 1]
+        )
+        has_previous = len(objects) > self.per_page
+        return CursorPage(
+            objects[: self.per_page][::-1], self, True, has_previous
+        )
+
+    def make_page_of_(
+        self, objects: list[Model], has_previous: bool
+    ) -> CursorPage:
+        """Цей метод повертає сторінку з об'єктів, вибраних з запасом в один."""
+        has_next = len(objects) > self.per_page
+        return CursorPage(
+            objects[: self.per_page], self, has_next, has_previous
+        )
+
+    def get_ordered_(self, queryset: QuerySet, reverse: bool = False):
+        """Цей метод повертає QuerySet, відсортований за полем та 'id'."""
+        descending = self.descending != reverse
+        symbol = "-" if descending else ""
+        return queryset.order_by(f"{symbol}{self.field}", f"{symbol}id")
+
+    def get_after_filter_(self, value: Any, pk: int) -> Q:
+        """Цей метод повертає фільтр об'єктів, що йдуть після ключа (value, pk)."""
+        lookup = "lt" if self.descending else "gt"
+        return Q(**{f"{self.field}__{lookup}": value}) | Q(
+            **{self.field: value, f"id__{lookup}": pk}
+        )
+
+    def get_before_filter_(self, value: Any, pk: int) -> Q:
+        """Цей метод повертає фільтр об'єктів, що йдуть перед ключем (value, pk)."""
+        lookup = "gt" if self.descending else "lt"
+        return Q(**{f"{self.field}__{lookup}": value}) | Q(
+            **{self.field: value, f"id__{lookup}": pk}
+        )
+
+    def get_cursor_for_(self, obj: Model | dict, direction: str) -> str:
+        """Цей метод повертає підписаний курсор для об'єкта.
+
+        Args:
+            obj (Model | dict): Перший або останній об'єкт сторінки
+                (або рядок QuerySet.values() з ключем 'id').
+            direction (str): 'next' або 'prev'.
+
+        Returns:
+            str: Курсор.
+        """
+        pk = obj["id"] if isinstance(obj, dict) else obj.pk
+        # No timestamp, so the same page always has the same cursor (and URL).
+        return signing.Signer(salt=CURSOR_SALT).sign_object(
+            [self.ordering, pk, direction]
+        )
+
+    def decode_(self, cursor: str) -> tuple[Any, int, str]:
+        """Цей метод перевіряє курсор та повертає ключ сортування і напрямок.
+
+        Значення поля сортування вибирається за первинним ключем з курсора.
+
+        Raises:
+            InvalidCursor: Якщо курсор підроблений, не відповідає сортуванню
+                або об'єкт курсора вже не існує.
+        """
+        try:
+            ordering, pk, direction = signing.Signer(
+                salt=CURSOR_SALT
+            ).unsign_object(cursor)
+        except (signing.BadSignature, TypeError, ValueError):
+            raise InvalidCursor
+        if ordering != self.ordering or direction not in ("next", "prev"):
+            raise InvalidCursor
+
+        values = self.queryset.filter(pk=pk).values_list(self.field)[:1]
+        if not values:
+            raise InvalidCursor
+        return values[0][0], pk, direction
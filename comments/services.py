@@ -1,5 +1,26 @@
 """Цей модуль використовується для розподілу бізнес-логіки між модулями."""
 
+from datetime import datetime
+
+from django.db.models import F, Model, OuterRef, Q, Subquery
+
+from .models import Author, Comment
+
+
+# Public names of the comment fields of the JSON API and their columns.
+# The API is public, so the author's email is never exposed.
+API_FIELDS = {
+    "id": "id",
+    "username": "author_username",
+    "home_page": "home_page",
+    "text": "text",
+    "file": "file",
+    "created": "created",
+    "last_activity": "last_activity",
+    "reply_count": "reply_count",
+    "descendant_count": "descendant_count",
+}
+
 
 def get_ordering_string(order_by: str, order_dir: str) -> str | None:
     """Ця функція повертає рядок сортування або None після перевірки переданих GET-параметрів.
@@ -27,7 +48,9 @@ def are_ordering_parameters_valid(order_by: str, order_dir: str) -> bool:
     Returns:
         bool: Чи валідні передані параметри.
     """
-    if (order_dir not in ("asc", "desc")) or (order_by not in ("u", "e", "c")):
+    if (order_dir not in ("asc", "desc")) or (
+        order_by not in ("u", "e", "c", "a")
+    ):
         return False
     return True
 
@@ -53,5 +76,62 @@ def get_correct_(order_by: str) -> str:
     Returns:
         str: Правильне ім'я поля.
     """
-    fields = {"u": "author__username", "e": "author__email", "c": "created"}
+    fields = {
+        "u": "author_username",
+        "e": "author_email",
+        "c": "created",
+        "a": "last_activity",
+    }
     return fields[order_by]
+
+
+def get_api_fields(fields: str | None) -> list[str] | None:
+    """Ця функція повертає список полів JSON API або None після перевірки GET-параметра.
+
+    Args:
+        fields (str | None): Імена полів через кому (None - усі поля).
+
+    Returns:
+        list[str] | None: Імена полів без повторів або None.
+    """
+    if not fields:
+        return list(API_FIELDS)
+    names = list(dict.fromkeys(name.strip() for name in fields.split(",")))
+    if not all(name in API_FIELDS for name in names):
+        return None
+    return names
+
+
+def get_latest_comment_key() -> tuple[int, datetime] | None:
+    """Ця функція повертає ідентифікатор та час створення останнього коментаря.
+
+    Запит читає один рядок з кінця первинного ключа, тому він дешевий для
+    таблиці будь-якого розміру. Будь-який новий коментар (кореневий або
+    відповідь) змінює результат.
+
+    Returns:
+        tuple[int, datetime] | None: Ідентифікатор та час або None, якщо коментарів немає.
+    """
+    return Comment.objects.order_by("-id").values_list("id", "created").first()
+
+
+def repair_comment_author_fields(
+    comment_model: type[Model] = Comment, author_model: type[Model] = Author
+) -> int:
+    """Ця функція копіює ім'я та email автора в коментарі, де вони не збігаються.
+
+    Args:
+        comment_model (type[Model]): Модель коментарів (також історична модель міграції).
+        author_model (type[Model]): Модель авторів (також історична модель міграції).
+
+    Returns:
+        int: Кількість виправлених коментарів.
+    """
+    author = author_model.objects.filter(pk=OuterRef("author_id"))
+    return comment_model.objects.filter(
+        ~Q(author_username=F("author__username"))
+        | ~Q(author_email=F("author__email"))
+    ).update(
+        author_username=Subquery(author.values("username")[:1]),
+        author_email=Subquery(author.values("email")[:1]),
+    )
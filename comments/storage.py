@@ -0,0 +1,297 @@
+"""Цей модуль використовується для зберігання прикріплених файлів за їхнім вмістом.
+
+Кожен файл зберігається один раз під SHA-256 його вмісту, тому однакові
+завантаження (той самий мем чи знімок екрана) посилаються на один файл.
+Файл видаляється, лише коли на нього не посилається жоден коментар.
+
+Ім'я вже наявного файлу повертається новому коментарю ще до фіксації його
+транзакції, тому такий файл отримує "оренду" на COMMENTS_FILE_LEASE_SECONDS
+секунд, протягом якої він не видаляється, навіть якщо посилань ще не видно.
+Перевірка та оренда виконуються під файловим блокуванням.
+"""
+
+import os
+import re
+import time
+import hashlib
+import logging
+import posixpath
+import tempfile
+from typing import NamedTuple
+from contextlib import contextmanager
+
+from django.apps import apps
+from django.conf import settings
+from django.core.files import File, locks
+from django.core.exceptions import SuspiciousFileOperation
+from django.core.files.storage import FileSystemStorage, storages
+
+
+logger = logging.getLogger(__name__)
+
+# Lock and lease files, outside the upload directories (not served).
+META_DIRECTORY = ".content"
+CONTENT_NAME = re.compile(
+    r"(?:^|/)[0-9a-f]{2}/[0-9a-f]{2}/(?P<digest>[0-9a-f]{64})(?:\.\w+)?$"
+)
+# Digest directories of a content-addressed name ('ab/cd').
+DIGEST_DIRECTORY = re.compile(r"(?:^|/)[0-9a-f]{2}/[0-9a-f]{2}$")
+# The extension comes from the client, so only short plain ones are kept.
+EXTENSION = re.compile(r"\.[a-z0-9]{1,10}")
+
+
+class ContentAddressedStorage(FileSystemStorage):
+    """Файлове сховище, що зберігає кожен вміст один раз під його хешем.
+
+    Файл 'comment_files/photo.jpg' зберігається як
+    'comment_files/ab/cd/<sha256>.jpg'. Хеш рахується під час запису
+    завантаження на диск, тому файл не читається двічі.
+    """
+
+    def get_available_name(self, name: str, max_length: int = None) -> str:
+        """Цей метод повертає ім'я, остаточне ім'я з якого вміститься в max_length.
+
+        Остаточне ім'я визначає хеш, тому ім'я лише втрачає розширення, якщо
+        з ним не вміщується.
+
+        Raises:
+            SuspiciousFileOperation: Якщо не вміщується навіть ім'я без розширення.
+        """
+        if max_length is None:
+            return name
+        directory = DIGEST_DIRECTORY.sub("", posixpath.dirname(name))
+        length = len(posixpath.join(directory, "ab", "cd", "0" * 64))
+        if length + len(get_extension_(name)) > max_length:
+            name = posixpath.splitext(name)[0]
+        if length > max_length:
+            raise SuspiciousFileOperation(
+                f"Storage can not find an available filename for '{name}'."
+            )
+        return name
+
+    def _save(self, name: str, content: File) -> str:
+        """Цей метод зберігає вміст (якщо його ще немає) та повертає його ім'я."""
+        return self.store_(name, content)[0]
+
+    def store_(self, name: str, content: File) -> tuple[str, bool]:
+        """Цей метод записує вміст під його хешем у теку імені 'name'.
+
+        Вміст спочатку записується в тимчасовий файл поруч, а потім атомарно
+        перейменовується, тому неповний файл ніколи не має остаточного імені.
+
+        Args:
+            name (str): Запропоноване ім'я файлу (з нього беруться тека та розширення).
+            content (File): Вміст файлу.
+
+        Returns:
+            tuple[str, bool]: Ім'я файлу та чи був він створений (False - дублікат).
+        """
+        # A new name derived from a stored one (e.g. an optimized image) must
+        # not nest another pair of digest directories.
+        directory = DIGEST_DIRECTORY.sub("", posixpath.dirname(name))
+        extension = get_extension_(name)
+        os.makedirs(self.path(directory), exist_ok=True)
+
+        digest = hashlib.sha256()
+        with tempfile.NamedTemporaryFile(
+            dir=self.path(directory), prefix=".upload-", delete=False
+        ) as temporary:
+            for chunk in content.chunks():
+                digest.update(chunk)
+                temporary.write(chunk)
+
+        hexdigest = digest.hexdigest()
+        name = posixpath.join(
+            directory, hexdigest[:2], hexdigest[2:4], hexdigest + extension
+        )
+        path = self.path(name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with self.lock_(name):
+            if os.path.exists(path):
+                os.remove(temporary.name)
+                # The new reference is not committed yet.
+                self.lease_(name)
+                return name, False
+            os.replace(temporary.name, path)
+        os.chmod(path, self.file_permissions_mode or 0o644)
+        return name, True
+
+    def delete(self, name: str) -> None:
+        """Цей метод видаляє файл, лише якщо на нього не посилається жоден коментар.
+
+        Тому його потрібно викликати після оновлення або видалення коментаря.
+        Орендований файл (щойно виданий дублікат) також не видаляється.
+        """
+        if not name or not self.exists(name):
+            return
+        with self.lock_(name):
+            if is_file_referenced(name) or self.is_leased_(name):
+                return
+            super().delete(name)
+            lease_path = self.get_meta_path_(name, ".lease")
+            if os.path.exists(lease_path):
+                os.remove(lease_path)
+
+    @contextmanager
+    def lock_(self, name: str):
+        """Цей метод блокує файл (між процесами) на час перевірки та зміни.
+
+        Файл блокування видаляється після зміни, тому файли блокувань не
+        накопичуються. Процес, що заблокував уже видалений файл, повторює
+        спробу з новим файлом.
+        """
+        lock_path = self.get_meta_path_(name, ".lock")
+        while True:
+            lock_file = open(lock_path, "ab")
+            locks.lock(lock_file, locks.LOCK_EX)
+            try:
+                if os.path.samestat(
+                    os.fstat(lock_file.fileno()), os.stat(lock_path)
+                ):
+                    break
+            except FileNotFoundError:
+                pass
+            locks.unlock(lock_file)
+            lock_file.close()
+        try:
+            yield
+        finally:
+            # Removed while still held, so the next holder opens a new file.
+            os.remove(lock_path)
+            locks.unlock(lock_file)
+            lock_file.close()
+
+    def lease_(self, name: str) -> None:
+        """Цей метод оновлює оренду файлу (час зміни файлу оренди)."""
+        with open(self.get_meta_path_(name, ".lease"), "ab"):
+            pass
+        os.utime(self.get_meta_path_(name, ".lease"))
+
+    def is_leased_(self, name: str) -> bool:
+        """Цей метод повертає, чи діє оренда файлу."""
+        try:
+            leased = os.path.getmtime(self.get_meta_path_(name, ".lease"))
+        except FileNotFoundError:
+            return False
+        return time.time() - leased < settings.COMMENTS_FILE_LEASE_SECONDS
+
+    def get_meta_path_(self, name: str, suffix: str) -> str:
+        """Цей метод повертає шлях службового файлу (блокування або оренди)."""
+        directory = self.path(META_DIRECTORY)
+        os.makedirs(directory, exist_ok=True)
+        digest = hashlib.sha256(name.encode()).hexdigest()
+        return os.path.join(directory, digest + suffix)
+
+
+def get_extension_(name: str) -> str:
+    """Ця функція повертає розширення імені в нижньому регістрі або "".
+
+    Розширення, довше за 10 символів або з іншими символами, крім латинських
+    літер та цифр, відкидається.
+    """
+    extension = posixpath.splitext(name)[1].lower()
+    return extension if EXTENSION.fullmatch(extension) else ""
+
+
+def get_comment_file_storage() -> ContentAddressedStorage:
+    """Ця функція повертає сховище прикріплених файлів (STORAGES['comment_files'])."""
+    return storages["comment_files"]
+
+
+def is_content_addressed(name: str) -> bool:
+    """Ця функція повертає, чи збережений файл під хешем свого вмісту."""
+    return CONTENT_NAME.search(name) is not None
+
+
+def is_file_referenced(name: str) -> bool:
+    """Ця функція повертає, чи посилається на файл хоча б один коментар."""
+    Comment = apps.get_model("comments", "Comment")
+    return Comment.objects.filter(file=name).exists()
+
+
+class DedupeStats(NamedTuple):
+    """Названий Tuple, який містить результат перенесення файлів у сховище за хешем."""
+
+    moved: int
+    duplicates: int
+    orphans: int
+    bytes_freed: int
+
+
+def dedupe_comment_files(delete_orphans: bool = False) -> DedupeStats:
+    """Ця функція переносить старі прикріплені файли у сховище за хешем.
+
+    Для кожного файлу, збереженого під іменем з завантаження, зберігається
+    його вміст під хешем, посилання всіх коментарів оновлюються, а старий
+    файл видаляється. Однакові файли таким чином стають одним. Гілки
+    змінених коментарів та сторінки списку стають застарілими в кеші.
+
+    Args:
+        delete_orphans (bool): Чи видаляти файли, на які не посилається жоден
+            коментар (не слід вмикати під час завантажень файлів).
+
+    Returns:
+        DedupeStats: Кількість перенесених файлів, дублікатів, видалених
+            файлів без посилань та звільнених байтів.
+    """
+    Comment = apps.get_model("comments", "Comment")
+    storage = get_comment_file_storage()
+    names = (
+        Comment.objects.exclude(file="")
+        .filter(file__isnull=False)
+        .order_by()
+        .values_list("file", flat=True)
+        .distinct()
+    )
+    moved = duplicates = orphans = bytes_freed = 0
+    thread_ids = set()
+
+    for old_name in list(names):
+        if is_content_addressed(old_name) or not storage.exists(old_name):
+            continue
+        size = storage.size(old_name)
+        with storage.open(old_name, "rb") as file:
+            new_name, created = storage.store_(old_name, file)
+        for comment in Comment.objects.filter(file=old_name).only("path"):
+            thread_ids.update(comment.get_ancestor_ids(), [comment.id])
+        Comment.objects.filter(file=old_name).update(file=new_name)
+        storage.delete(old_name)
+        moved += 1
+        if not created:
+            duplicates += 1
+            bytes_freed += size
+
+    if thread_ids:
+        # Cached threads and pages still link to the deleted files.
+        from .page_cache import invalidate_list_pages
+        from .fragment_cache import bump_thread_versions
+
+        bump_thread_versions(thread_ids)
+        invalidate_list_pages()
+
+    if delete_orphans:
+        upload_to = Comment._meta.get_field("file").upload_to
+        for name in list_files_(storage, upload_to.rstrip("/")):
+            if not is_file_referenced(name):
+                bytes_freed += storage.size(name)
+                storage.delete(name)
+                orphans += 1
+
+    stats = DedupeStats(moved, duplicates, orphans, bytes_freed)
+    logger.info(
+        f"Moved {stats.moved} comment files ({stats.duplicates} duplicates, "
+        f"{stats.orphans} orphans), freed {stats.bytes_freed} bytes"
+    )
+    return stats
+
+
+def list_files_(storage: FileSystemStorage, directory: str):
+    """Ця функція рекурсивно повертає імена файлів теки (без тимчасових файлів)."""
+    if not storage.exists(directory):
+        return
+    directories, files = storage.listdir(directory)
+    for name in files:
+        if not name.startswith("."):
+            yield posixpath.join(directory, name)
+    for name in directories:
+        yield from list_files_(storage, posixpath.join(directory, name))
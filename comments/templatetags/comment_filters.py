@@ -1,20 +1,124 @@
+from urllib.parse import urlencode
+
 from django import template
-from django.template.loader import render_to_string
+from django.urls import reverse
+from django.utils.html import format_html
+from django.template.loader import get_template
 
 from comments.models import Comment
+from comments.tree import get_children_of_
+from comments.pagination import CursorPaginator
 
 
 register = template.Library()
 
+CHILD_COMMENTS_OPEN = "<div class='child-comments'>"
+CLOSE_DIV = "</div>"
+REPLIES_ORDERING = "-created"
+LOAD_REPLIES_STUB = (
+    "<div class='child-comments load-replies' data-url='{}'>"
+    "<button type='button' class='btn btn-link btn-sm'>"
+    "Show {}more repl{}</button></div>"
+)
+
 
 @register.filter
 def render_comments(comment: Comment) -> str:
-    html = ""
-    if comment:
-        html += render_to_string(
-            "comments/utils/_comment.html", {"comment": comment}
-        )
-        for child_comment in comment.comment_set.all():
-            html += f"<div class='child-comments'>{render_comments(child_comment)}</div>"
-        html += "</div>"
-    return html
+    """Цей фільтр повертає HTML коментаря разом з усіма його відповідями.
+
+    Шаблон коментаря компілюється один раз, дерево обходиться явним стеком
+    (без рекурсії), а всі фрагменти записуються в один буфер. Під
+    коментарем обрізаного дерева додається кнопка "Show more".
+
+    Args:
+        comment (Comment): Кореневий коментар дерева.
+
+    Returns:
+        str: HTML дерева коментарів.
+    """
+    if not comment:
+        return ""
+
+    comment_template = get_template("comments/utils/_comment.html").template
+    context = template.Context(autoescape=comment_template.engine.autoescape)
+    html: list[str] = []
+    stack: list[Comment | str] = [comment]
+
+    while stack:
+        item = stack.pop()
+        if isinstance(item, str):
+            html.append(item)
+            continue
+
+        with context.push(comment=item):
+            html.append(comment_template.render(context))
+        stack.append(CLOSE_DIV)
+        child_comments = list(get_children_of_(item))
+        if hasattr(item, "children") and item.reply_count > len(
+            child_comments
+        ):
+            stack.append(
+                get_load_replies_stub_(
+                    item.id,
+                    get_replies_cursor_after_(child_comments[-1])
+                    if child_comments
+                    else None,
+                    item.reply_count - len(child_comments),
+                )
+            )
+        for child_comment in reversed(child_comments):
+            stack.extend((CLOSE_DIV, child_comment, CHILD_COMMENTS_OPEN))
+    return "".join(html)
+
+
+def get_replies_cursor_after_(comment: Comment) -> str:
+    """Ця функція повертає курсор сторінки відповідей, що йдуть після коментаря.
+
+    Args:
+        comment (Comment): Остання відображена відповідь.
+
+    Returns:
+        str: Курсор для представлення відповідей.
+    """
+    paginator = CursorPaginator(Comment.objects.none(), 1, REPLIES_ORDERING)
+    return paginator.get_cursor_for_(comment, "next")
+
+
+def get_replies_url_(comment_id: int, cursor: str | None) -> str:
+    """Ця функція повертає URL-адресу сторінки відповідей на коментар.
+
+    Args:
+        comment_id (int): Ідентифікатор коментаря.
+        cursor (str | None): Курсор сторінки або None для першої.
+
+    Returns:
+        str: URL-адреса представлення відповідей.
+    """
+    url = reverse("replies", args=[comment_id])
+    if cursor:
+        url += "?" + urlencode({"cursor": cursor})
+    return url
+
+
+def get_load_replies_stub_(
+    comment_id: int, cursor: str | None, remaining: int | None = None
+) -> str:
+    """Ця функція повертає HTML кнопки завантаження наступних відповідей.
+
+    Args:
+        comment_id (int): Ідентифікатор коментаря, відповіді якого завантажуються.
+        cursor (str | None): Курсор наступної сторінки або None для першої.
+        remaining (int | None): Кількість невідображених відповідей (якщо відома).
+
+    Returns:
+        str: HTML кнопки з URL-адресою сторінки відповідей.
+    """
+    url = get_replies_url_(comment_id, cursor)
+    if remaining is None:
+        return format_html(LOAD_REPLIES_STUB, url, "", "ies")
+    return format_html(
+        LOAD_REPLIES_STUB,
+        url,
+        f"{remaining} ",
+        "y" if remaining == 1 else "ies",
+    )
@@ -0,0 +1,132 @@
+"""Цей модуль містить тести для асинхронних представлень додатку 'comments'."""
+
+import threading
+from unittest import mock
+
+from asgiref.sync import sync_to_async
+from django.urls import include, path
+from django.test import TestCase, override_settings
+from captcha.models import CaptchaStore
+
+from comments import views
+from comments.cache import get_cache
+from comments.models import Author, Comment
+
+
+urlpatterns = [
+    path("", views.AsyncCommentListView.as_view(), name="list"),
+    path("add/", views.AsyncCommentCreateView.as_view(), name="add"),
+    path("", include("spa.urls")),
+]
+
+
+async def run_inline(func, *args, **kwargs):
+    """Виконує блокуючу функцію в потоці тесту (там видно транзакцію тесту)."""
+    return await sync_to_async(func)(*args, **kwargs)
+
+
+@override_settings(ROOT_URLCONF=__name__)
+@mock.patch.object(views, "run_blocking", run_inline)
+class AsyncCommentViewsTestCase(TestCase):
+    """Тести для асинхронних представлень списку та створення коментарів."""
+
+    template_name = "comments/comment_list.html"
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        """Встановлює дані тестів, створюючи 28 коментарів та відповідь."""
+        cls.author = Author.objects.create(
+            username="test_user", email="test_user@gmail.com"
+        )
+        for count in range(1, 29):
+            Comment.objects.create(
+                text=f"Tests comment #{count}", author=cls.author
+            )
+        cls.root = Comment.objects.filter(parent_id__isnull=True).latest("id")
+        Comment.objects.create(
+            text="Tests reply", author=cls.author, parent=cls.root
+        )
+
+    def setUp(self) -> None:
+        """Очищує кеш перед кожним тестом."""
+        get_cache().clear()
+
+    async def test_lists_first_page_with_threads(self):
+        """Тести, що сторінка містить 25 коментарів з їхніми відповідями."""
+        response = await self.async_client.get("/")
+        self.assertEqual(response.status_code, 200)
+        self.assertTemplateUsed(response, self.template_name)
+        self.assertEqual(len(response.context["page_obj"]), 25)
+        self.assertTrue(response.context["is_paginated"])
+        self.assertContains(response, "Tests comment #28")
+        self.assertContains(response, "Tests reply")
+        self.assertIn("ETag", response)
+
+    async def test_last_and_invalid_pages(self):
+        """Тести сторінки 'last' та 404 для неправильної сторінки."""
+        response = await self.async_client.get("/", {"page": "last"})
+        self.assertEqual(response.context["page_obj"].number, 2)
+        self.assertEqual(len(response.context["page_obj"]), 3)
+        response = await self.async_client.get("/", {"page": "10"})
+        self.assertEqual(response.status_code, 404)
+        response = await self.async_client.get("/", {"orderby": "x"})
+        self.assertEqual(response.status_code, 404)
+
+    async def test_page_is_served_from_cache(self):
+        """Тести, що повторний запит береться з повного кешу сторінок."""
+        await self.async_client.get("/")
+        response = await self.async_client.get("/")
+        self.assertTemplateNotUsed(response, self.template_name)
+        self.assertContains(response, "Tests comment #28")
+
+    async def test_304_with_matching_etag(self):
+        """Тести, що незмінена сторінка повертається як 304 Not Modified."""
+        response = await self.async_client.get("/")
+        response = await self.async_client.get(
+            "/", headers={"if-none-match": response["ETag"]}
+        )
+        self.assertEqual(response.status_code, 304)
+
+    async def test_adding_comment_with_valid_form_data(self):
+        """Тести, що коментар зберігається та показується повідомлення."""
+        hashkey = await sync_to_async(CaptchaStore.generate_key)()
+        store = await CaptchaStore.objects.aget(hashkey=hashkey)
+        response = await self.async_client.post(
+            "/add/",
+            {
+                "username": "new_user",
+                "email": "new_user@gmail.com",
+                "text": "Async comment",
+                "captcha_0": hashkey,
+                "captcha_1": store.response,
+            },
+        )
+        self.assertRedirects(response, "/", fetch_redirect_response=False)
+        self.assertTrue(
+            await Comment.objects.filter(text="Async comment").aexists()
+        )
+        response = await self.async_client.get("/")
+        self.assertContains(response, "Your comment has successfully added.")
+
+    async def test_form_is_built_off_the_event_loop(self):
+        """Тести, що тіло запиту розбирається не в потоці циклу подій."""
+        get_form, threads = views.AsyncCommentCreateView.get_form, []
+
+        def record_thread(view, *args):
+            threads.append(threading.current_thread())
+            return get_form(view, *args)
+
+        with mock.patch.object(
+            views.AsyncCommentCreateView, "get_form", record_thread
+        ):
+            await self.async_client.post("/add/", {"text": "Hi"})
+        self.assertEqual(len(threads), 1)
+        self.assertIsNot(threads[0], threading.current_thread())
+
+    async def test_adding_comment_with_invalid_form_data(self):
+        """Тести, що невалідна форма повертає перенаправлення з помилкою."""
+        response = await self.async_client.post("/add/", {"text": "Hi"})
+        self.assertEqual(response.status_code, 302)
+        self.assertFalse(await Comment.objects.filter(text="Hi").aexists())
+        response = await self.async_client.get("/")
+        self.assertContains(response, "Invalid form data.")
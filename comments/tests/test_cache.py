@@ -0,0 +1,74 @@
+"""Цей модуль містить тести для фасаду кешу додатку 'comments'."""
+
+import time
+import threading
+from unittest import mock
+
+from django.test import SimpleTestCase, override_settings
+
+from comments import cache
+
+
+@override_settings(
+    COMMENTS_CACHE_LOCK_WAIT=1, COMMENTS_CACHE_LOCK_POLL_INTERVAL=0.01
+)
+class CacheFacadeTestCase(SimpleTestCase):
+    """Тести для функцій make_key, get_versions, bump_versions та get_or_compute."""
+
+    def setUp(self) -> None:
+        """Очищує кеш перед кожним тестом."""
+        cache.get_cache().clear()
+
+    def test_make_key(self):
+        """Тести, що ключ створюється в просторі імен додатку."""
+        self.assertEqual(
+            cache.make_key("thread-html", 1, 2), "comments:thread-html:1:2"
+        )
+
+    def test_bump_versions(self):
+        """Тести, що збільшення версії змінює лише версію вказаного запису."""
+        versions = cache.get_versions("thread", [1, 2])
+        self.assertEqual(versions, cache.get_versions("thread", [1, 2]))
+
+        cache.bump_versions("thread", [1])
+        bumped = cache.get_versions("thread", [1, 2])
+        self.assertEqual(bumped[1], versions[1] + 1)
+        self.assertEqual(bumped[2], versions[2])
+
+    def test_get_or_compute_caches_none(self):
+        """Тести, що значення None також зберігається в кеші."""
+        compute = mock.Mock(return_value=None)
+        for _ in range(2):
+            self.assertIsNone(cache.get_or_compute("key", compute, 60))
+        compute.assert_called_once()
+
+    def test_get_or_compute_is_single_flight(self):
+        """Тести, що одночасні промахи обчислюють значення лише один раз."""
+        calls = []
+
+        def compute() -> int:
+            calls.append(1)
+            time.sleep(0.1)
+            return 42
+
+        results = []
+        threads = [
+            threading.Thread(
+                target=lambda: results.append(
+                    cache.get_or_compute("answer", compute, 60)
+                )
+            )
+            for _ in range(5)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(results, [42] * 5)
+        self.assertEqual(len(calls), 1)
+
+    def test_get_or_compute_without_lock_holder(self):
+        """Тести, що після очікування значення обчислюється без блокування."""
+        cache.get_cache().add(cache.LOCK_KEY.format("key"), 1)
+        with self.settings(COMMENTS_CACHE_LOCK_WAIT=0.05):
+            self.assertEqual(cache.get_or_compute("key", lambda: 1, 60), 1)
@@ -0,0 +1,153 @@
+"""Цей модуль містить тести для обслуговування викликів CAPTCHA та їхнього пулу."""
+
+from io import StringIO
+from unittest import mock
+from datetime import timedelta
+
+from django.apps import apps
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from django.core.management import CommandError, call_command
+from captcha.models import CaptchaStore
+
+from comments.cache import get_cache
+from comments.captcha_store import (
+    POOL_ITEM_KEY,
+    CaptchaSweeper,
+    get_captcha_challenge,
+    get_captcha_image,
+    get_captcha_pool_stats,
+    pop_captcha_from_pool,
+    prune_expired_captchas,
+    refill_captcha_pool,
+)
+
+
+class PruneExpiredCaptchasTestCase(TestCase):
+    """Тести для функції prune_expired_captchas."""
+
+    def setUp(self) -> None:
+        """Встановлює тести, створюючи 5 прострочених та 2 дійсні виклики."""
+        for count in range(7):
+            CaptchaStore.objects.create(
+                challenge="ABCDE",
+                response="abcde",
+                expiration=timezone.now()
+                + timedelta(minutes=-1 if count < 5 else 5),
+            )
+
+    def test_deletes_only_expired_in_batches(self):
+        """Тести, що видаляються лише прострочені виклики пачками."""
+        stats = prune_expired_captchas(batch_size=2)
+        self.assertEqual((stats.deleted, stats.batches), (5, 3))
+        self.assertEqual(CaptchaStore.objects.count(), 2)
+        self.assertEqual(prune_expired_captchas(batch_size=2).deleted, 0)
+
+    def test_max_batches(self):
+        """Тести, що очищення зупиняється після заданої кількості пачок."""
+        stats = prune_expired_captchas(batch_size=2, max_batches=1)
+        self.assertEqual(stats.deleted, 2)
+        self.assertEqual(CaptchaStore.objects.count(), 5)
+
+    def test_command_reports_metrics(self):
+        """Тести, що команда видаляє виклики та виводить показники."""
+        stdout = StringIO()
+        call_command("prune_captchas", "--batch-size", "10", stdout=stdout)
+        self.assertIn(
+            "Deleted 5 expired captchas in 1 batches", stdout.getvalue()
+        )
+
+    @override_settings(COMMENTS_CAPTCHA_SWEEP_INTERVAL=60)
+    def test_app_setup_does_not_start_threads(self):
+        """Тести, що налаштування додатку (і команди керування) не запускають потоки."""
+        with mock.patch(
+            "comments.captcha_store.start_captcha_threads"
+        ) as start_captcha_threads:
+            apps.get_app_config("comments").ready()
+            call_command("prune_captchas", stdout=StringIO())
+        start_captcha_threads.assert_not_called()
+
+    def test_sweeper_accumulates_metrics(self):
+        """Тести, що фоновий потік очищає таблицю та рахує показники."""
+        sweeper = CaptchaSweeper(interval=0, batch_size=10)
+        sweeper.stopped.wait = lambda timeout: sweeper.runs > 0
+        # The test connection is shared and must stay open.
+        with mock.patch("comments.captcha_store.close_old_connections"):
+            sweeper.run()
+        self.assertEqual((sweeper.runs, sweeper.total_deleted), (1, 5))
+
+
+class CaptchaPoolTestCase(TestCase):
+    """Тести для пулу готових викликів CAPTCHA."""
+
+    def setUp(self) -> None:
+        """Встановлює тести, очищаючи кеш пулу."""
+        get_cache().clear()
+
+    def test_refill_up_to_size_and_limit(self):
+        """Тести, що пул поповнюється до розміру з обмеженням швидкості."""
+        self.assertEqual(refill_captcha_pool(3, limit=2), 2)
+        self.assertEqual(refill_captcha_pool(3), 1)
+        self.assertEqual(refill_captcha_pool(3), 0)
+        self.assertEqual(get_captcha_pool_stats()["size"], 3)
+
+    def test_pop_counts_hits_and_misses(self):
+        """Тести, що видача з пулу рахує влучання та промахи."""
+        refill_captcha_pool(1)
+        hashkey = pop_captcha_from_pool()
+        self.assertIsNotNone(get_captcha_image(hashkey))
+        self.assertIsNone(pop_captcha_from_pool())
+        self.assertEqual(
+            get_captcha_pool_stats(), {"size": 0, "hits": 1, "misses": 1}
+        )
+
+    def test_pop_starts_expiration(self):
+        """Тести, що термін дії виклику відраховується від моменту видачі."""
+        refill_captcha_pool(1)
+        store = CaptchaStore.objects.get()
+        hashkey = pop_captcha_from_pool()
+        store.refresh_from_db()
+        self.assertEqual(store.hashkey, hashkey)
+        self.assertLess(
+            store.expiration, timezone.now() + timedelta(minutes=6)
+        )
+
+    def test_refill_after_pops_of_empty_pool(self):
+        """Тести, що пул працює після видач з порожнього пулу."""
+        pop_captcha_from_pool()
+        pop_captcha_from_pool()
+        refill_captcha_pool(1)
+        self.assertIsNotNone(pop_captcha_from_pool())
+
+    def test_refill_skips_expired_items(self):
+        """Тести, що прострочені записи не рахуються та не видаються."""
+        refill_captcha_pool(2)
+        for index in (1, 2):
+            get_cache().delete(POOL_ITEM_KEY.format(index))
+        self.assertEqual(get_captcha_pool_stats()["size"], 0)
+
+        self.assertEqual(refill_captcha_pool(2), 2)
+        self.assertIsNotNone(pop_captcha_from_pool())
+        self.assertEqual(get_captcha_pool_stats()["misses"], 0)
+
+    def test_command_refuses_locmem_cache(self):
+        """Тести, що команда не заповнює кеш, локальний для процесу."""
+        with self.assertRaises(CommandError):
+            call_command("refill_captcha_pool", stdout=StringIO())
+
+    def test_falls_back_to_generation(self):
+        """Тести, що без пулу виклик створюється синхронно."""
+        hashkey = get_captcha_challenge()
+        self.assertTrue(CaptchaStore.objects.filter(hashkey=hashkey))
+        self.assertIsNone(get_captcha_image(hashkey))
+
+    def test_views_serve_pooled_challenge(self):
+        """Тести, що представлення видають виклик та зображення з пулу."""
+        refill_captcha_pool(1)
+        data = self.client.get(
+            "/captcha/refresh/", HTTP_X_REQUESTED_WITH="XMLHttpRequest"
+        ).json()
+        response = self.client.get(data["image_url"])
+        self.assertEqual(response["Content-Type"], "image/png")
+        self.assertEqual(response.content, get_captcha_image(data["key"]))
+        self.assertEqual(get_captcha_pool_stats()["hits"], 1)
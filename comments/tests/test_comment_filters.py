@@ -0,0 +1,61 @@
+"""Цей модуль містить тести для фільтрів шаблонів додатку 'comments'."""
+
+from django.test import SimpleTestCase
+from django.utils import timezone
+from django.template.loader import render_to_string
+
+from comments.models import Author, Comment
+from comments.templatetags.comment_filters import render_comments
+
+
+def build_comment(comment_id: int, children: list[Comment]) -> Comment:
+    """Повертає незбережений коментар з переданими дочірніми коментарями."""
+    comment = Comment(
+        id=comment_id,
+        text=f"Comment <b>#{comment_id}</b>",
+        created=timezone.now(),
+        author=Author(username=f"user_{comment_id}", email="user@gmail.com"),
+    )
+    comment.children = children
+    return comment
+
+
+def render_comments_recursively(comment: Comment) -> str:
+    """Повертає HTML дерева коментарів попереднім рекурсивним способом."""
+    html = render_to_string(
+        "comments/utils/_comment.html", {"comment": comment}
+    )
+    for child_comment in comment.children:
+        html += f"<div class='child-comments'>{render_comments_recursively(child_comment)}</div>"
+    return html + "</div>"
+
+
+class RenderCommentsTestCase(SimpleTestCase):
+    """Тести для фільтра render_comments."""
+
+    def test_empty_comment(self):
+        """Тести, що для порожнього значення повертається порожній рядок."""
+        self.assertEqual(render_comments(None), "")
+
+    def test_output_is_identical_to_recursive_rendering(self):
+        """Тести, що HTML збігається з рекурсивним відображенням байт у байт."""
+        root = build_comment(
+            1,
+            [
+                build_comment(2, [build_comment(3, []), build_comment(4, [])]),
+                build_comment(5, [build_comment(6, [build_comment(7, [])])]),
+            ],
+        )
+        self.assertEqual(
+            render_comments(root), render_comments_recursively(root)
+        )
+
+    def test_very_deep_thread_does_not_hit_recursion_limit(self):
+        """Тести, що дуже глибока гілка відображається без RecursionError."""
+        comment = build_comment(5000, [])
+        for comment_id in range(4999, 0, -1):
+            comment = build_comment(comment_id, [comment])
+
+        html = render_comments(comment)
+        self.assertEqual(html.count("<div class='child-comments'>"), 4999)
+        self.assertTrue(html.endswith("</div>" * 9999))
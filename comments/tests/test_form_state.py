@@ -0,0 +1,75 @@
+"""Цей модуль містить тести для збереження даних невалідної форми."""
+
+from django import http
+from django.test import TestCase, override_settings
+
+from comments.cache import get_cache
+from comments.form_state import (
+    FORM_DATA_COOKIE,
+    clear_form_data,
+    load_form_data,
+    save_form_data,
+)
+
+
+class FormStateTestCase(TestCase):
+    """Тести для функцій save_form_data, load_form_data та clear_form_data."""
+
+    field_names = ["username", "text"]
+
+    def setUp(self) -> None:
+        """Встановлює тести, очищаючи кеш."""
+        get_cache().clear()
+
+    def get_query_dict_(self, data: dict) -> http.QueryDict:
+        """Повертає QueryDict з переданими даними."""
+        query_dict = http.QueryDict(mutable=True)
+        query_dict.update(data)
+        return query_dict
+
+    def get_request_after_(self, data: dict) -> http.HttpRequest:
+        """Повертає запит з cookie, встановленим після збереження даних."""
+        response = http.HttpResponse()
+        self.assertTrue(
+            save_form_data(
+                response, self.get_query_dict_(data), self.field_names
+            )
+        )
+        request = http.HttpRequest()
+        request.COOKIES[FORM_DATA_COOKIE] = response.cookies[
+            FORM_DATA_COOKIE
+        ].value
+        return request
+
+    def test_round_trip_in_cookie(self):
+        """Тести, що дані вибраних полів повертаються з cookie."""
+        request = self.get_request_after_(
+            {"username": "user", "text": "Hi", "captcha_1": "abcde"}
+        )
+        data = load_form_data(request)
+        self.assertEqual(data.dict(), {"username": "user", "text": "Hi"})
+
+    @override_settings(COMMENTS_FORM_DATA_COOKIE_MAX_SIZE=10)
+    def test_large_data_falls_back_to_cache(self):
+        """Тести, що великі дані зберігаються в кеші та видаляються з нього."""
+        request = self.get_request_after_({"text": "x" * 100})
+        self.assertEqual(load_form_data(request)["text"], "x" * 100)
+
+        response = http.HttpResponse()
+        clear_form_data(request, response)
+        self.assertEqual(response.cookies[FORM_DATA_COOKIE]["max-age"], 0)
+        self.assertIsNone(load_form_data(request))
+
+    @override_settings(COMMENTS_FORM_DATA_MAX_SIZE=10)
+    def test_too_large_data_is_not_saved(self):
+        """Тести, що дані, більші за обмеження, не зберігаються."""
+        response = http.HttpResponse()
+        data = self.get_query_dict_({"text": "x" * 100})
+        self.assertFalse(save_form_data(response, data, self.field_names))
+        self.assertNotIn(FORM_DATA_COOKIE, response.cookies)
+
+    def test_tampered_cookie_is_ignored(self):
+        """Тести, що підроблений cookie ігнорується."""
+        request = http.HttpRequest()
+        request.COOKIES[FORM_DATA_COOKIE] = "tampered"
+        self.assertIsNone(load_form_data(request))
@@ -0,0 +1,97 @@
+"""Цей модуль містить тести для кешу фрагментів гілок коментарів."""
+
+import tempfile
+
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from captcha.models import CaptchaStore
+
+from comments.models import Author, Comment
+from comments.forms import CommentModelForm
+from comments.cache import get_cache
+from comments.fragment_cache import (
+    bump_thread_versions,
+    render_comment_threads,
+)
+
+
+class _FragmentCacheTestMixin:
+    """Mixin для тестування кешу фрагментів з різними бекендами кешу."""
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        """Встановлює дані тестів, створюючи кореневий коментар з відповіддю."""
+        cls.author = Author.objects.create(
+            username="test_user", email="test_user@gmail.com"
+        )
+        cls.root = Comment.objects.create(text="Root", author=cls.author)
+        Comment.objects.create(
+            text="First answer", author=cls.author, parent=cls.root
+        )
+
+    def setUp(self) -> None:
+        """Очищує кеш перед кожним тестом."""
+        get_cache().clear()
+
+    def render_thread(self) -> tuple[str, int]:
+        """Повертає HTML гілки та кількість виконаних запитів."""
+        root = Comment.objects.all().get(id=self.root.id)
+        with CaptureQueriesContext(connection) as context:
+            (root,) = render_comment_threads([root])
+        return root.thread_html, len(context.captured_queries)
+
+    def test_thread_is_rendered_from_cache(self):
+        """Тести, що повторне відображення гілки не виконує запитів."""
+        html, query_count = self.render_thread()
+        self.assertIn("First answer", html)
+        # One query per level of replies (the second level is empty).
+        self.assertEqual(query_count, 2)
+        self.assertEqual(self.render_thread(), (html, 0))
+
+    def test_bumped_version_invalidates_thread(self):
+        """Тести, що збільшення версії гілки відображає нову відповідь."""
+        self.render_thread()
+        Comment.objects.create(
+            text="Second answer", author=self.author, parent=self.root
+        )
+        self.assertNotIn("Second answer", self.render_thread()[0])
+
+        bump_thread_versions([self.root.id])
+        self.assertIn("Second answer", self.render_thread()[0])
+
+    def test_saving_answer_bumps_all_ancestors(self):
+        """Тести, що збереження відповіді через форму оновлює всіх предків."""
+        answer = self.root.get_descendants().get()
+        self.render_thread()
+        hashkey = CaptchaStore.generate_key()
+        form = CommentModelForm(
+            {
+                "username": "test_user",
+                "email": "test_user@gmail.com",
+                "text": "Answer of answer",
+                "captcha_0": hashkey,
+                "captcha_1": CaptchaStore.objects.get(hashkey=hashkey).response,
+            }
+        )
+        self.assertTrue(form.is_valid())
+
+        with self.captureOnCommitCallbacks(execute=True):
+            form.save(str(answer.id), None)
+        self.assertIn("Answer of answer", self.render_thread()[0])
+
+
+class LocMemFragmentCacheTestCase(_FragmentCacheTestMixin, TestCase):
+    """Тести для кешу фрагментів з бекендом locmem."""
+
+
+@override_settings(
+    CACHES={
+        "default": {
+            "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+            "LOCATION": tempfile.mkdtemp(),
+        }
+    }
+)
+class FileBasedFragmentCacheTestCase(_FragmentCacheTestMixin, TestCase):
+    """Тести для кешу фрагментів з файловим бекендом."""
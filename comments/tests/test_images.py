@@ -0,0 +1,112 @@
+"""Цей модуль містить тести для оптимізації прикріплених зображень."""
+
+import shutil
+import tempfile
+import threading
+from io import BytesIO
+from unittest import mock
+
+from PIL import Image
+from django.test import TestCase, override_settings
+from django.core.files.base import ContentFile
+
+from comments import images
+from comments.models import Author, Comment
+from comments.page_cache import get_list_page_version
+
+
+MEDIA_ROOT = tempfile.mkdtemp()
+
+
+@override_settings(MEDIA_ROOT=MEDIA_ROOT)
+class ProcessCommentImageTestCase(TestCase):
+    """Тести для функції process_comment_image."""
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        """Видаляє тимчасову теку з файлами тестів."""
+        super().tearDownClass()
+        shutil.rmtree(MEDIA_ROOT, ignore_errors=True)
+
+    def create_comment_with_(self, content: bytes, name: str) -> Comment:
+        """Створює коментар з прикріпленим файлом та повертає його."""
+        comment = Comment(
+            text="Comment",
+            author=Author.objects.create(
+                username="test_user", email="test_user@gmail.com"
+            ),
+        )
+        comment.file.save(name, ContentFile(content))
+        return comment
+
+    def get_jpeg_(self, size: tuple[int, int]) -> bytes:
+        """Повертає JPEG заданого розміру з метаданими EXIF."""
+        exif = Image.Exif()
+        exif[0x010F] = "Test camera"  # Make
+        output = BytesIO()
+        Image.effect_noise(size, 64).convert("RGB").save(
+            output, "JPEG", quality=95, exif=exif
+        )
+        return output.getvalue()
+
+    def test_downscales_and_strips_metadata(self):
+        """Тести, що зображення зменшується, перекодовується та втрачає EXIF."""
+        content = self.get_jpeg_((1600, 1200))
+        comment = self.create_comment_with_(content, "photo.jpg")
+        old_name = comment.file.name
+
+        saved = images.process_comment_image(comment.id)
+        comment.refresh_from_db()
+        self.assertGreater(saved, 0)
+        self.assertEqual(comment.file_bytes_saved, saved)
+        self.assertEqual(comment.file_original_size, len(content))
+        self.assertTrue(comment.file.name.endswith(".webp"))
+        self.assertRegex(
+            comment.file.name, r"^comment_files/\w\w/\w\w/\w{64}\.webp$"
+        )
+        self.assertFalse(comment.file.storage.exists(old_name))
+
+        with Image.open(comment.file.open("rb")) as image:
+            self.assertEqual(image.format, "WEBP")
+            self.assertLessEqual(image.size, images.MAX_IMAGE_SIZE)
+            self.assertNotIn(0x010F, image.getexif())
+
+    def test_renamed_image_invalidates_list_pages(self):
+        """Тести, що після перейменування файлу сторінки списку застарівають."""
+        comment = self.create_comment_with_(
+            self.get_jpeg_((1600, 1200)), "photo.jpg"
+        )
+        version = get_list_page_version()
+        images.process_comment_image(comment.id)
+        self.assertNotEqual(get_list_page_version(), version)
+
+    def test_non_image_is_marked_as_processed(self):
+        """Тести, що текстовий файл не змінюється, але позначається як оброблений."""
+        comment = self.create_comment_with_(b"Just text", "notes.txt")
+        self.assertIsNone(images.process_comment_image(comment.id))
+        comment.refresh_from_db()
+        self.assertTrue(comment.file.name.endswith(".txt"))
+        self.assertEqual(comment.file_original_size, 9)
+
+
+@override_settings(COMMENTS_IMAGE_WORKERS=1, COMMENTS_IMAGE_QUEUE_SIZE=1)
+class ScheduleCommentImageProcessingTestCase(TestCase):
+    """Тести для функції schedule_comment_image_processing."""
+
+    def test_queue_is_bounded(self):
+        """Тести, що завдання понад розмір пулу та черги пропускаються."""
+        release = threading.Event()
+        with mock.patch.multiple(images, _executor=None, _slots=None):
+            with mock.patch.object(
+                images,
+                "process_comment_image",
+                side_effect=lambda comment_id: release.wait(5),
+            ):
+                with self.assertLogs(images.logger, "WARNING"):
+                    results = [
+                        images.schedule_comment_image_processing(comment_id)
+                        for comment_id in range(3)
+                    ]
+                release.set()
+                images.get_image_executor().shutdown(wait=True)
+        self.assertEqual(results, [True, True, False])
@@ -3,7 +3,7 @@
 from django.test import TestCase
 from django.db.models import Model
 
-from comments.models import Author, Comment
+from comments.models import Author, Comment, get_path_step_for_
 
 
 class _ModelMetaOptionsTestMixin:
@@ -47,6 +47,13 @@ class AuthorModelTestCase(_ModelMetaOptionsTestMixin, TestCase):
         obj = self.model.objects.first()
         self.assertEqual(str(obj), obj.username)
 
+    def test_model_indexes(self):
+        """Цей метод тестує, що модель має індекси для пошуку та сортування авторів."""
+        self.assertEqual(
+            [index.fields for index in self.model._meta.indexes],
+            [["username", "email"], ["email"]],
+        )
+
     # * ---------------- Test the 'username' field parameters -----------------
 
     def test_username_max_length(self):
@@ -117,6 +124,18 @@ class CommentModelTestCase(_ModelMetaOptionsTestMixin, TestCase):
         obj = self.model.objects.first()
         self.assertEqual(str(obj), f"{obj.pk} from {obj.author}")
 
+    def test_model_indexes(self):
+        """Цей метод тестує, що модель має індекс для вибірки кореневих коментарів."""
+        self.assertEqual(
+            [index.fields for index in self.model._meta.indexes],
+            [
+                ["parent", "created", "id"],
+                ["parent", "author_username", "id"],
+                ["parent", "author_email", "id"],
+                ["parent", "last_activity", "id"],
+            ],
+        )
+
     # * ---------------- Test the 'home_page' field parameters ----------------
 
     def test_home_page_blank(self):
@@ -211,6 +230,72 @@ class CommentModelTestCase(_ModelMetaOptionsTestMixin, TestCase):
         with self.assertRaises(Comment.DoesNotExist):
             Comment.objects.get(id=1)
 
+    # * ------- Test the 'author_username' and 'author_email' fields -----------
+
+    def test_author_fields_are_copied_on_save(self):
+        """Цей метод тестує, що ім'я та email автора копіюються в коментар."""
+        obj = self.model.objects.get(id=1)
+        self.assertEqual(obj.author_username, "test_user")
+        self.assertEqual(obj.author_email, "test@gmail.com")
+
+    def test_author_fields_are_not_editable(self):
+        """Цей метод тестує, що скопійовані поля автора не редагуються у формах."""
+        self.assertFalse(self.model._meta.get_field("author_username").editable)
+        self.assertFalse(self.model._meta.get_field("author_email").editable)
+
+    # * -------------- Test the 'path' and 'depth' field parameters -----------
+
+    def test_path_max_length(self):
+        """Цей метод тестує, що поле шляху має max_length = 700."""
+        self.assertEqual(self.model._meta.get_field("path").max_length, 700)
+
+    def test_path_db_index(self):
+        """Цей метод тестує, що поле шляху індексоване."""
+        self.assertTrue(self.model._meta.get_field("path").db_index)
+
+    def test_path_and_depth_are_filled_on_save(self):
+        """Цей метод тестує, що шлях та глибина заповнюються під час збереження."""
+        root = Comment.objects.get(id=1)
+        answer = Comment.objects.create(
+            text="test answer", author=self.author, parent=root
+        )
+        self.assertEqual(root.path, "0000001")
+        self.assertEqual(root.depth, 0)
+        self.assertEqual(
+            answer.path, root.path + get_path_step_for_(answer.id)
+        )
+        self.assertEqual(answer.depth, 1)
+        self.assertEqual(Comment.objects.get(id=answer.id).path, answer.path)
+
+    def test_get_ancestor_ids(self):
+        """Цей метод тестує, що get_ancestor_ids повертає предків від кореня."""
+        root = Comment.objects.get(id=1)
+        answer = Comment.objects.create(
+            text="test answer", author=self.author, parent=root
+        )
+        answer_of_answer = Comment.objects.create(
+            text="test answer", author=self.author, parent=answer
+        )
+        self.assertEqual(root.get_ancestor_ids(), [])
+        self.assertEqual(
+            answer_of_answer.get_ancestor_ids(), [root.id, answer.id]
+        )
+
+    def test_get_descendants(self):
+        """Цей метод тестує, що get_descendants повертає всіх нащадків коментаря."""
+        root = Comment.objects.get(id=1)
+        answer = Comment.objects.create(
+            text="test answer", author=self.author, parent=root
+        )
+        answer_of_answer = Comment.objects.create(
+            text="test answer", author=self.author, parent=answer
+        )
+        Comment.objects.create(text="other root", author=self.author)
+        self.assertEqual(
+            set(root.get_descendants()), {answer, answer_of_answer}
+        )
+        self.assertEqual(list(answer_of_answer.get_descendants()), [])
+
     # * ---------------- Test the 'author' field parameters -------------------
 
     def test_author_verbose_name(self):
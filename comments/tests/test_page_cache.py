@@ -0,0 +1,100 @@
+"""Цей модуль містить тести для повного кешу сторінок списку коментарів."""
+
+from django.contrib import messages
+from django.test import RequestFactory, TestCase
+from django.contrib.messages.storage.cookie import CookieStorage
+
+from comments.cache import get_cache
+from comments.models import Author, Comment
+from comments.page_cache import (
+    CSRF_HOLE,
+    cache_page,
+    get_cached_page,
+    get_page_cache_key,
+    invalidate_list_pages,
+)
+
+
+class PageCacheTestCase(TestCase):
+    """Тести для кешу сторінок та його використання в CommentListView."""
+
+    url = "/"
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        """Встановлює дані тестів, створюючи автора та коментар."""
+        cls.author = Author.objects.create(
+            username="test_user", email="test_user@gmail.com"
+        )
+        Comment.objects.create(text="Tests comment", author=cls.author)
+
+    def setUp(self) -> None:
+        """Очищує кеш перед кожним тестом."""
+        get_cache().clear()
+
+    def test_page_is_served_from_cache(self):
+        """Тести, що повторний запит (з тим самим сортуванням) береться з кешу."""
+        response = self.client.get(self.url)
+        self.assertTemplateUsed(response, "comments/comment_list.html")
+
+        response = self.client.get(
+            self.url, {"orderby": "c", "orderdir": "desc", "page": "1"}
+        )
+        self.assertTemplateNotUsed(response, "comments/comment_list.html")
+        self.assertContains(response, "Tests comment")
+        self.assertContains(response, 'name="csrfmiddlewaretoken"')
+        self.assertNotContains(response, CSRF_HOLE)
+
+    def test_cached_page_does_not_keep_raw_query(self):
+        """Тести, що сторінка в кеші не містить сирих параметрів першого запиту."""
+        self.client.get(
+            self.url,
+            {
+                "page": "1",
+                "orderby": "c",
+                "orderdir": "desc",
+                "evil": "INJECTED",
+            },
+        )
+        response = self.client.get(self.url)
+        self.assertTemplateNotUsed(response, "comments/comment_list.html")
+        self.assertNotContains(response, "INJECTED")
+        self.assertContains(
+            response,
+            'content="http://testserver/?page=1'
+            '&amp;orderby=c&amp;orderdir=desc"',
+        )
+
+    def test_other_ordering_is_cached_separately(self):
+        """Тести, що інше сортування не використовує закешовану сторінку."""
+        self.client.get(self.url)
+        response = self.client.get(self.url, {"orderdir": "asc"})
+        self.assertTemplateUsed(response, "comments/comment_list.html")
+
+    def test_invalidated_when_comment_is_created(self):
+        """Тести, що новий коментар робить закешовані сторінки застарілими."""
+        self.client.get(self.url)
+        Comment.objects.create(text="New comment", author=self.author)
+        invalidate_list_pages()
+
+        response = self.client.get(self.url)
+        self.assertTemplateUsed(response, "comments/comment_list.html")
+        self.assertContains(response, "New comment")
+
+    def test_holes_are_filled_per_request(self):
+        """Тести, що дірки заповнюються токеном CSRF та повідомленнями запиту."""
+        key = get_page_cache_key("-created", "1")
+        cache_page(
+            key,
+            '<!-- messages --><h5>Old message</h5><!-- /messages -->'
+            '<input type="hidden" name="csrfmiddlewaretoken" value="secret">',
+        )
+        request = RequestFactory().get(self.url)
+        request._messages = CookieStorage(request)
+        messages.success(request, "Your comment has successfully added.")
+
+        content = get_cached_page(key, request)
+        self.assertIn("Your comment has successfully added.", content)
+        self.assertNotIn("Old message", content)
+        self.assertNotIn('value="secret"', content)
+        self.assertNotIn(CSRF_HOLE, content)
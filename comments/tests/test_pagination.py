@@ -0,0 +1,193 @@
+"""Цей модуль містить тести для пагінаторів додатку 'comments'."""
+
+from unittest import mock
+
+from django.test import TestCase, override_settings
+from captcha.models import CaptchaStore
+
+from comments import services
+from comments.models import Author, Comment
+from comments.forms import CommentModelForm
+from comments.cache import get_cache
+from comments.pagination import (
+    CursorPaginator,
+    InvalidCursor,
+    RootCommentPaginator,
+    get_root_comment_count,
+)
+
+
+class CursorPaginatorTestCase(TestCase):
+    """Тести для CursorPaginator."""
+
+    queryset = Comment.objects.all().filter(parent_id__isnull=True)
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        """Встановлює дані тестів, створюючи 12 коментарів з однаковими ключами."""
+        for count in range(12):
+            Comment.objects.create(
+                text=f"Tests comment #{count}",
+                author=Author.objects.create(
+                    username=f"test_user_{count % 3}",
+                    email=f"test_user_{count % 4}@gmail.com",
+                ),
+            )
+
+    def get_all_orderings(self) -> list[str]:
+        """Повертає всі підтримувані рядки сортування."""
+        return [
+            services.get_ordering_string(order_by, order_dir)
+            for order_by in ("u", "e", "c")
+            for order_dir in ("asc", "desc")
+        ]
+
+    def test_walking_forward_and_backward_for_every_ordering(self):
+        """Тести, що курсори обходять всі коментарі в обох напрямках."""
+        for ordering in self.get_all_orderings():
+            with self.subTest(ordering=ordering):
+                paginator = CursorPaginator(self.queryset, 5, ordering)
+                expected = list(
+                    self.queryset.order_by(
+                        ordering, ("-" if ordering[0] == "-" else "") + "id"
+                    )
+                )
+                pages = [paginator.page(None)]
+                while pages[-1].has_next():
+                    pages.append(paginator.page(pages[-1].next_cursor))
+
+                self.assertEqual(
+                    [c for page in pages for c in page], expected
+                )
+                self.assertEqual([len(page) for page in pages], [5, 5, 2])
+
+                page = pages[-1]
+                for previous_page in reversed(pages[:-1]):
+                    page = paginator.page(page.previous_cursor)
+                    self.assertEqual(
+                        page.object_list, previous_page.object_list
+                    )
+                self.assertFalse(page.has_previous())
+
+    def test_tampered_cursor(self):
+        """Тести, що змінений курсор відхиляється."""
+        paginator = CursorPaginator(self.queryset, 5, "-created")
+        cursor = paginator.page(None).next_cursor
+        with self.assertRaises(InvalidCursor):
+            paginator.page(cursor[:-1] + ("A" if cursor[-1] != "A" else "B"))
+
+    def test_cursor_does_not_depend_on_time(self):
+        """Тести, що курсор однієї сторінки не змінюється з часом."""
+        paginator = CursorPaginator(self.queryset, 5, "-created")
+        with mock.patch("time.time", return_value=0):
+            cursor = paginator.page(None).next_cursor
+        self.assertEqual(paginator.page(None).next_cursor, cursor)
+
+    def test_cursor_of_other_ordering(self):
+        """Тести, що курсор іншого сортування відхиляється."""
+        cursor = CursorPaginator(self.queryset, 5, "created").page(None)
+        with self.assertRaises(InvalidCursor):
+            CursorPaginator(self.queryset, 5, "-created").page(
+                cursor.next_cursor
+            )
+
+
+@override_settings(COMMENTS_CURSOR_PAGINATION=True)
+class CursorPaginatedListViewTestCase(TestCase):
+    """Тести для представлення списку коментарів з курсорною пагінацією."""
+
+    url = "/"
+    queryset = CursorPaginatorTestCase.queryset
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        """Встановлює дані тестів, створюючи 28 коментарів."""
+        author = Author.objects.create(
+            username="test_user", email="test_user@gmail.com"
+        )
+        for count in range(1, 29):
+            Comment.objects.create(text=f"Comment #{count}", author=author)
+
+    def setUp(self) -> None:
+        """Очищує кеш (зокрема кеш сторінок) перед кожним тестом."""
+        get_cache().clear()
+
+    def test_first_page_uses_cursor_navigation(self):
+        """Тести, що перша сторінка містить 25 коментарів та курсорну навігацію."""
+        response = self.client.get(self.url)
+        self.assertTemplateUsed(
+            response, "comments/utils/_cursor_pagination_nav.html"
+        )
+        self.assertEqual(
+            response.context["page_obj"].object_list,
+            list(self.queryset.order_by("-created", "-id")[:25]),
+        )
+
+    def test_next_page(self):
+        """Тести, що наступна сторінка містить решту 3 коментарі."""
+        response = self.client.get(self.url)
+        next_cursor = response.context["page_obj"].next_cursor
+        self.assertContains(response, f"?cursor={next_cursor}&orderby=")
+
+        response = self.client.get(f"{self.url}?cursor={next_cursor}")
+        self.assertEqual(
+            response.context["page_obj"].object_list,
+            list(self.queryset.order_by("-created", "-id")[25:]),
+        )
+
+    def test_404_with_invalid_cursor(self):
+        """Тести, що підроблений курсор призводить до 404."""
+        response = self.client.get(f"{self.url}?cursor=wrong")
+        self.assertEqual(response.status_code, 404)
+
+
+class RootCommentPaginatorTestCase(TestCase):
+    """Тести для RootCommentPaginator та лічильника кореневих коментарів."""
+
+    queryset = CursorPaginatorTestCase.queryset
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        """Встановлює дані тестів, створюючи 28 коментарів."""
+        author = Author.objects.create(
+            username="test_user", email="test_user@gmail.com"
+        )
+        for count in range(1, 29):
+            Comment.objects.create(text=f"Comment #{count}", author=author)
+
+    def setUp(self) -> None:
+        """Очищує кеш перед кожним тестом."""
+        get_cache().clear()
+
+    def test_count_is_taken_from_cache(self):
+        """Тести, що COUNT(*) виконується лише при відсутньому лічильнику."""
+        with self.assertNumQueries(1):
+            self.assertEqual(RootCommentPaginator(self.queryset, 25).count, 28)
+        with self.assertNumQueries(0):
+            self.assertEqual(RootCommentPaginator(self.queryset, 25).count, 28)
+
+    def test_saving_comment_increments_counter(self):
+        """Тести, що збереження кореневого коментаря збільшує лічильник."""
+        get_root_comment_count()
+        hashkey = CaptchaStore.generate_key()
+        form = CommentModelForm(
+            {
+                "username": "test_user",
+                "email": "test_user@gmail.com",
+                "text": "New comment",
+                "captcha_0": hashkey,
+                "captcha_1": CaptchaStore.objects.get(hashkey=hashkey).response,
+            }
+        )
+        self.assertTrue(form.is_valid())
+        with self.captureOnCommitCallbacks(execute=True):
+            form.save(None, None)
+
+        with self.assertNumQueries(0):
+            self.assertEqual(get_root_comment_count(), 29)
+
+    @override_settings(COMMENTS_MAX_PAGES=1)
+    def test_max_pages(self):
+        """Тести, що COMMENTS_MAX_PAGES обмежує кількість сторінок."""
+        self.assertEqual(RootCommentPaginator(self.queryset, 25).num_pages, 1)
+        self.assertEqual(self.client.get("/?page=2").status_code, 404)
@@ -0,0 +1,72 @@
+"""Цей модуль містить тести для бізнес-логіки додатку 'comments'."""
+
+from django.test import SimpleTestCase, TestCase
+
+from comments import services
+from comments.models import Author, Comment
+
+
+class GetOrderingStringTestCase(SimpleTestCase):
+    """Тести для функції get_ordering_string."""
+
+    def test_valid_parameters(self):
+        """Тести, що валідні параметри перетворюються на поля коментаря."""
+        self.assertEqual(
+            services.get_ordering_string("u", "asc"), "author_username"
+        )
+        self.assertEqual(
+            services.get_ordering_string("e", "desc"), "-author_email"
+        )
+        self.assertEqual(services.get_ordering_string("c", "desc"), "-created")
+        self.assertEqual(
+            services.get_ordering_string("a", "desc"), "-last_activity"
+        )
+
+    def test_invalid_parameters(self):
+        """Тести, що для невалідних параметрів повертається None."""
+        self.assertIsNone(services.get_ordering_string("x", "asc"))
+        self.assertIsNone(services.get_ordering_string("c", "up"))
+
+
+class GetApiFieldsTestCase(SimpleTestCase):
+    """Тести для функції get_api_fields."""
+
+    def test_all_fields_by_default(self):
+        """Тести, що без параметра повертаються всі поля API."""
+        self.assertEqual(
+            services.get_api_fields(None), list(services.API_FIELDS)
+        )
+
+    def test_selected_fields(self):
+        """Тести, що повертаються лише вибрані поля без повторів."""
+        self.assertEqual(
+            services.get_api_fields("id, username,id"), ["id", "username"]
+        )
+
+    def test_unknown_field(self):
+        """Тести, що для невідомого поля повертається None."""
+        self.assertIsNone(services.get_api_fields("id,path"))
+
+
+class RepairCommentAuthorFieldsTestCase(TestCase):
+    """Тести для функції repair_comment_author_fields."""
+
+    def test_repairs_only_drifted_comments(self):
+        """Тести, що виправляються лише коментарі з розбіжними даними автора."""
+        author = Author.objects.create(
+            username="test_user", email="test_user@gmail.com"
+        )
+        first = Comment.objects.create(text="First", author=author)
+        Comment.objects.create(text="Second", author=author)
+        Comment.objects.filter(id=first.id).update(
+            author_username="old", author_email="old@gmail.com"
+        )
+
+        self.assertEqual(services.repair_comment_author_fields(), 1)
+        self.assertEqual(
+            set(
+                Comment.objects.values_list("author_username", "author_email")
+            ),
+            {("test_user", "test_user@gmail.com")},
+        )
+        self.assertEqual(services.repair_comment_author_fields(), 0)
@@ -0,0 +1,143 @@
+"""Цей модуль містить тести для сховища прикріплених файлів за хешем."""
+
+import os
+import shutil
+import hashlib
+import tempfile
+from io import StringIO
+
+from django.test import TestCase, override_settings
+from django.core.management import call_command
+from django.core.files.base import ContentFile
+from django.core.files.storage import FileSystemStorage
+
+from comments.cache import get_versions
+from comments.models import Author, Comment
+from comments.page_cache import get_list_page_version
+from comments.fragment_cache import THREAD_VERSION_NAME
+from comments.storage import (
+    META_DIRECTORY,
+    get_comment_file_storage,
+    is_content_addressed,
+)
+
+
+MEDIA_ROOT = tempfile.mkdtemp()
+
+
+@override_settings(MEDIA_ROOT=MEDIA_ROOT)
+class ContentAddressedStorageTestCase(TestCase):
+    """Тести для сховища ContentAddressedStorage та команди dedupe_comment_files."""
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        """Видаляє тимчасову теку з файлами тестів."""
+        super().tearDownClass()
+        shutil.rmtree(MEDIA_ROOT, ignore_errors=True)
+
+    def setUp(self) -> None:
+        """Створює автора коментарів та очищує теку з файлами."""
+        shutil.rmtree(MEDIA_ROOT, ignore_errors=True)
+        self.author = Author.objects.create(
+            username="test_user", email="test_user@gmail.com"
+        )
+
+    def create_comment_with_(self, content: bytes, name: str) -> Comment:
+        """Створює коментар з прикріпленим файлом та повертає його."""
+        comment = Comment(text="Comment", author=self.author)
+        comment.file.save(name, ContentFile(content))
+        return comment
+
+    def test_identical_uploads_are_stored_once(self):
+        """Тести, що однаковий вміст зберігається один раз під своїм хешем."""
+        first = self.create_comment_with_(b"Same meme", "meme.PNG")
+        second = self.create_comment_with_(b"Same meme", "repost.png")
+        digest = hashlib.sha256(b"Same meme").hexdigest()
+
+        self.assertEqual(first.file.name, second.file.name)
+        self.assertEqual(
+            first.file.name,
+            f"comment_files/{digest[:2]}/{digest[2:4]}/{digest}.png",
+        )
+        directories, files = first.file.storage.listdir(
+            f"comment_files/{digest[:2]}/{digest[2:4]}"
+        )
+        self.assertEqual(files, [f"{digest}.png"])
+
+    @override_settings(COMMENTS_FILE_LEASE_SECONDS=0)
+    def test_file_is_deleted_with_its_last_reference(self):
+        """Тести, що файл видаляється, лише коли на нього не посилається коментар."""
+        first = self.create_comment_with_(b"Shared", "a.txt")
+        second = self.create_comment_with_(b"Shared", "b.txt")
+        storage, name = first.file.storage, first.file.name
+
+        first.delete()
+        storage.delete(name)
+        self.assertTrue(storage.exists(name))
+
+        second.delete()
+        storage.delete(name)
+        self.assertFalse(storage.exists(name))
+
+    def test_reused_file_is_not_deleted_before_commit(self):
+        """Тести, що щойно виданий дублікат не видаляється без видимих посилань."""
+        storage = get_comment_file_storage()
+        name = storage.save("comment_files/a.txt", ContentFile(b"Shared"))
+        self.assertEqual(
+            storage.save("comment_files/b.txt", ContentFile(b"Shared")), name
+        )
+        storage.delete(name)
+        self.assertTrue(storage.exists(name))
+
+        with self.settings(COMMENTS_FILE_LEASE_SECONDS=0):
+            storage.delete(name)
+        self.assertFalse(storage.exists(name))
+        # Lock and lease files are removed with the file.
+        self.assertEqual(os.listdir(storage.path(META_DIRECTORY)), [])
+
+    def test_unsafe_extensions_are_dropped(self):
+        """Тести, що довге або незвичне розширення не потрапляє в ім'я."""
+        for name in ("a." + "x" * 40, "a.php%00", "a.tar.Gz"):
+            comment = self.create_comment_with_(name.encode(), name)
+            self.assertLessEqual(len(comment.file.name), 100)
+            self.assertTrue(is_content_addressed(comment.file.name))
+            self.assertNotIn("x" * 11, comment.file.name)
+            self.assertNotIn("%", comment.file.name)
+        self.assertTrue(comment.file.name.endswith(".gz"))
+
+    def test_dedupe_command_moves_old_files(self):
+        """Тести, що команда переносить старі файли та об'єднує дублікати."""
+        old_storage = FileSystemStorage(location=MEDIA_ROOT)
+        old_names = [
+            old_storage.save(f"comment_files/{name}", ContentFile(b"Old"))
+            for name in ("first.jpg", "second.jpg")
+        ]
+        orphan = old_storage.save(
+            "comment_files/orphan.jpg", ContentFile(b"?")
+        )
+        comments = [
+            Comment.objects.create(
+                text="Comment", author=self.author, file=name
+            )
+            for name in old_names
+        ]
+        ids = [comment.id for comment in comments]
+        versions = get_versions(THREAD_VERSION_NAME, ids)
+        page_version = get_list_page_version()
+
+        output = StringIO()
+        call_command("dedupe_comment_files", "--delete-orphans", stdout=output)
+        self.assertIn(
+            "Moved 2 files (1 duplicates, 1 orphans", output.getvalue()
+        )
+
+        names = set(Comment.objects.values_list("file", flat=True))
+        self.assertEqual(len(names), 1)
+        self.assertTrue(is_content_addressed(names.pop()))
+        storage = get_comment_file_storage()
+        for name in [*old_names, orphan]:
+            self.assertFalse(storage.exists(name))
+        new_versions = get_versions(THREAD_VERSION_NAME, ids)
+        for comment_id in ids:
+            self.assertNotEqual(new_versions[comment_id], versions[comment_id])
+        self.assertNotEqual(get_list_page_version(), page_version)
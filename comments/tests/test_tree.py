@@ -0,0 +1,226 @@
+"""Цей модуль містить тести для завантаження дерев коментарів."""
+
+from io import StringIO
+
+from django.db import connection
+from django.core.management import CommandError, call_command
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from comments.models import Author, Comment
+from comments.cache import get_cache
+from comments.tree import (
+    get_descendants_of_,
+    load_comment_trees,
+    rebuild_comment_paths,
+    recount_comment_replies,
+)
+
+
+class LoadCommentTreesTestCase(TestCase):
+    """Тести для функції load_comment_trees."""
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        """Встановлює дані тестів, створюючи автора та два кореневі коментарі."""
+        cls.author = Author.objects.create(
+            username="test_user", email="test_user@gmail.com"
+        )
+        cls.first_root = Comment.objects.create(
+            text="First root", author=cls.author
+        )
+        cls.second_root = Comment.objects.create(
+            text="Second root", author=cls.author
+        )
+
+    def create_thread(self, root: Comment, depth: int) -> list[Comment]:
+        """Створює ланцюжок відповідей заданої глибини та повертає його."""
+        thread, parent = [], root
+        for level in range(depth):
+            parent = Comment.objects.create(
+                text=f"Answer #{level}", author=self.author, parent=parent
+            )
+            thread.append(parent)
+        return thread
+
+    def get_query_count_for_(self, roots: list[Comment]) -> int:
+        """Повертає кількість запитів, виконаних під час завантаження дерев."""
+        with CaptureQueriesContext(connection) as context:
+            load_comment_trees(roots)
+        return len(context.captured_queries)
+
+    def test_children_are_attached(self):
+        """Тести, що кожен коментар дерева отримує своїх дочірніх коментарів."""
+        thread = self.create_thread(self.first_root, 3)
+        sibling = Comment.objects.create(
+            text="Sibling", author=self.author, parent=self.first_root
+        )
+        (first_root, second_root) = load_comment_trees(
+            [self.first_root, self.second_root]
+        )
+        self.assertEqual(first_root.children, [sibling, thread[0]])
+        self.assertEqual(first_root.children[1].children, [thread[1]])
+        self.assertEqual(
+            first_root.children[1].children[0].children, [thread[2]]
+        )
+        self.assertEqual(second_root.children, [])
+
+    def test_trees_are_trimmed_by_depth_and_children(self):
+        """Тести, що дерева обрізаються за глибиною та кількістю відповідей."""
+        thread = self.create_thread(self.first_root, 3)
+        siblings = [
+            Comment.objects.create(
+                text=f"Sibling #{number}",
+                author=self.author,
+                parent=self.first_root,
+            )
+            for number in range(3)
+        ]
+        (first_root,) = load_comment_trees(
+            [self.first_root], max_depth=2, max_children=2
+        )
+        self.assertEqual(first_root.children, siblings[:0:-1])
+
+        (first_root,) = load_comment_trees(
+            [self.first_root], max_depth=2, max_children=4
+        )
+        self.assertEqual(first_root.children[-1], thread[0])
+        self.assertEqual(first_root.children[-1].children, [thread[1]])
+        self.assertEqual(first_root.children[-1].children[0].children, [])
+
+    def test_replies_of_trimmed_comments_are_not_fetched(self):
+        """Тести, що відповіді обрізаних коментарів не вибираються з бази даних."""
+        trimmed = self.create_thread(self.first_root, 2)
+        siblings = [
+            Comment.objects.create(
+                text=f"Sibling #{number}",
+                author=self.author,
+                parent=self.first_root,
+            )
+            for number in range(2)
+        ]
+        descendants = get_descendants_of_(
+            [self.first_root], max_depth=2, max_children=2
+        )
+        self.assertEqual(descendants, siblings[::-1])
+        self.assertNotIn(trimmed[1], descendants)
+
+    def test_no_queries_without_roots(self):
+        """Тести, що порожня сторінка не виконує запитів."""
+        self.assertEqual(self.get_query_count_for_([]), 0)
+
+    def test_query_count_does_not_depend_on_depth(self):
+        """Тести, що кількість запитів однакова для мілких та глибоких гілок."""
+        self.create_thread(self.first_root, 2)
+        shallow_count = self.get_query_count_for_([self.first_root])
+
+        self.create_thread(self.second_root, 30)
+        deep_count = self.get_query_count_for_(
+            [self.first_root, self.second_root]
+        )
+        self.assertEqual(shallow_count, 1)
+        self.assertEqual(deep_count, shallow_count)
+
+    def test_list_view_query_count_does_not_depend_on_depth(self):
+        """Тести, що сторінка списку не виконує запит для кожної відповіді."""
+        self.create_thread(self.first_root, 2)
+        get_cache().clear()
+        with CaptureQueriesContext(connection) as shallow:
+            self.client.get("/")
+
+        self.create_thread(self.second_root, 30)
+        get_cache().clear()
+        with CaptureQueriesContext(connection) as deep:
+            self.client.get("/")
+        self.assertEqual(
+            len(deep.captured_queries), len(shallow.captured_queries)
+        )
+
+
+class RebuildCommentPathsTestCase(TestCase):
+    """Тести для функції rebuild_comment_paths."""
+
+    def test_rebuilds_broken_paths(self):
+        """Тести, що зламані шляхи та глибини перебудовуються пачками."""
+        author = Author.objects.create(
+            username="test_user", email="test_user@gmail.com"
+        )
+        parent = None
+        for _ in range(5):
+            parent = Comment.objects.create(
+                text="Comment", author=author, parent=parent
+            )
+        expected = list(Comment.objects.values_list("id", "path", "depth"))
+        Comment.objects.update(path="", depth=0)
+
+        self.assertEqual(rebuild_comment_paths(batch_size=2), 5)
+        self.assertEqual(
+            list(Comment.objects.values_list("id", "path", "depth")), expected
+        )
+        self.assertEqual(rebuild_comment_paths(batch_size=2), 0)
+
+    def test_too_deep_thread_is_reported(self):
+        """Тести, що гілка, глибша за Comment.MAX_DEPTH, називає свої коментарі."""
+        author = Author.objects.create(
+            username="test_user", email="test_user@gmail.com"
+        )
+        comments = Comment.objects.bulk_create(
+            Comment(text="Comment", author=author)
+            for _ in range(Comment.MAX_DEPTH + 2)
+        )
+        for parent, comment in zip(comments, comments[1:]):
+            Comment.objects.filter(id=comment.id).update(parent_id=parent.id)
+
+        with self.assertRaisesMessage(CommandError, str(comments[-1].id)):
+            call_command("rebuild_comment_paths", stdout=StringIO())
+
+
+class RecountCommentRepliesTestCase(TestCase):
+    """Тести для лічильників відповідей та функції recount_comment_replies."""
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        """Встановлює дані тестів, створюючи гілку з відповідями."""
+        cls.author = Author.objects.create(
+            username="test_user", email="test_user@gmail.com"
+        )
+        cls.root = Comment.objects.create(text="Root", author=cls.author)
+        cls.answers = []
+        for parent in (cls.root, cls.root, None):
+            answer = Comment.objects.create(
+                text="Answer",
+                author=cls.author,
+                parent=parent or cls.answers[0],
+            )
+            answer.update_ancestor_counters()
+            cls.answers.append(answer)
+
+    def get_counters(self) -> dict[int, tuple]:
+        """Повертає лічильники всіх коментарів."""
+        return {
+            id: counters
+            for id, *counters in Comment.objects.values_list(
+                "id", "reply_count", "descendant_count", "last_activity"
+            )
+        }
+
+    def test_counters_are_updated_on_reply(self):
+        """Тести, що відповіді оновлюють лічильники та час активності предків."""
+        counters = self.get_counters()
+        last_answer = self.answers[-1]
+        self.assertEqual(
+            counters[self.root.id], [2, 3, last_answer.created]
+        )
+        self.assertEqual(
+            counters[self.answers[0].id], [1, 1, last_answer.created]
+        )
+        self.assertEqual(counters[last_answer.id][:2], [0, 0])
+
+    def test_recount_repairs_drift(self):
+        """Тести, що перерахунок виправляє зіпсовані лічильники."""
+        expected = self.get_counters()
+        Comment.objects.update(reply_count=7, descendant_count=0)
+
+        self.assertEqual(recount_comment_replies(batch_size=1), 4)
+        self.assertEqual(self.get_counters(), expected)
+        self.assertEqual(recount_comment_replies(), 0)
@@ -0,0 +1,46 @@
+"""Цей модуль містить тести для декодування зображень з data URL."""
+
+import base64
+from unittest import mock
+
+from django.test import SimpleTestCase, override_settings
+from django.core.exceptions import BadRequest
+
+from comments.uploads import get_file_from_data_url
+
+
+class GetFileFromDataUrlTestCase(SimpleTestCase):
+    """Тести для функції get_file_from_data_url."""
+
+    content = bytes(range(256)) * 40
+
+    def get_data_url_(self, mime: str = "image/png") -> str:
+        """Повертає data URL з тестовим вмістом."""
+        return f"data:{mime};base64," + base64.b64encode(self.content).decode()
+
+    def test_decodes_in_chunks(self):
+        """Тести, що вміст декодується частинами без змін."""
+        with mock.patch("comments.uploads.CHUNK_LENGTH", 8):
+            file = get_file_from_data_url(self.get_data_url_(), "image.png")
+        self.assertEqual(file.name, "image.png")
+        self.assertEqual(file.read(), self.content)
+
+    def test_rejects_unsupported_mime_type(self):
+        """Тести, що data URL не зображення призводить до BadRequest."""
+        with self.assertRaises(BadRequest):
+            get_file_from_data_url(self.get_data_url_("text/html"), "a.png")
+
+    def test_rejects_invalid_base64(self):
+        """Тести, що неправильний base64 призводить до BadRequest."""
+        with self.assertRaises(BadRequest):
+            get_file_from_data_url("data:image/png;base64,ab$d", "a.png")
+        with self.assertRaises(BadRequest):
+            get_file_from_data_url("data:image/png;base64,abc", "a.png")
+
+    @override_settings(COMMENTS_CANVAS_MAX_SIZE=1024)
+    def test_rejects_too_large_image_before_decoding(self):
+        """Тести, що завелике зображення відхиляється до декодування."""
+        with mock.patch("comments.uploads.base64.b64decode") as b64decode:
+            with self.assertRaises(BadRequest):
+                get_file_from_data_url(self.get_data_url_(), "image.png")
+        b64decode.assert_not_called()
@@ -1,11 +1,19 @@
 """Цей модуль містить тести для представлень додатку 'comments'."""
 
+from unittest import mock
+
+from django.db import connection
 from django.urls import reverse
-from django.test import TestCase
+from django.test import TestCase, override_settings
 from django.http import HttpResponse
+from django.test.utils import CaptureQueriesContext
+
+from captcha.models import CaptchaStore
 
 from comments.models import Author, Comment
 from comments.forms import CommentModelForm
+from comments.cache import get_cache
+from comments.page_cache import invalidate_list_pages
 
 
 class CommentListViewTestCase(TestCase):
@@ -30,6 +38,7 @@ class CommentListViewTestCase(TestCase):
 
     def setUp(self) -> None:
         """Встановлює тести, отримаючи відповідь з URL -адреси виду."""
+        get_cache().clear()
         self.response = self.client.get(self.url)
 
     def test_view_url_exists_at_desired_location(self):
@@ -131,6 +140,14 @@ class CommentListViewTestCase(TestCase):
             list(self.queryset.order_by("-author__email")[:25]),
         )
 
+    def test_lists_comments_ordered_by_last_activity_desc(self):
+        """Тести, які коментарі, упорядковані останньою активністю (DESC), перераховані на сторінці."""
+        response = self.client.get(f"{self.url}?orderby=a&orderdir=desc")
+        self.assertEqual(
+            response.context["page_obj"].object_list,
+            list(self.queryset.order_by("-last_activity")[:25]),
+        )
+
     def test_404_with_invalid_order_parameters(self):
         """Тести, які недійсні параметри порядку призводять до 404."""
         response = self.client.get(f"{self.url}?orderby=wrong&orderdir=asc")
@@ -146,6 +163,298 @@ class CommentListViewTestCase(TestCase):
         self.assertEqual(response.status_code, 404)
 
 
+class CommentListConditionalGetTestCase(TestCase):
+    """Тести для умовних запитів та заголовків кешування списку коментарів."""
+
+    url = "/"
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        """Встановлює дані тестів, створюючи автора та коментар."""
+        cls.author = Author.objects.create(
+            username="test_user", email="test_user@gmail.com"
+        )
+        Comment.objects.create(text="Tests comment", author=cls.author)
+
+    def setUp(self) -> None:
+        """Встановлює тести, очищаючи кеш фрагментів гілок."""
+        get_cache().clear()
+
+    def test_public_page_has_validators(self):
+        """Тести, що сторінка без даних користувача кешується на проксі."""
+        etag = self.client.get(self.url)["ETag"]
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertTrue(response["ETag"].startswith('W/"'))
+        self.assertNotIn("Last-Modified", response)
+        self.assertIn("public", response["Cache-Control"])
+        self.assertIn("s-maxage=10", response["Cache-Control"])
+        self.assertIn("Cookie", response["Vary"])
+
+    def test_page_setting_csrf_cookie_is_private(self):
+        """Тести, що сторінка, яка встановлює cookie CSRF, не кешується на проксі."""
+        response = self.client.get(self.url)
+        self.assertIn("csrftoken", response.cookies)
+        self.assertIn("ETag", response)
+        self.assertIn("private", response["Cache-Control"])
+        self.assertNotIn("public", response["Cache-Control"])
+        self.assertNotIn("s-maxage", response["Cache-Control"])
+
+    def test_304_until_a_comment_is_added(self):
+        """Тести, що сторінка повертається як 304 до появи нового коментаря."""
+        etag = self.client.get(self.url)["ETag"]
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+        Comment.objects.create(text="New comment", author=self.author)
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+
+    def test_etag_changes_with_list_page_version(self):
+        """Тести, що ETag змінюється, коли сторінки списку стають застарілими."""
+        etag = self.client.get(self.url)["ETag"]
+        invalidate_list_pages()
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        response = self.client.get(
+            self.url, HTTP_IF_MODIFIED_SINCE="Fri, 01 Jan 2100 00:00:00 GMT"
+        )
+        self.assertEqual(response.status_code, 200)
+
+    def test_etag_depends_on_ordering_and_page(self):
+        """Тести, що ETag залежить від сортування та сторінки запиту."""
+        etags = {
+            self.client.get(self.url, params)["ETag"]
+            for params in (
+                {},
+                {"orderby": "u"},
+                {"orderby": "u", "orderdir": "asc"},
+                {"page": 1},
+            )
+        }
+        self.assertEqual(len(etags), 4)
+
+    def test_private_page_with_messages(self):
+        """Тести, що сторінка з повідомленнями не кешується та не дає 304."""
+        etag = self.client.get(self.url)["ETag"]
+        self.client.post(reverse("add"), {"text": "Invalid"})
+
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn("ETag", response)
+        self.assertIn("private", response["Cache-Control"])
+        self.assertIn("no-cache", response["Cache-Control"])
+
+    def test_invalid_form_data_is_kept_per_client(self):
+        """Тести, що дані невалідної форми бачить лише клієнт, що її надіслав."""
+        self.client.post(reverse("add"), {"username": "user", "text": "Hi"})
+        other_client = self.client_class()
+
+        response = other_client.get(self.url)
+        self.assertIsNone(response.context["form"].data.get("username"))
+        response = self.client.get(self.url)
+        self.assertEqual(response.context["form"].data["username"], "user")
+        response = self.client.get(self.url)
+        self.assertIsNone(response.context["form"].data.get("username"))
+
+    def test_private_page_with_inline_captcha(self):
+        """Тести, що сторінка з CAPTCHA у формі не кешується."""
+        captcha_widget = CommentModelForm.base_fields["captcha"].widget
+        with mock.patch.object(captcha_widget, "is_lazy", False):
+            response = self.client.get(self.url)
+        self.assertNotIn("ETag", response)
+        self.assertIn("private", response["Cache-Control"])
+
+    def test_get_does_not_write_to_database(self):
+        """Тести, що відображення сторінки не створює виклик CAPTCHA."""
+        self.client.get(self.url)
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(self.url)
+        self.assertFalse(
+            any(
+                not query["sql"].startswith("SELECT")
+                for query in context.captured_queries
+            )
+        )
+        self.assertFalse(CaptchaStore.objects.exists())
+        self.assertContains(response, reverse("captcha-refresh"))
+
+    def test_captcha_challenge_is_not_cached(self):
+        """Тести, що новий виклик CAPTCHA видається з забороною кешування."""
+        response = self.client.get(
+            reverse("captcha-refresh"), HTTP_X_REQUESTED_WITH="XMLHttpRequest"
+        )
+        self.assertTrue(
+            CaptchaStore.objects.filter(hashkey=response.json()["key"])
+        )
+        self.assertIn("no-store", response["Cache-Control"])
+
+
+class CommentListAPIViewTestCase(TestCase):
+    """Тести для представлення JSON API списку коментарів."""
+
+    url = "/api/comments/"
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        """Встановлює дані тестів, створюючи 28 коментарів."""
+        for count in range(1, 29):
+            Comment.objects.create(
+                text=f"Tests comment #{count}",
+                author=Author.objects.create(
+                    username=f"test_user_{count}",
+                    email=f"test_user_{count}@gmail.com",
+                ),
+            )
+
+    def setUp(self) -> None:
+        """Встановлює тести, очищаючи кеш лічильника коментарів."""
+        get_cache().clear()
+
+    def test_view_url_accessible_by_name(self):
+        """Тести, що представлення доступне за іменем та повертає JSON."""
+        response = self.client.get(reverse("api-list"))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Content-Type"], "application/json")
+
+    def test_uses_list_ordering_and_pagination(self):
+        """Тести, що сортування та пагінація такі самі, як у списку."""
+        data = self.client.get(
+            self.url, {"orderby": "u", "orderdir": "asc", "page": 2}
+        ).json()
+        expected = Comment.objects.order_by("author_username")[25:]
+        self.assertEqual(data["count"], 28)
+        self.assertIsNone(data["next"])
+        self.assertIn("page=1", data["previous"])
+        self.assertEqual(
+            [row["id"] for row in data["results"]],
+            [comment.id for comment in expected],
+        )
+
+    def test_only_selected_fields_are_loaded(self):
+        """Тести, що невибрані стовпці не потрапляють у запит та відповідь."""
+        with CaptureQueriesContext(connection) as context:
+            data = self.client.get(self.url, {"fields": "id,username"}).json()
+        self.assertEqual(set(data["results"][0]), {"id", "username"})
+        self.assertFalse(
+            any(
+                '"text"' in query["sql"]
+                for query in context.captured_queries
+            )
+        )
+
+    def test_400_with_unknown_field(self):
+        """Тести, що невідоме поле призводить до 400."""
+        response = self.client.get(self.url, {"fields": "id,path"})
+        self.assertEqual(response.status_code, 400)
+
+    def test_404_with_invalid_order_parameters(self):
+        """Тести, що невалідні параметри сортування призводять до 404."""
+        response = self.client.get(self.url, {"orderby": "x"})
+        self.assertEqual(response.status_code, 404)
+
+    def test_email_is_not_exposed(self):
+        """Тести, що email автора не повертається та не може бути вибраний."""
+        data = self.client.get(self.url).json()
+        self.assertNotIn("email", data["results"][0])
+        self.assertNotIn("@gmail.com", str(data))
+        response = self.client.get(self.url, {"fields": "id,email"})
+        self.assertEqual(response.status_code, 400)
+
+    def test_304_with_matching_etag(self):
+        """Тести, що незмінена сторінка повертається як 304 Not Modified."""
+        etag = self.client.get(self.url)["ETag"]
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+        Comment.objects.create(
+            text="New comment", author=Author.objects.first()
+        )
+        get_cache().clear()
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+
+    @override_settings(COMMENTS_CURSOR_PAGINATION=True)
+    def test_cursor_pagination(self):
+        """Тести, що з курсорною пагінацією сторінки йдуть за курсором."""
+        data = self.client.get(self.url, {"fields": "text"}).json()
+        self.assertIsNone(data["count"])
+        next_data = self.client.get(data["next"]).json()
+        self.assertEqual(len(next_data["results"]), 3)
+        self.assertEqual(
+            next_data["results"][-1]["text"], "Tests comment #1"
+        )
+
+
+@override_settings(COMMENTS_INLINE_DEPTH=2, COMMENTS_INLINE_REPLIES=2)
+class CommentRepliesViewTestCase(TestCase):
+    """Тести для представлення сторінки відповідей на коментар."""
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        """Встановлює дані тестів, створюючи коментар з п'ятьма відповідями."""
+        cls.author = Author.objects.create(
+            username="test_user", email="test_user@gmail.com"
+        )
+        cls.root = Comment.objects.create(text="Root", author=cls.author)
+        cls.replies = []
+        for count in range(5):
+            reply = Comment.objects.create(
+                text=f"Reply #{count}", author=cls.author, parent=cls.root
+            )
+            reply.update_ancestor_counters()
+            cls.replies.append(reply)
+        cls.root.refresh_from_db()
+
+    def setUp(self) -> None:
+        """Встановлює тести, очищаючи кеш фрагментів гілок."""
+        get_cache().clear()
+
+    def test_list_renders_stub_instead_of_hidden_replies(self):
+        """Тести, що список відображає лише частину відповідей та кнопку."""
+        response = self.client.get("/")
+        self.assertContains(response, "Reply #4")
+        self.assertContains(response, "Reply #3")
+        self.assertNotContains(response, "Reply #2")
+        self.assertContains(response, "Show 3 more replies")
+        self.assertContains(
+            response, reverse("replies", args=[self.root.id]) + "?cursor="
+        )
+
+    def test_pages_of_replies_follow_the_cursor(self):
+        """Тести, що сторінки відповідей продовжуються за курсором."""
+        url, texts = reverse("replies", args=[self.root.id]), []
+        for _ in range(3):
+            separator = "&" if "?" in url else "?"
+            response = self.client.get(f"{url}{separator}format=json")
+            self.assertEqual(response.status_code, 200)
+            data = response.json()
+            texts += [reply["text"] for reply in data["replies"]]
+            url = data["next_url"]
+        self.assertIsNone(url)
+        self.assertEqual(
+            texts, [reply.text for reply in reversed(self.replies)]
+        )
+
+    def test_returns_html_fragment_with_next_stub(self):
+        """Тести, що HTML-фрагмент містить відповіді та кнопку наступної сторінки."""
+        response = self.client.get(reverse("replies", args=[self.root.id]))
+        self.assertContains(response, "Reply #4")
+        self.assertNotContains(response, "Reply #2")
+        self.assertContains(response, "load-replies")
+        self.assertNotContains(response, "<html")
+
+    def test_404_with_invalid_cursor_or_comment(self):
+        """Тести, що неправильний курсор та неіснуючий коментар призводять до 404."""
+        url = reverse("replies", args=[self.root.id])
+        self.assertEqual(
+            self.client.get(url, {"cursor": "invalid"}).status_code, 404
+        )
+        url = reverse("replies", args=[self.replies[-1].id + 1])
+        self.assertEqual(self.client.get(url).status_code, 404)
+
+
 class CommentCreateViewTestCase(TestCase):
     """Тести для представлення додавання коментарів."""
 
@@ -0,0 +1,237 @@
+"""Цей модуль використовується для завантаження та індексування дерев коментарів."""
+
+from functools import reduce
+from collections import defaultdict
+from collections.abc import Iterable
+from operator import or_
+
+from django.db.models import F, Model, Q, Window
+from django.db.models.functions import RowNumber
+
+from .models import (
+    Comment,
+    MAX_PATH_LENGTH,
+    PATH_STEP_LENGTH,
+    get_path_step_for_,
+)
+
+
+def load_comment_trees(
+    roots: Iterable[Comment],
+    max_depth: int | None = None,
+    max_children: int | None = None,
+) -> list[Comment]:
+    """Ця функція завантажує нащадків переданих коментарів та збирає з них дерева.
+
+    Кожен коментар дерева отримує атрибут 'children' зі списком дочірніх
+    коментарів, тому під час відображення запити до бази даних не потрібні.
+    Якщо дерево обрізане, дочірніх коментарів менше, ніж 'reply_count'.
+
+    Args:
+        roots (Iterable[Comment]): Кореневі коментарі (наприклад, сторінка списку).
+        max_depth (int | None): Кількість рівнів відповідей під коренем.
+        max_children (int | None): Кількість відповідей одного коментаря.
+
+    Returns:
+        list[Comment]: Кореневі коментарі з зібраними деревами.
+    """
+    roots = list(roots)
+    children_by_parent_id: dict[int, list[Comment]] = defaultdict(list)
+    descendants = []
+    if roots and max_depth != 0:
+        descendants = get_descendants_of_(roots, max_depth, max_children)
+
+    for comment in descendants:
+        children_by_parent_id[comment.parent_id].append(comment)
+    for comment in (*roots, *descendants):
+        comment.children = children_by_parent_id.get(comment.id, [])
+    return roots
+
+
+def get_descendants_of_(
+    roots: list[Comment],
+    max_depth: int | None = None,
+    max_children: int | None = None,
+) -> list[Comment]:
+    """Ця функція повертає нащадків переданих коментарів.
+
+    Без обмеження кількості відповідей нащадки вибираються за префіксом
+    матеріалізованого шляху, тобто одним запитом з діапазонним скануванням
+    індексу. Інакше нащадки вибираються окремим запитом для кожного рівня і
+    лише для коментарів, що залишились на попередньому рівні, а кількість
+    відповідей одного коментаря обмежується віконною функцією ROW_NUMBER().
+    Тому відповіді обрізаних коментарів не вибираються з бази даних.
+
+    Args:
+        roots (list[Comment]): Кореневі коментарі.
+        max_depth (int | None): Кількість рівнів відповідей під коренем.
+        max_children (int | None): Кількість відповідей одного коментаря.
+
+    Returns:
+        list[Comment]: Нащадки коментарів (новіші відповіді спочатку).
+    """
+    queryset = Comment.objects.select_related("author")
+    if max_children is None:
+        return list(
+            queryset.filter(
+                reduce(
+                    or_,
+                    (
+                        Q(path__startswith=root.path, depth__gt=root.depth)
+                        & (
+                            Q(depth__lte=root.depth + max_depth)
+                            if max_depth is not None
+                            else Q()
+                        )
+                        for root in roots
+                    ),
+                )
+            ).order_by("-created", "-id")
+        )
+
+    descendants, parents, depth = [], roots, 0
+    while parents and (max_depth is None or depth < max_depth):
+        parents = list(
+            queryset.filter(parent_id__in=[parent.id for parent in parents])
+            .annotate(
+                sibling_number=Window(
+                    RowNumber(),
+                    partition_by=F("parent_id"),
+                    order_by=(F("created").desc(), F("id").desc()),
+                )
+            )
+            .filter(sibling_number__lte=max_children)
+        )
+        descendants.extend(parents)
+        depth += 1
+    descendants.sort(key=lambda comment: (comment.created, comment.id))
+    return descendants[::-1]
+
+
+def get_children_of_(comment: Comment) -> Iterable[Comment]:
+    """Ця функція повертає дочірні коментарі із зібраного дерева або з бази даних.
+
+    Args:
+        comment (Comment): Батьківський коментар.
+
+    Returns:
+        Iterable[Comment]: Дочірні коментарі.
+    """
+    children = getattr(comment, "children", None)
+    return comment.comment_set.all() if children is None else children
+
+
+def rebuild_comment_paths(
+    comment_model: type[Model] = Comment, batch_size: int = 1000
+) -> int:
+    """Ця функція перебудовує матеріалізовані шляхи та глибини всіх коментарів.
+
+    Коментарі обробляються пачками в порядку ідентифікаторів, тому батьківський
+    коментар завжди обробляється раніше за свої відповіді.
+
+    Args:
+        comment_model (type[Model]): Модель коментарів (також історична модель міграції).
+        batch_size (int): Кількість коментарів в одній пачці.
+
+    Raises:
+        ValueError: Якщо шлях коментаря довший за MAX_PATH_LENGTH (гілка
+            глибша за Comment.MAX_DEPTH). Повідомлення містить ідентифікатори.
+
+    Returns:
+        int: Кількість оновлених коментарів.
+    """
+    last_id, updated = 0, 0
+    while True:
+        batch = list(
+            comment_model.objects.filter(id__gt=last_id)
+            .order_by("id")
+            .only("id", "parent_id", "path", "depth")[:batch_size]
+        )
+        if not batch:
+            return updated
+
+        paths = dict(
+            comment_model.objects.filter(
+                id__in={c.parent_id for c in batch if c.parent_id}
+            ).values_list("id", "path")
+        )
+        changed, too_deep = [], []
+        for comment in batch:
+            parent_path = paths.get(comment.parent_id, "")
+            path = parent_path + get_path_step_for_(comment.id)
+            depth = len(parent_path) // PATH_STEP_LENGTH
+            paths[comment.id] = path
+            if len(path) > MAX_PATH_LENGTH:
+                too_deep.append(comment.id)
+
+            if (comment.path, comment.depth) != (path, depth):
+                comment.path, comment.depth = path, depth
+                changed.append(comment)
+
+        if too_deep:
+            raise ValueError(
+                f"Comments {too_deep} are nested deeper than "
+                f"{MAX_PATH_LENGTH // PATH_STEP_LENGTH} levels, so their "
+                f"tree paths do not fit in {MAX_PATH_LENGTH} characters."
+            )
+        comment_model.objects.bulk_update(changed, ["path", "depth"])
+        updated += len(changed)
+        last_id = batch[-1].id
+
+
+def recount_comment_replies(
+    comment_model: type[Model] = Comment, batch_size: int = 100
+) -> int:
+    """Ця функція перераховує лічильники відповідей та час активності всіх коментарів.
+
+    Коментарі обробляються гілками: для пачки кореневих коментарів одним
+    запитом за префіксом шляху вибираються всі їхні нащадки.
+
+    Args:
+        comment_model (type[Model]): Модель коментарів (також історична модель міграції).
+        batch_size (int): Кількість гілок в одній пачці.
+
+    Returns:
+        int: Кількість виправлених коментарів.
+    """
+    fields = ("reply_count", "descendant_count", "last_activity")
+    last_id, updated = 0, 0
+    while True:
+        root_paths = list(
+            comment_model.objects.filter(
+                parent_id__isnull=True, id__gt=last_id
+            )
+            .order_by("id")
+            .values_list("id", "path")[:batch_size]
+        )
+        if not root_paths:
+            return updated
+
+        comments = list(
+            comment_model.objects.filter(
+                reduce(or_, (Q(path__startswith=p) for _, p in root_paths))
+            ).only("id", "parent_id", "path", "created", *fields)
+        )
+        counters = {
+            comment.id: [0, 0, comment.created] for comment in comments
+        }
+        # Deeper comments first, so each child is final before its parent.
+        for comment in sorted(comments, key=lambda c: -len(c.path)):
+            if comment.parent_id in counters:
+                _, descendants, activity = counters[comment.id]
+                parent = counters[comment.parent_id]
+                parent[0] += 1
+                parent[1] += descendants + 1
+                parent[2] = max(parent[2], activity)
+
+        changed = []
+        for comment in comments:
+            values = counters[comment.id]
+            if [getattr(comment, field) for field in fields] != values:
+                for field, value in zip(fields, values):
+                    setattr(comment, field, value)
+                changed.append(comment)
+
+        comment_model.objects.bulk_update(changed, fields)
+        updated += len(changed)
+        last_id = root_paths[-1][0]
@@ -0,0 +1,58 @@
+"""Цей модуль використовується для декодування зображень, завантажених як data URL."""
+
+import re
+import base64
+import binascii
+from tempfile import SpooledTemporaryFile
+
+from django.conf import settings
+from django.core.files import File
+from django.core.exceptions import BadRequest
+
+
+DATA_URL_PREFIX = re.compile(
+    r"data:(?P<mime>image/(?:png|jpeg|gif|webp));base64,"
+)
+# A multiple of 4 characters, so every chunk decodes on its own.
+CHUNK_LENGTH = 64 * 1024
+
+
+def get_file_from_data_url(data_url: str, filename: str) -> File:
+    """Ця функція декодує зображення з data URL частинами у тимчасовий файл.
+
+    Перед декодуванням перевіряються MIME-тип та розмір результату, а
+    base64 декодується частинами по CHUNK_LENGTH символів, тому в пам'яті
+    немає ні копії рядка, ні всього декодованого зображення. Файли, більші
+    за FILE_UPLOAD_MAX_MEMORY_SIZE, записуються на диск.
+
+    Args:
+        data_url (str): URL-адреса зображення в форматі base64.
+        filename (str): Ім'я файлу.
+
+    Raises:
+        BadRequest: Якщо data URL неправильний або зображення завелике.
+
+    Returns:
+        File: Файл із декодованим зображенням (на початку).
+    """
+    prefix = DATA_URL_PREFIX.match(data_url)
+    if prefix is None:
+        raise BadRequest("Unsupported image data URL.")
+
+    start = prefix.end()
+    encoded_length = len(data_url) - start
+    if encoded_length % 4:
+        raise BadRequest("Invalid image data.")
+    if encoded_length // 4 * 3 > settings.COMMENTS_CANVAS_MAX_SIZE:
+        raise BadRequest("The image is too large.")
+
+    file = SpooledTemporaryFile(max_size=settings.FILE_UPLOAD_MAX_MEMORY_SIZE)
+    try:
+        for offset in range(start, len(data_url), CHUNK_LENGTH):
+            chunk = data_url[offset : offset + CHUNK_LENGTH]
+            file.write(base64.b64decode(chunk, validate=True))
+    except binascii.Error:
+        file.close()
+        raise BadRequest("Invalid image data.")
+    file.seek(0)
+    return File(file, name=filename)
@@ -1,11 +1,26 @@
 """Цей модуль містить шляхи для додатку 'comments'."""
 
+from django.conf import settings
 from django.urls import path
 
 from . import views
 
 
+# Under ASGI the list and create views are native async views.
+if settings.COMMENTS_ASYNC_VIEWS:
+    list_view = views.AsyncCommentListView
+    create_view = views.AsyncCommentCreateView
+else:
+    list_view = views.CommentListView
+    create_view = views.CommentCreateView
+
 urlpatterns = [
-    path("", views.CommentListView.as_view(), name="list"),
-    path("add/", views.CommentCreateView.as_view(), name="add"),
+    path("", list_view.as_view(), name="list"),
+    path("add/", create_view.as_view(), name="add"),
+    path("api/comments/", views.CommentListAPIView.as_view(), name="api-list"),
+    path(
+        "comments/<int:pk>/replies/",
+        views.CommentRepliesView.as_view(),
+        name="replies",
+    ),
 ]
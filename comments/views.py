@@ -1,26 +1,116 @@
 """Цей модуль використовується для розміщення представлень додатку "comments"."""
 
+import json
+import hashlib
 from typing import Any, NoReturn
 
 from django import http
+from django.conf import settings
 from django.views import generic
 from django.contrib import messages
+from django.core.exceptions import BadRequest
+from django.shortcuts import get_object_or_404
+from django.utils.http import urlencode
+from django.utils.cache import (
+    get_conditional_response,
+    patch_cache_control,
+    patch_vary_headers,
+)
+from django.core.serializers.json import DjangoJSONEncoder
+from django.utils.decorators import method_decorator
+from django.views.decorators.cache import never_cache
+from django.views.generic.list import MultipleObjectMixin
+from captcha.views import captcha_image
+from captcha.conf import settings as captcha_settings
+from captcha.helpers import captcha_audio_url, captcha_image_url
 
 from . import services
+from .fragment_cache import render_comment_threads
+from .pagination import (
+    CursorPaginator,
+    InvalidCursor,
+    RootCommentPaginator,
+)
 from .models import Comment
 from .forms import CommentModelForm
-from general.views import BaseView
+from .captcha_store import get_captcha_challenge, get_captcha_image
+from .page_cache import (
+    cache_page,
+    get_cached_page,
+    get_list_page_version,
+    get_page_cache_key,
+)
+from .form_state import (
+    clear_form_data,
+    has_form_data,
+    load_form_data,
+    save_form_data,
+)
+from .tree import get_children_of_, load_comment_trees
+from .templatetags.comment_filters import (
+    CHILD_COMMENTS_OPEN,
+    CLOSE_DIV,
+    REPLIES_ORDERING,
+    get_load_replies_stub_,
+    get_replies_cursor_after_,
+    get_replies_url_,
+    render_comments,
+)
+from general.views import AsyncBaseView, BaseView
+from general.blocking import run_blocking
 
 
-FORM_DATA = {}
-
-
-class CommentListView(BaseView, generic.ListView):
-    """Представлення для відображення всіх коментарів."""
+class RootCommentListMixin(MultipleObjectMixin):
+    """Домішка зі спільними сортуванням та пагінацією кореневих коментарів."""
 
     paginate_by = 25
+    paginator_class = RootCommentPaginator
     queryset = Comment.objects.all().filter(parent_id__isnull=True)
 
+    def get_ordering(self) -> str | None:
+        """Цей метод повертає рядок сортування або None за GET-параметрами.
+
+        Returns:
+            get_ordering_string: Рядок сортування або None.
+        """
+        return services.get_ordering_string(*self.get_ordering_parameters_())
+
+    def get_ordering_parameters_(self) -> tuple[str, str]:
+        """Цей метод повертає GET-параметри сортування з типовими значеннями.
+
+        Returns:
+            tuple[str, str]: Значення 'orderby' та 'orderdir'.
+        """
+        return (
+            self.request.GET.get("orderby") or "c",
+            self.request.GET.get("orderdir") or "desc",
+        )
+
+    def paginate_queryset(self, queryset, page_size: int) -> tuple:
+        """Цей метод розбиває коментарі на сторінки (за номером або за курсором).
+
+        Курсорна пагінація вмикається налаштуванням COMMENTS_CURSOR_PAGINATION.
+
+        Raises:
+            404: Якщо курсор підроблений або не відповідає сортуванню.
+
+        Returns:
+            tuple: Пагінатор, сторінка, коментарі сторінки та чи є інші сторінки.
+        """
+        if not settings.COMMENTS_CURSOR_PAGINATION:
+            return super().paginate_queryset(queryset, page_size)
+
+        paginator = CursorPaginator(queryset, page_size, self.get_ordering())
+        try:
+            page = paginator.page(self.request.GET.get("cursor"))
+        except InvalidCursor:
+            raise http.Http404
+        return (paginator, page, page.object_list, page.has_other_pages())
+
+
+class CommentListView(BaseView, RootCommentListMixin, generic.ListView):
+    """Представлення для відображення всіх коментарів."""
+
     def get(
         self, request: http.HttpRequest, *args: Any, **kwargs: Any
     ) -> http.HttpResponse | NoReturn:
@@ -34,32 +124,398 @@ class CommentListView(BaseView, generic.ListView):
         """
         if self.get_ordering() is None:
             raise http.Http404
-        return super().get(request, *args, **kwargs)
+        if self.has_personal_content_():
+            response = self.get_page_response_(request, *args, **kwargs)
+            clear_form_data(request, response)
+            patch_cache_control(response, private=True, no_cache=True)
+            return response
 
-    def get_ordering(self) -> str | None:
-        """Цей метод повертає рядок сортування або None за GET-параметрами.
+        etag = self.get_etag_()
+        response = get_conditional_response(request, etag=etag)
+        if response is None:
+            response = self.get_page_response_(request, *args, **kwargs)
+        response["ETag"] = etag
+        if request.META.get("CSRF_COOKIE_NEEDS_UPDATE"):
+            # The response sets the client's CSRF cookie, so a shared cache
+            # would hand that cookie to other clients.
+            patch_cache_control(response, private=True, max_age=0)
+        else:
+            patch_cache_control(
+                response,
+                public=True,
+                max_age=0,
+                s_maxage=settings.COMMENTS_LIST_SHARED_MAX_AGE,
+            )
+        patch_vary_headers(response, ["Cookie"])
+        return response
+
+    def get_page_response_(
+        self, request: http.HttpRequest, *args: Any, **kwargs: Any
+    ) -> http.HttpResponse:
+        """Цей метод повертає сторінку з повного кешу сторінок або відображає її.
+
+        Кешуються лише сторінки без CAPTCHA та даних невалідної форми: токен
+        CSRF та повідомлення вставляються в дірки закешованої сторінки.
+        Ключ залежить від нормалізованого сортування та сторінки (або курсора)
+        та від адреси сайту, тому сторінка відображається лише з нормалізованих
+        параметрів (див. get_context_data), а не з сирого запиту.
 
         Returns:
-            get_ordering_string: Рядок сортування або None.
+            http.HttpResponse: Відповідь зі сторінкою списку.
         """
-        return services.get_ordering_string(
-            self.request.GET.get("orderby") or "c",
-            self.request.GET.get("orderdir") or "desc",
+        if self.has_inline_captcha_() or has_form_data(request):
+            return super().get(request, *args, **kwargs)
+
+        page = request.GET.get("cursor", "")
+        if not settings.COMMENTS_CURSOR_PAGINATION:
+            page = request.GET.get(self.page_kwarg) or "1"
+        key = get_page_cache_key(
+            self.get_ordering(), page, request.build_absolute_uri("/")
+        )
+        content = get_cached_page(key, request)
+        if content is not None:
+            return http.HttpResponse(content)
+
+        response = super().get(request, *args, **kwargs).render()
+        cache_page(key, response.content.decode())
+        return response
+
+    def has_personal_content_(self) -> bool:
+        """Цей метод повертає, чи містить сторінка дані конкретного користувача.
+
+        Такими є CAPTCHA, що генерується під час відображення форми,
+        повідомлення та дані невалідної форми. Таку сторінку не можна
+        кешувати на проксі-сервері або повертати як 304 Not Modified.
+
+        Returns:
+            bool: Чи містить сторінка дані користувача.
+        """
+        return (
+            self.has_inline_captcha_()
+            or has_form_data(self.request)
+            or len(messages.get_messages(self.request)) > 0
+        )
+
+    def has_inline_captcha_(self) -> bool:
+        """Цей метод повертає, чи відображається CAPTCHA разом зі сторінкою (не ліниво)."""
+        captcha_widget = CommentModelForm.base_fields["captcha"].widget
+        return not getattr(captcha_widget, "is_lazy", False)
+
+    def get_etag_(self) -> str:
+        """Цей метод повертає ETag сторінки списку.
+
+        ETag залежить від останнього коментаря (будь-який новий коментар
+        змінює якусь сторінку), від версії сторінок списку (її збільшує,
+        наприклад, оптимізація зображення коментаря) та від сортування і
+        сторінки запиту. ETag слабкий, бо токен CSRF у формі змінюється з
+        кожною відповіддю. Last-Modified не надсилається: зміна версії
+        сторінок не має часу, тому If-Modified-Since повертав би 304 для
+        зміненої сторінки.
+
+        Returns:
+            str: ETag сторінки.
+        """
+        latest = services.get_latest_comment_key()
+        latest_id = latest[0] if latest is not None else 0
+        scope = "&".join(
+            f"{name}={self.request.GET.get(name, '')}"
+            for name in ("orderby", "orderdir", self.page_kwarg, "cursor")
         )
+        version = get_list_page_version()
+        digest = hashlib.sha256(
+            f"{latest_id}:{version}?{scope}".encode()
+        ).hexdigest()
+        return f'W/"{digest}"'
 
     def get_context_data(self, **kwargs: Any) -> dict[str, Any]:
-        """Цей метод додає форму до контексту та повертає його.
+        """Цей метод додає форму та дерева коментарів сторінки до контексту та повертає його.
 
         Returns:
             context: Контекст представлення.
         """
-        global FORM_DATA
         context = super().get_context_data(**kwargs)
-        context["form"] = CommentModelForm(FORM_DATA or None)
-        FORM_DATA = {}
+        page_obj = context["page_obj"]
+        page_obj.object_list = render_comment_threads(page_obj.object_list)
+        context["form"] = CommentModelForm(load_form_data(self.request))
+
+        # The page may be cached, so links use only normalized parameters.
+        orderby, orderdir = self.get_ordering_parameters_()
+        ordering_query = urlencode({"orderby": orderby, "orderdir": orderdir})
+        if getattr(page_obj, "is_cursor_page", False):
+            page = {"cursor": self.request.GET.get("cursor", "")}
+        else:
+            page = {self.page_kwarg: page_obj.number}
+        context.update(
+            orderby=orderby,
+            orderdir=orderdir,
+            ordering_query=ordering_query,
+            canonical_url=self.request.build_absolute_uri(
+                f"{self.request.path}?{urlencode(page)}&{ordering_query}"
+            ),
+        )
         return context
 
 
+class AsyncCommentListView(AsyncBaseView, CommentListView):
+    """Асинхронне представлення списку коментарів (для ASGI).
+
+    Запити до бази даних та кешу виконуються в обмеженому пулі потоків
+    (general.blocking), а не в єдиному потоці, спільному для синхронних
+    поглядів та асинхронного ORM, тому сторінки відображаються паралельно.
+    """
+
+    async def get(
+        self, request: http.HttpRequest, *args: Any, **kwargs: Any
+    ) -> http.HttpResponse | NoReturn:
+        """Цей метод повертає сторінку списку коментарів.
+
+        Raises:
+            404: Якщо порядок сортування або сторінка неправильні.
+
+        Returns:
+            http.HttpResponse: Відповідь на HTTP-запит.
+        """
+        return await run_blocking(super().get, request, *args, **kwargs)
+
+
+class CommentListAPIView(BaseView, RootCommentListMixin, generic.View):
+    """Представлення JSON API для читання кореневих коментарів.
+
+    Сортування та пагінація такі самі, як у CommentListView. Параметр
+    'fields' задає імена полів (див. services.API_FIELDS), тому з бази
+    даних вибираються лише потрібні стовпці, а екземпляри моделі не
+    створюються. Відповідь має сильний ETag, тому незмінена сторінка
+    повертається як 304 Not Modified.
+    """
+
+    http_method_names = ["get"]
+
+    def get(
+        self, request: http.HttpRequest, *args: Any, **kwargs: Any
+    ) -> http.HttpResponse | NoReturn:
+        """Цей метод повертає сторінку коментарів у форматі JSON.
+
+        Raises:
+            404: Якщо порядок сортування, сторінка або курсор неправильні.
+            BadRequest: Якщо передані невідомі поля.
+
+        Returns:
+            HttpResponse: JSON зі сторінкою коментарів або 304 Not Modified.
+        """
+        fields = services.get_api_fields(request.GET.get("fields"))
+        if fields is None:
+            raise BadRequest("Unknown comment fields.")
+        if self.get_ordering() is None:
+            raise http.Http404
+
+        columns = (services.API_FIELDS[name] for name in fields)
+        queryset = self.get_queryset().values(*dict.fromkeys(("id", *columns)))
+        paginator, page, rows, _ = self.paginate_queryset(
+            queryset, self.paginate_by
+        )
+        is_cursor = getattr(page, "is_cursor_page", False)
+        body = json.dumps(
+            {
+                "count": None if is_cursor else paginator.count,
+                "next": self.get_page_url_(page, "next"),
+                "previous": self.get_page_url_(page, "previous"),
+                "results": [self.serialize_(row, fields) for row in rows],
+            },
+            cls=DjangoJSONEncoder,
+        ).encode()
+
+        etag = f'"{hashlib.sha256(body).hexdigest()}"'
+        response = get_conditional_response(request, etag=etag)
+        if response is None:
+            response = http.HttpResponse(
+                body, content_type="application/json"
+            )
+        response["ETag"] = etag
+        return response
+
+    def get_page_url_(self, page, direction: str) -> str | None:
+        """Цей метод повертає URL-адресу сусідньої сторінки або None.
+
+        Args:
+            page (Page | CursorPage): Поточна сторінка.
+            direction (str): 'next' або 'previous'.
+
+        Returns:
+            str | None: URL-адреса з тими самими GET-параметрами.
+        """
+        if not getattr(page, f"has_{direction}")():
+            return None
+
+        query = self.request.GET.copy()
+        if getattr(page, "is_cursor_page", False):
+            query["cursor"] = getattr(page, f"{direction}_cursor")
+        else:
+            query["page"] = getattr(page, f"{direction}_page_number")()
+        return f"{self.request.path}?{query.urlencode()}"
+
+    def serialize_(self, row: dict[str, Any], fields: list[str]) -> dict:
+        """Цей метод повертає словник коментаря з публічними іменами полів.
+
+        Args:
+            row (dict[str, Any]): Рядок з QuerySet.values().
+            fields (list[str]): Імена полів API.
+
+        Returns:
+            dict: Дані коментаря для JSON.
+        """
+        data = {name: row[services.API_FIELDS[name]] for name in fields}
+        if data.get("file"):
+            data["file"] = Comment.file.field.storage.url(data["file"])
+        return data
+
+
+class CommentRepliesView(BaseView, generic.View):
+    """Представлення для завантаження сторінки відповідей на коментар.
+
+    Повертає COMMENTS_INLINE_REPLIES відповідей (новіші спочатку) з їхніми
+    деревами глибиною COMMENTS_INLINE_DEPTH рівнів у вигляді HTML-фрагмента
+    або JSON (параметр 'format=json') та курсор наступної сторінки.
+    """
+
+    http_method_names = ["get"]
+
+    def get(
+        self, request: http.HttpRequest, pk: int
+    ) -> http.HttpResponse | NoReturn:
+        """Цей метод повертає сторінку відповідей на коментар.
+
+        Args:
+            request (http.HttpRequest): Об'єкт запиту.
+            pk (int): Ідентифікатор коментаря.
+
+        Raises:
+            404: Якщо коментаря немає або курсор неправильний.
+
+        Returns:
+            HttpResponse: HTML-фрагмент або JSON з відповідями.
+        """
+        comment = get_object_or_404(Comment, pk=pk)
+        paginator = CursorPaginator(
+            Comment.objects.all().filter(parent_id=comment.id),
+            settings.COMMENTS_INLINE_REPLIES,
+            REPLIES_ORDERING,
+        )
+        try:
+            page = paginator.page(request.GET.get("cursor"))
+        except InvalidCursor:
+            raise http.Http404
+
+        replies = load_comment_trees(
+            page.object_list,
+            settings.COMMENTS_INLINE_DEPTH - 1,
+            settings.COMMENTS_INLINE_REPLIES,
+        )
+        if request.GET.get("format") == "json":
+            return http.JsonResponse(
+                {
+                    "replies": [self.serialize_(reply) for reply in replies],
+                    "next_url": get_replies_url_(
+                        comment.id, page.next_cursor
+                    )
+                    if page.has_next()
+                    else None,
+                }
+            )
+
+        html = [
+            f"{CHILD_COMMENTS_OPEN}{render_comments(reply)}{CLOSE_DIV}"
+            for reply in replies
+        ]
+        if page.has_next():
+            html.append(get_load_replies_stub_(comment.id, page.next_cursor))
+        return http.HttpResponse("".join(html))
+
+    def serialize_(self, comment: Comment) -> dict[str, Any]:
+        """Цей метод повертає словник з даними коментаря та його відповідей.
+
+        Args:
+            comment (Comment): Коментар із завантаженим деревом.
+
+        Returns:
+            dict[str, Any]: Дані коментаря для JSON.
+        """
+        children = list(get_children_of_(comment))
+        more_url = None
+        if comment.reply_count > len(children):
+            more_url = get_replies_url_(
+                comment.id,
+                get_replies_cursor_after_(children[-1]) if children else None,
+            )
+        return {
+            "id": comment.id,
+            "username": comment.author.username,
+            "text": comment.text,
+            "file": comment.file.url if comment.file else None,
+            "created": comment.created.isoformat(),
+            "reply_count": comment.reply_count,
+            "descendant_count": comment.descendant_count,
+            "replies": [self.serialize_(child) for child in children],
+            "more_replies_url": more_url,
+        }
+
+
+class CaptchaRefreshView(generic.View):
+    """Представлення, що видає новий виклик CAPTCHA (з пулу, якщо він не порожній).
+
+    Відповідь така сама, як у представлення 'captcha-refresh' бібліотеки.
+    """
+
+    http_method_names = ["get"]
+
+    @method_decorator(never_cache)
+    def get(self, request: http.HttpRequest) -> http.JsonResponse:
+        """Цей метод повертає ключ та URL-адресу зображення нового виклику.
+
+        Raises:
+            404: Якщо запит не є AJAX-запитом.
+
+        Returns:
+            JsonResponse: Ключ виклику та URL-адреси зображення й аудіо.
+        """
+        if request.headers.get("x-requested-with") != "XMLHttpRequest":
+            raise http.Http404
+
+        hashkey = get_captcha_challenge()
+        return http.JsonResponse(
+            {
+                "key": hashkey,
+                "image_url": captcha_image_url(hashkey),
+                "audio_url": captcha_audio_url(hashkey)
+                if captcha_settings.CAPTCHA_FLITE_PATH
+                else None,
+            }
+        )
+
+
+class CaptchaImageView(generic.View):
+    """Представлення, що повертає готове зображення виклику CAPTCHA з кешу.
+
+    Якщо зображення немає в кеші, воно малюється бібліотекою під час запиту.
+    """
+
+    http_method_names = ["get"]
+
+    def get(self, request: http.HttpRequest, key: str) -> http.HttpResponse:
+        """Цей метод повертає PNG-зображення виклику.
+
+        Args:
+            request (http.HttpRequest): Об'єкт запиту.
+            key (str): Ключ виклику.
+
+        Returns:
+            HttpResponse: PNG-зображення.
+        """
+        image = get_captcha_image(key)
+        if image is None:
+            return captcha_image(request, key)
+        return http.HttpResponse(image, content_type="image/png")
+
+
 class CommentCreateView(BaseView, generic.CreateView):
     """Представлення для обробки тільки запиту POST та створення коментаря."""
 
@@ -77,10 +533,19 @@ class CommentCreateView(BaseView, generic.CreateView):
         Returns:
             success_url: Перенаправлення на success_url.
         """
-        comment_parent_id = self.request.POST.get("comment_parent_id", None)
-        canvas_url = self.request.POST.get("resized_image", None)
-        form.save(comment_parent_id, canvas_url)
+        self.save_form_(form)
+        return self.get_success_response_()
+
+    def save_form_(self, form: CommentModelForm) -> None:
+        """Цей метод зберігає коментар валідної форми (з відповіддю та зображенням)."""
+        form.save(
+            self.request.POST.get("comment_parent_id", None),
+            self.request.POST.get("resized_image", None),
+        )
 
+    def get_success_response_(self) -> http.HttpResponseRedirect:
+        """Цей метод додає повідомлення про успіх та повертає перенаправлення."""
+        comment_parent_id = self.request.POST.get("comment_parent_id", None)
         s = "comment" if not comment_parent_id else "answer"
         messages.success(self.request, f"Your {s} has successfully added.")
         return http.HttpResponseRedirect(self.success_url)
@@ -96,8 +561,51 @@ class CommentCreateView(BaseView, generic.CreateView):
         Returns:
             success_url: Перенаправлення на success_url.
         """
-        global FORM_DATA
-        FORM_DATA = self.request.POST
+        response = http.HttpResponseRedirect(self.success_url)
+        save_form_data(
+            response,
+            self.request.POST,
+            [name for name in form.fields if name != "captcha"],
+        )
 
         messages.error(self.request, "Invalid form data.")
-        return http.HttpResponseRedirect(self.success_url)
+        return response
+
+
+class AsyncCommentCreateView(AsyncBaseView, CommentCreateView):
+    """Асинхронне представлення для створення коментаря (для ASGI).
+
+    Розбір тіла запиту (завантаження записуються у тимчасові файли),
+    перевірка форми (CAPTCHA в базі даних) та збереження коментаря (ORM,
+    запис файлу в сховище) блокують, тому виконуються разом в обмеженому
+    пулі потоків (general.blocking), а цикл подій обслуговує інші запити.
+    """
+
+    async def post(
+        self, request: http.HttpRequest, *args: Any, **kwargs: Any
+    ) -> http.HttpResponseRedirect:
+        """Цей метод перевіряє та зберігає форму і повертає перенаправлення.
+
+        Returns:
+            http.HttpResponseRedirect: Перенаправлення на success_url.
+        """
+        self.object = None
+        form, is_valid = await run_blocking(self.save_valid_form_)
+        if is_valid:
+            return self.get_success_response_()
+        return await run_blocking(self.form_invalid, form)
+
+    def save_valid_form_(self) -> tuple[CommentModelForm, bool]:
+        """Цей метод створює форму з запиту та зберігає її, якщо вона валідна.
+
+        Форма створюється тут, бо читання request.POST та request.FILES
+        розбирає тіло запиту та записує великі завантаження на диск.
+
+        Returns:
+            tuple[CommentModelForm, bool]: Форма та її валідність.
+        """
+        form = self.get_form()
+        if not form.is_valid():
+            return form, False
+        self.save_form_(form)
+        return form, True
@@ -0,0 +1,78 @@
+"""Цей модуль використовується для виконання блокуючої роботи з асинхронних поглядів.
+
+Робота (ORM-запити, запис файлів у сховище) виконується в обмеженому пулі
+потоків, тому цикл подій не блокується, а кількість потоків та з'єднань з
+базою даних не перевищує ASYNC_BLOCKING_WORKERS.
+"""
+
+import asyncio
+import threading
+import contextvars
+from functools import partial
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+
+from django.conf import settings
+from django.db import close_old_connections
+
+
+_executor: ThreadPoolExecutor | None = None
+_executor_lock = threading.Lock()
+
+
+async def run_blocking(func: Callable, *args: Any, **kwargs: Any) -> Any:
+    """Ця функція виконує блокуючу функцію в пулі потоків та повертає її результат.
+
+    Args:
+        func (Callable): Блокуюча функція.
+        *args (Any): Позиційні аргументи функції.
+        **kwargs (Any): Іменовані аргументи функції.
+
+    Returns:
+        Any: Результат функції (винятки передаються далі).
+    """
+    loop = asyncio.get_running_loop()
+    # The function runs in a copy of the context, and its changes (e.g. the
+    # database router flags) are copied back, as sync_to_async does.
+    context = contextvars.copy_context()
+    try:
+        return await loop.run_in_executor(
+            get_blocking_executor(),
+            partial(context.run, run_task_, func, args, kwargs),
+        )
+    finally:
+        restore_context_(context)
+
+
+def run_task_(func: Callable, args: tuple, kwargs: dict) -> Any:
+    """Ця функція виконує завдання в потоці пулу та закриває застарілі з'єднання."""
+    try:
+        return func(*args, **kwargs)
+    finally:
+        # Request signals do not reach these threads, so connections are
+        # closed (or kept for reuse) here, according to CONN_MAX_AGE.
+        close_old_connections()
+
+
+def restore_context_(context: contextvars.Context) -> None:
+    """Ця функція переносить змінені значення контекстних змінних у поточний контекст."""
+    for variable, value in context.items():
+        try:
+            if variable.get() is value:
+                continue
+        except LookupError:
+            pass
+        variable.set(value)
+
+
+def get_blocking_executor() -> ThreadPoolExecutor:
+    """Ця функція повертає пул потоків для блокуючої роботи (один на процес)."""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                settings.ASYNC_BLOCKING_WORKERS,
+                thread_name_prefix="blocking",
+            )
+    return _executor
@@ -0,0 +1,9 @@
+"""Цей модуль містить бекенд MySQL з локальним пулом з'єднань."""
+
+from django.db.backends.mysql import base
+
+from general.db.pool import PooledDatabaseWrapperMixin
+
+
+class DatabaseWrapper(PooledDatabaseWrapperMixin, base.DatabaseWrapper):
+    """Обгортка з'єднання MySQL, що повертає з'єднання до пулу."""
@@ -0,0 +1,122 @@
+"""Цей модуль містить локальний пул з'єднань з базою даних для ASGI.
+
+Django закриває з'єднання наприкінці запиту, а ASGI виконує кожен запит в
+окремому потоці, тому постійні з'єднання (CONN_MAX_AGE) там не
+використовуються повторно. Бекенди з PooledDatabaseWrapperMixin замість
+закриття повертають з'єднання до пулу процесу, а при відкритті беруть
+перевірене з'єднання з пулу.
+"""
+
+import queue
+import threading
+
+
+class ConnectionPool:
+    """Пул відкритих з'єднань (останнє повернене видається першим)."""
+
+    def __init__(self, size: int) -> None:
+        """Цей метод ініціалізує пул.
+
+        Args:
+            size (int): Максимальна кількість з'єднань, що зберігаються в пулі.
+        """
+        self.size = size
+        self.connections = queue.LifoQueue(size)
+
+    def get(self, is_usable) -> object | None:
+        """Цей метод повертає робоче з'єднання з пулу (непрацюючі закриваються).
+
+        Args:
+            is_usable: Функція, що перевіряє з'єднання перед видачею.
+
+        Returns:
+            object | None: З'єднання або None, якщо в пулі немає робочих.
+        """
+        while True:
+            try:
+                connection = self.connections.get_nowait()
+            except queue.Empty:
+                return None
+            if is_usable(connection):
+                return connection
+            close_quietly_(connection)
+
+    def put(self, connection: object) -> bool:
+        """Цей метод повертає з'єднання до пулу.
+
+        Returns:
+            bool: Чи прийняв пул з'єднання (False, якщо пул заповнений).
+        """
+        try:
+            self.connections.put_nowait(connection)
+        except queue.Full:
+            return False
+        return True
+
+    def clear(self) -> None:
+        """Цей метод закриває всі з'єднання пулу."""
+        self.get(lambda connection: False)
+
+
+_pools: dict[str, ConnectionPool] = {}
+_pools_lock = threading.Lock()
+
+
+def get_connection_pool(alias: str, size: int) -> ConnectionPool:
+    """Ця функція повертає пул з'єднань бази даних (один на процес)."""
+    with _pools_lock:
+        if alias not in _pools:
+            _pools[alias] = ConnectionPool(size)
+        return _pools[alias]
+
+
+def close_quietly_(connection: object) -> None:
+    """Ця функція закриває з'єднання, ігноруючи помилки вже розірваного з'єднання."""
+    try:
+        connection.close()
+    except Exception:
+        pass
+
+
+class PooledDatabaseWrapperMixin:
+    """Домішка для DatabaseWrapper, що повторно використовує з'єднання з пулу.
+
+    Розмір пулу задається ключем POOL_SIZE налаштувань бази даних.
+    """
+
+    def get_new_connection(self, conn_params: dict):
+        """Цей метод бере з'єднання з пулу або відкриває нове."""
+        connection = self.get_pool_().get(self.is_raw_connection_usable_)
+        return connection or super().get_new_connection(conn_params)
+
+    def _close(self) -> None:
+        """Цей метод повертає з'єднання до пулу або закриває його.
+
+        З'єднання з відкритою транзакцією або після помилки закривається.
+        """
+        if self.connection is None:
+            return
+        if (
+            self.autocommit
+            and not self.in_atomic_block
+            and not self.errors_occurred
+            and self.get_pool_().put(self.connection)
+        ):
+            return
+        super()._close()
+
+    def is_raw_connection_usable_(self, connection) -> bool:
+        """Цей метод перевіряє з'єднання з пулу запитом 'SELECT 1'."""
+        try:
+            cursor = connection.cursor()
+            cursor.execute("SELECT 1")
+            cursor.close()
+        except self.Database.Error:
+            return False
+        return True
+
+    def get_pool_(self) -> ConnectionPool:
+        """Цей метод повертає пул з'єднань цієї бази даних."""
+        return get_connection_pool(
+            self.alias, self.settings_dict.get("POOL_SIZE", 10)
+        )
@@ -0,0 +1,143 @@
+"""Цей модуль містить маршрутизатор читання з реплік бази даних.
+
+Читання моделей додатку 'comments' (список та дерева коментарів) в
+безпечних запитах йдуть до реплік із налаштування DATABASE_REPLICAS, а
+записи та решта читань (POST, фонові потоки, команди) - до бази 'default'.
+Після запису клієнт на DATABASE_PRIMARY_PIN_SECONDS секунд закріплюється
+за основною базою (cookie), тому бачить свій коментар, навіть якщо репліка
+ще відстає.
+"""
+
+import random
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django import http
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+from django.db.models import Model
+
+
+PRIMARY_PIN_COOKIE = "primary_pin"
+REPLICATED_APPS = {"comments"}
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+
+# Whether reads of the current request may go to a replica.
+replica_reads: ContextVar[bool] = ContextVar("replica_reads", default=False)
+# Whether the current request wrote to a replicated model.
+primary_written: ContextVar[bool] = ContextVar(
+    "primary_written", default=False
+)
+
+
+def reads_from_replica() -> bool:
+    """Ця функція повертає, чи читає поточний контекст коментарі з реплік.
+
+    Репліка може відставати, тому прочитане з неї не можна вважати
+    актуальним (наприклад, для кешування відразу після запису).
+    """
+    return (
+        bool(settings.DATABASE_REPLICAS)
+        and replica_reads.get()
+        and not primary_written.get()
+    )
+
+
+class PrimaryReplicaRouter:
+    """Маршрутизатор, що розподіляє читання між репліками, а записи - на основну базу."""
+
+    def db_for_read(self, model: type[Model], **hints) -> str:
+        """Цей метод повертає випадкову репліку для читання моделі коментарів.
+
+        Основна база використовується, якщо реплік немає, модель не
+        реплікується (наприклад, виклики CAPTCHA), запит закріплений або
+        вже записав дані, а також поза запитами.
+        """
+        if (
+            model._meta.app_label not in REPLICATED_APPS
+            or not reads_from_replica()
+        ):
+            return DEFAULT_DB_ALIAS
+        return random.choice(settings.DATABASE_REPLICAS)
+
+    def db_for_write(self, model: type[Model], **hints) -> str:
+        """Цей метод повертає основну базу та позначає запит як записуючий."""
+        if model._meta.app_label in REPLICATED_APPS:
+            primary_written.set(True)
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1: Model, obj2: Model, **hints) -> bool:
+        """Цей метод дозволяє зв'язки між об'єктами основної бази та реплік."""
+        databases = {DEFAULT_DB_ALIAS, *settings.DATABASE_REPLICAS}
+        return obj1._state.db in databases and obj2._state.db in databases
+
+
+class PrimaryPinMiddleware:
+    """Проміжне ПЗ, що закріплює клієнта за основною базою після запису.
+
+    Небезпечні запити (POST тощо) завжди читають з основної бази, а після
+    запису до моделей коментарів відповідь встановлює cookie закріплення.
+    Працює як у синхронному, так і в асинхронному ланцюжку обробки.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response) -> None:
+        """Цей метод ініціалізує проміжне ПЗ."""
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request: http.HttpRequest) -> http.HttpResponse:
+        """Цей метод обробляє запит із закріпленням або без нього."""
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+
+        tokens = self.start_(request)
+        try:
+            response = self.get_response(request)
+            written = primary_written.get()
+        finally:
+            self.finish_(tokens)
+        return self.pin_(response, written)
+
+    async def __acall__(self, request: http.HttpRequest) -> http.HttpResponse:
+        """Цей метод - асинхронна версія __call__."""
+        tokens = self.start_(request)
+        try:
+            response = await self.get_response(request)
+            written = primary_written.get()
+        finally:
+            self.finish_(tokens)
+        return self.pin_(response, written)
+
+    def start_(self, request: http.HttpRequest) -> tuple:
+        """Цей метод встановлює прапорці маршрутизації для запиту."""
+        return (
+            replica_reads.set(
+                request.method in SAFE_METHODS
+                and PRIMARY_PIN_COOKIE not in request.COOKIES
+            ),
+            primary_written.set(False),
+        )
+
+    def finish_(self, tokens: tuple) -> None:
+        """Цей метод відновлює прапорці маршрутизації після запиту."""
+        reads_token, written_token = tokens
+        replica_reads.reset(reads_token)
+        primary_written.reset(written_token)
+
+    def pin_(
+        self, response: http.HttpResponse, written: bool
+    ) -> http.HttpResponse:
+        """Цей метод встановлює cookie закріплення, якщо запит записав дані."""
+        if written:
+            response.set_cookie(
+                PRIMARY_PIN_COOKIE,
+                "1",
+                max_age=settings.DATABASE_PRIMARY_PIN_SECONDS,
+                httponly=True,
+                samesite="Lax",
+            )
+        return response
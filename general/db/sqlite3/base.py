@@ -0,0 +1,9 @@
+"""Цей модуль містить бекенд SQLite з локальним пулом з'єднань (для тестів та бенчмарків)."""
+
+from django.db.backends.sqlite3 import base
+
+from general.db.pool import PooledDatabaseWrapperMixin
+
+
+class DatabaseWrapper(PooledDatabaseWrapperMixin, base.DatabaseWrapper):
+    """Обгортка з'єднання SQLite, що повертає з'єднання до пулу."""
@@ -0,0 +1,211 @@
+"""Цей модуль містить погляд для віддачі медіафайлів (замість django.conf.urls.static).
+
+Якщо задане налаштування MEDIA_SENDFILE_HEADER, файл віддає проксі-сервер
+(X-Accel-Redirect або X-Sendfile), інакше - FileResponse, який WSGI-сервер
+може передати через wsgi.file_wrapper (sendfile) без копіювання в Python.
+
+Файли завантажують користувачі, тому у браузері відкриваються лише
+безпечні типи (зображення, крім SVG, та текст), а решта віддається як
+application/octet-stream для завантаження, щоб HTML чи SVG з файлу не
+виконувались у походженні сайту (збережений XSS).
+"""
+
+import os
+import re
+import mimetypes
+import posixpath
+from urllib.parse import quote
+
+from django import http
+from django.views import View
+from django.conf import settings
+from django.utils._os import safe_join
+from django.utils.http import http_date
+from django.views.static import was_modified_since
+from django.core.exceptions import SuspiciousFileOperation
+
+from comments.storage import is_content_addressed
+
+from .views import BaseView
+
+
+RANGE_HEADER = re.compile(r"^bytes=(?P<start>\d*)-(?P<end>\d*)$")
+IMMUTABLE_MAX_AGE = 60 * 60 * 24 * 365
+CHUNK_SIZE = 64 * 1024
+# Content types that are safe to render inline from the site's origin.
+INLINE_CONTENT_TYPES = {"text/plain"}
+INLINE_CONTENT_TYPE_PREFIXES = ("image/",)
+UNSAFE_CONTENT_TYPES = {"image/svg+xml"}
+DOWNLOAD_CONTENT_TYPE = "application/octet-stream"
+
+
+class MediaView(BaseView, View):
+    """Погляд, що віддає медіафайл з підтримкою If-Modified-Since та Range."""
+
+    def get(self, request: http.HttpRequest, path: str) -> http.HttpResponse:
+        """Цей метод повертає медіафайл або його частину.
+
+        Args:
+            request (http.HttpRequest): Об'єкт запиту.
+            path (str): Шлях до файлу відносно MEDIA_ROOT.
+
+        Raises:
+            http.Http404: Якщо файлу немає, він прихований (ім'я з крапкою)
+                або шлях виходить за MEDIA_ROOT.
+
+        Returns:
+            http.HttpResponse: Файл, його частина (206) або відповідь 304/416.
+        """
+        # Hidden files are internal (e.g. storage locks and partial uploads).
+        if any(part.startswith(".") for part in path.split("/")):
+            raise http.Http404
+        try:
+            full_path = safe_join(settings.MEDIA_ROOT, path)
+        except SuspiciousFileOperation:
+            raise http.Http404
+        if not os.path.isfile(full_path):
+            raise http.Http404
+
+        stat = os.stat(full_path)
+        mtime = int(stat.st_mtime)
+        if not was_modified_since(
+            request.headers.get("If-Modified-Since"), mtime
+        ):
+            response = http.HttpResponseNotModified()
+        elif settings.MEDIA_SENDFILE_HEADER:
+            response = get_sendfile_response_(path, full_path)
+        else:
+            response = get_file_response_(request, full_path, stat.st_size)
+
+        response.headers["Last-Modified"] = http_date(mtime)
+        response.headers["Cache-Control"] = get_cache_control_(path)
+        response.headers["Content-Disposition"] = get_content_disposition_(
+            path
+        )
+        response.headers["X-Content-Type-Options"] = "nosniff"
+        return response
+
+
+def get_sendfile_response_(path: str, full_path: str) -> http.HttpResponse:
+    """Ця функція повертає порожню відповідь, файл якої віддає проксі-сервер.
+
+    Проксі-сервер також обробляє заголовки Range цього файлу.
+    """
+    header = settings.MEDIA_SENDFILE_HEADER
+    response = http.HttpResponse(content_type=guess_content_type_(path))
+    if header.lower() == "x-accel-redirect":
+        response.headers[header] = quote(
+            posixpath.join(settings.MEDIA_SENDFILE_PREFIX, path)
+        )
+    else:
+        response.headers[header] = full_path
+    return response
+
+
+def get_file_response_(
+    request: http.HttpRequest, full_path: str, size: int
+) -> http.HttpResponse:
+    """Ця функція повертає весь файл або діапазон байтів із заголовка Range.
+
+    Підтримується один діапазон; інші заголовки Range (кілька діапазонів
+    або застарілий If-Range) ігноруються, і віддається весь файл.
+    """
+    content_type = guess_content_type_(full_path)
+    byte_range = get_byte_range_(request, full_path, size)
+    if byte_range is None:
+        response = http.FileResponse(
+            open(full_path, "rb"), content_type=content_type
+        )
+    elif byte_range is False:
+        response = http.HttpResponse(status=416)
+        response.headers["Content-Range"] = f"bytes */{size}"
+    else:
+        start, end = byte_range
+        response = http.StreamingHttpResponse(
+            read_range_(full_path, start, end - start + 1),
+            status=206,
+            content_type=content_type,
+        )
+        response.headers["Content-Length"] = str(end - start + 1)
+        response.headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+    response.headers["Accept-Ranges"] = "bytes"
+    return response
+
+
+def get_byte_range_(
+    request: http.HttpRequest, full_path: str, size: int
+) -> tuple[int, int] | bool | None:
+    """Ця функція повертає діапазон байтів (початок, кінець включно) із запиту.
+
+    Returns:
+        tuple[int, int] | bool | None: Діапазон, False - якщо діапазон поза
+            файлом, або None - якщо потрібно віддати весь файл.
+    """
+    match = RANGE_HEADER.match(request.headers.get("Range", ""))
+    if match is None:
+        return None
+    if_range = request.headers.get("If-Range")
+    if if_range and if_range != http_date(int(os.path.getmtime(full_path))):
+        return None
+
+    start, end = match["start"], match["end"]
+    if not start:
+        if not end or not int(end):
+            return False
+        # A suffix range: the last 'end' bytes.
+        return max(size - int(end), 0), size - 1
+    start, end = int(start), min(int(end) if end else size - 1, size - 1)
+    if start >= size or start > end:
+        return False
+    return start, end
+
+
+def read_range_(full_path: str, start: int, length: int):
+    """Ця функція повертає генератор частин файлу заданого діапазону."""
+    with open(full_path, "rb") as file:
+        file.seek(start)
+        while length > 0:
+            chunk = file.read(min(CHUNK_SIZE, length))
+            if not chunk:
+                break
+            length -= len(chunk)
+            yield chunk
+
+
+def get_cache_control_(path: str) -> str:
+    """Ця функція повертає Cache-Control файлу.
+
+    Вміст файлу з іменем за хешем ніколи не змінюється, тому він
+    кешується на рік без повторної перевірки.
+    """
+    if is_content_addressed(path):
+        return f"public, max-age={IMMUTABLE_MAX_AGE}, immutable"
+    return f"public, max-age={settings.MEDIA_CACHE_MAX_AGE}"
+
+
+def guess_content_type_(path: str) -> str:
+    """Ця функція повертає MIME-тип файлу за його розширенням.
+
+    Небезпечні для відображення типи замінюються на application/octet-stream.
+    """
+    content_type = mimetypes.guess_type(path)[0]
+    if content_type is None or not is_inline_content_type_(content_type):
+        return DOWNLOAD_CONTENT_TYPE
+    return content_type
+
+
+def get_content_disposition_(path: str) -> str:
+    """Ця функція повертає Content-Disposition: inline лише для безпечних типів."""
+    if guess_content_type_(path) == DOWNLOAD_CONTENT_TYPE:
+        filename = quote(posixpath.basename(path))
+        return f"attachment; filename*=utf-8''{filename}"
+    return "inline"
+
+
+def is_inline_content_type_(content_type: str) -> bool:
+    """Ця функція повертає, чи можна відображати тип у браузері."""
+    if content_type in UNSAFE_CONTENT_TYPES:
+        return False
+    return content_type in INLINE_CONTENT_TYPES or content_type.startswith(
+        INLINE_CONTENT_TYPE_PREFIXES
+    )
@@ -0,0 +1,40 @@
+"""Цей модуль містить тести для виконання блокуючої роботи з асинхронних поглядів."""
+
+import threading
+
+from django.test import SimpleTestCase
+
+from comments.models import Comment
+from general.blocking import run_blocking
+from general.db.routers import (
+    PrimaryReplicaRouter,
+    primary_written,
+    replica_reads,
+)
+
+
+class RunBlockingTestCase(SimpleTestCase):
+    """Тести для run_blocking."""
+
+    async def test_runs_in_pool_thread(self):
+        """Тести, що функція виконується в потоці пулу та повертає результат."""
+        name = await run_blocking(lambda: threading.current_thread().name)
+        self.assertTrue(name.startswith("blocking"))
+        self.assertEqual(await run_blocking(sum, [1, 2], start=3), 6)
+
+    async def test_exception_is_raised(self):
+        """Тести, що виняток функції передається до асинхронного коду."""
+        with self.assertRaises(ZeroDivisionError):
+            await run_blocking(lambda: 1 / 0)
+
+    async def test_context_variables_are_copied_both_ways(self):
+        """Тести, що функція бачить контекст запиту, а її зміни повертаються."""
+        reads_token = replica_reads.set(True)
+        written_token = primary_written.set(False)
+        try:
+            self.assertTrue(await run_blocking(replica_reads.get))
+            await run_blocking(PrimaryReplicaRouter().db_for_write, Comment)
+            self.assertTrue(primary_written.get())
+        finally:
+            primary_written.reset(written_token)
+            replica_reads.reset(reads_token)
@@ -0,0 +1,71 @@
+"""Цей модуль містить тести для локального пулу з'єднань з базою даних."""
+
+import os
+import tempfile
+from unittest import mock
+
+from django.db import connections
+from django.test import SimpleTestCase
+
+from general.db import pool
+from general.db.sqlite3.base import DatabaseWrapper
+
+
+class ConnectionPoolTestCase(SimpleTestCase):
+    """Тести для класу ConnectionPool."""
+
+    def test_get_skips_unusable_connections(self):
+        """Тести, що пул закриває непрацюючі з'єднання та видає робоче."""
+        broken, working = mock.Mock(), mock.Mock()
+        connection_pool = pool.ConnectionPool(2)
+        self.assertTrue(connection_pool.put(working))
+        self.assertTrue(connection_pool.put(broken))
+        self.assertFalse(connection_pool.put(mock.Mock()))
+
+        connection = connection_pool.get(lambda c: c is working)
+        self.assertIs(connection, working)
+        broken.close.assert_called_once()
+        self.assertIsNone(connection_pool.get(lambda c: True))
+
+
+class PooledDatabaseWrapperTestCase(SimpleTestCase):
+    """Тести для бекенду з домішкою PooledDatabaseWrapperMixin."""
+
+    alias = "pool_test"
+
+    def setUp(self) -> None:
+        """Створює обгортку з'єднання з тимчасовою базою SQLite."""
+        handle, self.path = tempfile.mkstemp(suffix=".sqlite3")
+        os.close(handle)
+        settings_dict = connections["default"].settings_dict.copy()
+        settings_dict.update(
+            ENGINE="general.db.sqlite3", NAME=self.path, POOL_SIZE=1
+        )
+        self.wrapper = DatabaseWrapper(settings_dict, alias=self.alias)
+
+    def tearDown(self) -> None:
+        """Закриває з'єднання, очищує пул та видаляє тимчасову базу."""
+        self.wrapper.close()
+        pool.get_connection_pool(self.alias, 1).clear()
+        pool._pools.pop(self.alias, None)
+        os.remove(self.path)
+
+    def test_closed_connection_is_reused(self):
+        """Тести, що закрите з'єднання повертається до пулу та видається знову."""
+        self.wrapper.ensure_connection()
+        raw_connection = self.wrapper.connection
+        self.wrapper.close()
+        self.assertIsNone(self.wrapper.connection)
+
+        self.wrapper.ensure_connection()
+        self.assertIs(self.wrapper.connection, raw_connection)
+
+    def test_connection_in_transaction_is_not_pooled(self):
+        """Тести, що з'єднання з відкритою транзакцією закривається."""
+        self.wrapper.ensure_connection()
+        raw_connection = self.wrapper.connection
+        self.wrapper.set_autocommit(False)
+        self.wrapper.close()
+
+        self.wrapper.ensure_connection()
+        self.assertIsNot(self.wrapper.connection, raw_connection)
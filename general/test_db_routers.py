@@ -0,0 +1,137 @@
+"""Цей модуль містить тести для маршрутизатора читання з реплік бази даних.
+
+Як основна база та репліка використовуються дві окремі бази SQLite. Репліка
+додається лише на час тестів цього модуля.
+"""
+
+from django.urls import reverse
+from django.http import HttpResponse
+from django.db import connections
+from django.test import RequestFactory, TestCase, override_settings
+
+from comments.cache import bump_versions, get_cache
+from comments.models import Author, Comment
+from general.db.routers import (
+    PRIMARY_PIN_COOKIE,
+    PrimaryPinMiddleware,
+    PrimaryReplicaRouter,
+)
+
+
+REPLICA = "replica"
+
+
+@override_settings(DATABASE_REPLICAS=[REPLICA])
+class PrimaryReplicaRouterTestCase(TestCase):
+    """Тести для PrimaryReplicaRouter та PrimaryPinMiddleware."""
+
+    # The replica alias does not exist until setUpClass adds it.
+    databases = "__all__"
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        """Додає з'єднання репліки та створює її тестову базу даних."""
+        connections.settings[REPLICA] = connections.configure_settings(
+            {
+                "default": connections.settings["default"],
+                REPLICA: {
+                    "ENGINE": "django.db.backends.sqlite3",
+                    "NAME": ":memory:",
+                },
+            }
+        )[REPLICA]
+        connections[REPLICA].creation.create_test_db(
+            verbosity=0, autoclobber=True, serialize=False
+        )
+        cls.addClassCleanup(cls.remove_replica_)
+        super().setUpClass()
+
+    @classmethod
+    def remove_replica_(cls) -> None:
+        """Видаляє тестову базу даних та з'єднання репліки."""
+        connections[REPLICA].creation.destroy_test_db(":memory:", verbosity=0)
+        del connections[REPLICA]
+        del connections.settings[REPLICA]
+
+    def setUp(self) -> None:
+        """Створює коментар та його копію в репліці з іншим текстом."""
+        get_cache().clear()
+        Comment.objects.create(
+            text="Primary comment",
+            author=Author.objects.create(
+                username="test_user", email="test_user@gmail.com"
+            ),
+        )
+        Author.objects.using(REPLICA).bulk_create(Author.objects.all())
+        Comment.objects.using(REPLICA).bulk_create(Comment.objects.all())
+        Comment.objects.using(REPLICA).update(text="Replica comment")
+
+    def test_list_reads_from_replica(self):
+        """Тести, що список коментарів читається з репліки."""
+        response = self.client.get(reverse("list"))
+        self.assertContains(response, "Replica comment")
+        self.assertNotContains(response, "Primary comment")
+
+    def test_pinned_client_reads_from_primary(self):
+        """Тести, що закріплений клієнт читає список з основної бази."""
+        self.client.cookies[PRIMARY_PIN_COOKIE] = "1"
+        response = self.client.get(reverse("list"))
+        self.assertContains(response, "Primary comment")
+
+    def test_pinned_client_does_not_read_cached_pages(self):
+        """Тести, що закріплений клієнт не отримує сторінку, закешовану з репліки."""
+        self.client.get(reverse("list"))
+        self.client.cookies[PRIMARY_PIN_COOKIE] = "1"
+        response = self.client.get(reverse("list"))
+        self.assertContains(response, "Primary comment")
+
+    def test_replica_pages_are_not_cached_after_write(self):
+        """Тести, що сторінка з репліки відразу після запису не зберігається в кеш."""
+        bump_versions("thread", [])
+        self.client.get(reverse("list"))
+        Comment.objects.using(REPLICA).update(text="Caught up comment")
+        response = self.client.get(reverse("list"))
+        self.assertContains(response, "Caught up comment")
+
+        get_cache().clear()
+        self.client.get(reverse("list"))
+        Comment.objects.using(REPLICA).update(text="Later comment")
+        response = self.client.get(reverse("list"))
+        self.assertContains(response, "Caught up comment")
+
+    def test_write_pins_client(self):
+        """Тести, що запит із записом встановлює cookie закріплення."""
+        router = PrimaryReplicaRouter()
+
+        def write(request) -> HttpResponse:
+            self.assertEqual(router.db_for_read(Comment), "default")
+            Author.objects.create(username="new_user", email="new@gmail.com")
+            return HttpResponse()
+
+        def read(request) -> HttpResponse:
+            self.assertEqual(router.db_for_read(Comment), REPLICA)
+            return HttpResponse()
+
+        factory = RequestFactory()
+        response = PrimaryPinMiddleware(write)(factory.post("/"))
+        self.assertIn(PRIMARY_PIN_COOKIE, response.cookies)
+        response = PrimaryPinMiddleware(read)(factory.get("/"))
+        self.assertNotIn(PRIMARY_PIN_COOKIE, response.cookies)
+
+    async def test_write_pins_client_in_async_chain(self):
+        """Тести, що асинхронний ланцюжок теж встановлює cookie закріплення."""
+        router = PrimaryReplicaRouter()
+
+        async def write(request) -> HttpResponse:
+            self.assertEqual(router.db_for_read(Comment), "default")
+            router.db_for_write(Comment)
+            return HttpResponse()
+
+        middleware = PrimaryPinMiddleware(write)
+        response = await middleware(RequestFactory().post("/"))
+        self.assertIn(PRIMARY_PIN_COOKIE, response.cookies)
+
+    def test_reads_outside_requests_use_primary(self):
+        """Тести, що поза запитами (команди, фонові потоки) читання йдуть до основної бази."""
+        router = PrimaryReplicaRouter()
+        self.assertEqual(router.db_for_read(Comment), "default")
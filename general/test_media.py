@@ -0,0 +1,132 @@
+"""Цей модуль містить тести для погляду віддачі медіафайлів."""
+
+import os
+import shutil
+import hashlib
+import tempfile
+
+from django.urls import reverse
+from django.utils.http import http_date
+from django.test import SimpleTestCase, override_settings
+
+
+MEDIA_ROOT = tempfile.mkdtemp()
+CONTENT = b"0123456789"
+DIGEST = hashlib.sha256(CONTENT).hexdigest()
+HASHED_NAME = f"comment_files/{DIGEST[:2]}/{DIGEST[2:4]}/{DIGEST}.txt"
+
+
+@override_settings(MEDIA_ROOT=MEDIA_ROOT, MEDIA_SENDFILE_HEADER=None)
+class MediaViewTestCase(SimpleTestCase):
+    """Тести для погляду MediaView."""
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        """Створює файли тестів у тимчасовій теці."""
+        super().setUpClass()
+        for name in (
+            "comment_files/notes.txt",
+            "comment_files/page.html",
+            "comment_files/image.svg",
+            ".content/lock.lease",
+            HASHED_NAME,
+        ):
+            path = os.path.join(MEDIA_ROOT, name)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, "wb") as file:
+                file.write(CONTENT)
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        """Видаляє тимчасову теку з файлами тестів."""
+        super().tearDownClass()
+        shutil.rmtree(MEDIA_ROOT, ignore_errors=True)
+
+    def get_url_(self, name: str) -> str:
+        """Повертає URL-адресу медіафайлу."""
+        return reverse("media", kwargs={"path": name})
+
+    def test_file_with_cache_headers(self):
+        """Тести, що файл віддається з Last-Modified та Accept-Ranges."""
+        response = self.client.get(self.get_url_("comment_files/notes.txt"))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(b"".join(response.streaming_content), CONTENT)
+        self.assertEqual(response["Content-Type"], "text/plain")
+        self.assertEqual(response["Accept-Ranges"], "bytes")
+        self.assertIn("Last-Modified", response)
+        self.assertNotIn("immutable", response["Cache-Control"])
+
+    def test_unsafe_files_are_downloaded(self):
+        """Тести, що HTML та SVG не відображаються у браузері (збережений XSS)."""
+        for name in ("comment_files/page.html", "comment_files/image.svg"):
+            with self.subTest(name=name):
+                response = self.client.get(self.get_url_(name))
+                self.assertEqual(
+                    response["Content-Type"], "application/octet-stream"
+                )
+                self.assertTrue(
+                    response["Content-Disposition"].startswith("attachment")
+                )
+                self.assertEqual(response["X-Content-Type-Options"], "nosniff")
+
+        response = self.client.get(self.get_url_("comment_files/notes.txt"))
+        self.assertEqual(response["Content-Disposition"], "inline")
+
+    def test_content_addressed_file_is_immutable(self):
+        """Тести, що файл з іменем за хешем кешується як незмінний."""
+        response = self.client.get(self.get_url_(HASHED_NAME))
+        self.assertIn("immutable", response["Cache-Control"])
+
+    def test_not_modified_since(self):
+        """Тести, що незмінений файл повертає відповідь 304."""
+        mtime = os.path.getmtime(os.path.join(MEDIA_ROOT, HASHED_NAME))
+        response = self.client.get(
+            self.get_url_(HASHED_NAME),
+            HTTP_IF_MODIFIED_SINCE=http_date(int(mtime) + 1),
+        )
+        self.assertEqual(response.status_code, 304)
+
+    def test_ranges(self):
+        """Тести, що діапазони байтів віддаються з відповіддю 206 або 416."""
+        url = self.get_url_(HASHED_NAME)
+        for header, expected in (
+            ("bytes=2-4", b"234"),
+            ("bytes=7-", b"789"),
+            ("bytes=-2", b"89"),
+        ):
+            with self.subTest(header=header):
+                response = self.client.get(url, HTTP_RANGE=header)
+                self.assertEqual(response.status_code, 206)
+                self.assertEqual(
+                    b"".join(response.streaming_content), expected
+                )
+                self.assertEqual(
+                    response["Content-Length"], str(len(expected))
+                )
+
+        response = self.client.get(url, HTTP_RANGE="bytes=10-")
+        self.assertEqual(response.status_code, 416)
+        self.assertEqual(response["Content-Range"], "bytes */10")
+
+    def test_sendfile_offload(self):
+        """Тести, що при налаштованому заголовку файл віддає проксі-сервер."""
+        with self.settings(
+            MEDIA_SENDFILE_HEADER="X-Accel-Redirect",
+            MEDIA_SENDFILE_PREFIX="/protected-media/",
+        ):
+            response = self.client.get(self.get_url_(HASHED_NAME))
+        self.assertEqual(response.content, b"")
+        self.assertEqual(
+            response["X-Accel-Redirect"], f"/protected-media/{HASHED_NAME}"
+        )
+
+    def test_path_outside_media_root(self):
+        """Тести, що шлях за межами MEDIA_ROOT, відсутній та прихований файли повертають 404."""
+        for name in (
+            "../settings.py",
+            "comment_files/missing.txt",
+            ".content/lock.lease",
+        ):
+            with self.subTest(name=name):
+                response = self.client.get(self.get_url_(name))
+                self.assertEqual(response.status_code, 404)
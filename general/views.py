@@ -1,5 +1,6 @@
-"""Цей модуль містить базовий клас для всіх поглядів."""
+"""Цей модуль містить базові класи (синхронний та асинхронний) для всіх поглядів."""
 
+import inspect
 import logging
 
 from django import http
@@ -30,20 +31,55 @@ class BaseView:
         try:
             return super().dispatch(request, *args, **kwargs)
         except Exception as e:
-            exception_type = type(e)
-
-            # Check if it's an exception for which there is an error handler.
-            if exception_type in (http.Http404, BadRequest):
-                raise e
-
-            logger.error(
-                f"{exception_type}('{str(e)}') during working with {request.path} URL"
-            )
-
-            error_view = CustomServerErrorView
-            return render_error_page(
-                request,
-                Error(
-                    error_view.code, error_view.name, error_view.description
-                ),
-            )
+            return handle_exception_(request, e)
+
+
+class AsyncBaseView:
+    """Базовий асинхронний вигляд (для ASGI) із тією самою обробкою винятків."""
+
+    async def dispatch(
+        self, request: http.HttpRequest, *args, **kwargs
+    ) -> http.HttpResponse:
+        """Цей метод викликається при кожному HTTP-запиті до асинхронного погляду.
+
+        Args:
+            request (http.HttpRequest): Об'єкт запиту.
+
+        Raises:
+            e: Виняток, який виник під час обробки запиту.
+
+        Returns:
+            render_error_page: Відповідь на HTTP-запит.
+        """
+        try:
+            response = super().dispatch(request, *args, **kwargs)
+            if inspect.isawaitable(response):
+                response = await response
+            return response
+        except Exception as e:
+            return handle_exception_(request, e)
+
+
+def handle_exception_(
+    request: http.HttpRequest, e: Exception
+) -> http.HttpResponse:
+    """Ця функція повертає сторінку помилки 500 або повторно викидає виняток 400/404.
+
+    Raises:
+        e: Виняток, для якого є власний обробник помилок.
+    """
+    exception_type = type(e)
+
+    # Check if it's an exception for which there is an error handler.
+    if exception_type in (http.Http404, BadRequest):
+        raise e
+
+    logger.error(
+        f"{exception_type}('{str(e)}') during working with {request.path} URL"
+    )
+
+    error_view = CustomServerErrorView
+    return render_error_page(
+        request,
+        Error(error_view.code, error_view.name, error_view.description),
+    )
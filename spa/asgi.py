@@ -4,5 +4,12 @@ from django.core.asgi import get_asgi_application
 
 
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "spa.settings")
+# Lets the settings use the pooled database backend (see DB_POOL_SIZE).
+os.environ.setdefault("SPA_ASGI", "1")
 
 application = get_asgi_application()
+
+# Only server processes run the background threads, not management commands.
+from comments.captcha_store import start_captcha_threads  # noqa: E402
+
+start_captcha_threads()
@@ -7,6 +7,7 @@ from random import choices
 
 from dotenv import load_dotenv
 from django.contrib.messages import constants as messages
+from django.core.exceptions import ImproperlyConfigured
 
 
 load_dotenv()
@@ -31,6 +32,7 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     "django.middleware.security.SecurityMiddleware",
+    "general.db.routers.PrimaryPinMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
@@ -62,8 +64,40 @@ DATABASES = {
         "NAME": str(os.getenv("DB_NAME")),
         "USER": str(os.getenv("DB_USER")),
         "PASSWORD": str(os.getenv("DB_PASSWORD")),
+        # Seconds a connection is reused between requests (0 - closed after
+        # each request, "none" - unlimited); it is checked before reuse.
+        "CONN_MAX_AGE": (
+            None
+            if os.getenv("DB_CONN_MAX_AGE", "60").lower() == "none"
+            else int(os.getenv("DB_CONN_MAX_AGE", "60"))
+        ),
+        "CONN_HEALTH_CHECKS": os.getenv("DB_CONN_HEALTH_CHECKS", "1") == "1",
     }
 }
+# Under ASGI every request runs in a new thread, so persistent connections
+# are never reused there. The ASGI entry point sets SPA_ASGI and, when
+# DB_POOL_SIZE > 0, connections are returned to a process-wide pool instead.
+if os.getenv("SPA_ASGI") == "1" and int(os.getenv("DB_POOL_SIZE", "0")):
+    DATABASES["default"].update(
+        ENGINE="general.db.mysql",
+        CONN_MAX_AGE=0,
+        POOL_SIZE=int(os.getenv("DB_POOL_SIZE")),
+    )
+# Read replicas of the default database (comma-separated hosts of
+# DB_REPLICA_HOSTS). Comment reads of safe requests are spread across them.
+DATABASE_REPLICAS = []
+for number, host in enumerate(
+    filter(None, os.getenv("DB_REPLICA_HOSTS", "").split(",")), start=1
+):
+    DATABASES[f"replica_{number}"] = {
+        **DATABASES["default"],
+        "HOST": host.strip(),
+        "TEST": {"MIRROR": "default"},
+    }
+    DATABASE_REPLICAS.append(f"replica_{number}")
+DATABASE_ROUTERS = ["general.db.routers.PrimaryReplicaRouter"]
+# Seconds a client reads from the primary after writing (replication lag).
+DATABASE_PRIMARY_PIN_SECONDS = 5
 
 LANGUAGE_CODE = "en-us"
 
@@ -81,6 +115,113 @@ DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 MEDIA_URL = "/media/"
 MEDIA_ROOT = BASE_DIR / "media"
 
+STORAGES = {
+    "default": {
+        "BACKEND": "django.core.files.storage.FileSystemStorage",
+    },
+    "staticfiles": {
+        "BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage",
+    },
+    # Attached files are stored once per content under their SHA-256 digest.
+    "comment_files": {
+        "BACKEND": "comments.storage.ContentAddressedStorage",
+    },
+}
+
+# Seconds a reused (duplicate) file is kept even without committed references.
+COMMENTS_FILE_LEASE_SECONDS = 60 * 10
+
+# Media files are sent by the proxy when this header is set:
+# "X-Accel-Redirect" (nginx) or "X-Sendfile" (Apache, lighttpd).
+MEDIA_SENDFILE_HEADER = os.getenv("MEDIA_SENDFILE_HEADER") or None
+# Internal location of MEDIA_ROOT for X-Accel-Redirect.
+MEDIA_SENDFILE_PREFIX = os.getenv(
+    "MEDIA_SENDFILE_PREFIX", "/protected-media/"
+)
+# Names that are not content-addressed may change, so they are revalidated.
+MEDIA_CACHE_MAX_AGE = 60 * 60
+
+# Cache backend selected by CACHE_BACKEND: "locmem" (one process only),
+# "file", "redis" (needs the redis package) or "memcached" (pymemcache).
+CACHE_BACKENDS = {
+    "locmem": "django.core.cache.backends.locmem.LocMemCache",
+    "file": "django.core.cache.backends.filebased.FileBasedCache",
+    "redis": "django.core.cache.backends.redis.RedisCache",
+    "memcached": "django.core.cache.backends.memcached.PyMemcacheCache",
+}
+CACHE_LOCATIONS = {
+    "locmem": "spa",
+    "file": str(BASE_DIR / ".cache"),
+    "redis": "redis://127.0.0.1:6379/0",
+    "memcached": "127.0.0.1:11211",
+}
+# Empty variables (e.g. "CACHE_LOCATION=" in .env) fall back to defaults.
+CACHE_BACKEND = os.getenv("CACHE_BACKEND") or "locmem"
+if CACHE_BACKEND not in CACHE_BACKENDS:
+    raise ImproperlyConfigured(
+        f"Unknown CACHE_BACKEND {CACHE_BACKEND!r}, "
+        f"expected one of: {', '.join(CACHE_BACKENDS)}."
+    )
+CACHES = {
+    "default": {
+        "BACKEND": CACHE_BACKENDS[CACHE_BACKEND],
+        # Several comma-separated servers are allowed for redis/memcached.
+        "LOCATION": (
+            os.getenv("CACHE_LOCATION") or CACHE_LOCATIONS[CACHE_BACKEND]
+        ),
+        "KEY_PREFIX": os.getenv("CACHE_KEY_PREFIX") or "spa",
+    }
+}
+
+COMMENTS_CACHE_ALIAS = "default"
+# Single-flight recompute: lock lifetime, wait for the lock holder and poll.
+COMMENTS_CACHE_LOCK_TIMEOUT = 30
+COMMENTS_CACHE_LOCK_WAIT = 5
+COMMENTS_CACHE_LOCK_POLL_INTERVAL = 0.05
+COMMENTS_THREAD_CACHE_TIMEOUT = 60 * 60 * 24
+# Full list pages are also invalidated by every new comment.
+COMMENTS_PAGE_CACHE_TIMEOUT = 60 * 10
+COMMENTS_CURSOR_PAGINATION = os.getenv("COMMENTS_CURSOR_PAGINATION") == "1"
+COMMENTS_ROOT_COUNT_TIMEOUT = 60 * 10
+COMMENTS_MAX_PAGES = None
+COMMENTS_INLINE_DEPTH = 3
+COMMENTS_INLINE_REPLIES = 10
+COMMENTS_LIST_SHARED_MAX_AGE = 10
+COMMENTS_CAPTCHA_PRUNE_BATCH_SIZE = 1000
+# Seconds between in-process sweeps of expired captchas (0 - disabled).
+# The threads are started by the WSGI/ASGI entry points (spa/wsgi.py).
+COMMENTS_CAPTCHA_SWEEP_INTERVAL = int(
+    os.getenv("COMMENTS_CAPTCHA_SWEEP_INTERVAL", "0")
+)
+# Data of an invalid form is kept in a signed cookie (or in the cache).
+COMMENTS_FORM_DATA_COOKIE_MAX_SIZE = 2048
+COMMENTS_FORM_DATA_MAX_SIZE = 64 * 1024
+COMMENTS_FORM_DATA_TIMEOUT = 60 * 10
+# Maximum decoded size of the resized image sent as a data URL.
+COMMENTS_CANVAS_MAX_SIZE = 1024 * 1024
+# Server-side optimization of attached images.
+COMMENTS_IMAGE_FORMAT = "WEBP"  # Or "JPEG".
+COMMENTS_IMAGE_QUALITY = 80
+COMMENTS_IMAGE_WORKERS = 2
+COMMENTS_IMAGE_QUEUE_SIZE = 20
+# Pool of pre-rendered captchas, refilled by a thread or a command.
+COMMENTS_CAPTCHA_POOL_SIZE = int(
+    os.getenv("COMMENTS_CAPTCHA_POOL_SIZE", "200")
+)
+COMMENTS_CAPTCHA_POOL_REFILL_BATCH_SIZE = 50
+COMMENTS_CAPTCHA_POOL_TIMEOUT = 60 * 60
+# Seconds between in-process pool refills (0 - disabled).
+COMMENTS_CAPTCHA_POOL_REFILL_INTERVAL = int(
+    os.getenv("COMMENTS_CAPTCHA_POOL_REFILL_INTERVAL", "0")
+)
+
+# Native async list and create views (enabled by the ASGI entry point).
+COMMENTS_ASYNC_VIEWS = (
+    os.getenv("COMMENTS_ASYNC_VIEWS", os.getenv("SPA_ASGI", "0")) == "1"
+)
+# Threads (and database connections) for blocking work of async views.
+ASYNC_BLOCKING_WORKERS = int(os.getenv("ASYNC_BLOCKING_WORKERS", "8"))
+
 MESSAGE_TAGS = {messages.INFO: "primary", messages.ERROR: "danger"}
 MESSAGE_STORAGE = "django.contrib.messages.storage.cookie.CookieStorage"
 
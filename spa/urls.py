@@ -2,8 +2,9 @@
 
 from django.conf import settings
 from django.urls import path, include
-from django.conf.urls.static import static
 
+from comments.views import CaptchaImageView, CaptchaRefreshView
+from general.media import MediaView
 from general.error_views import (
     CustomBadRequestView,
     CustomNotFoundView,
@@ -14,6 +15,22 @@ handler400 = CustomBadRequestView.as_view()
 handler404 = CustomNotFoundView.as_view()
 
 urlpatterns = [
+    # Override the captcha views to serve pre-rendered pooled challenges.
+    path(
+        "captcha/refresh/",
+        CaptchaRefreshView.as_view(),
+        name="captcha-refresh",
+    ),
+    path(
+        "captcha/image/<str:key>/",
+        CaptchaImageView.as_view(),
+        name="captcha-image",
+    ),
     path("captcha/", include("captcha.urls")),
+    path(
+        f"{settings.MEDIA_URL.lstrip('/')}<path:path>",
+        MediaView.as_view(),
+        name="media",
+    ),
     path("", include("comments.urls")),
-] + static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
+]
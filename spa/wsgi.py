@@ -13,3 +13,8 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "spa.settings")
 
 application = get_wsgi_application()
+
+# Only server processes run the background threads, not management commands.
+from comments.captcha_store import start_captcha_threads  # noqa: E402
+
+start_captcha_threads()
@@ -0,0 +1,29 @@
+// Script to fetch a CAPTCHA challenge only when the user starts filling the form
+const captcha_image = document.querySelector("#comment_form .lazy-captcha");
+const captcha_key = document.querySelector("#comment_form input[name='captcha_0']");
+
+let captcha_loaded = false;
+
+async function load_captcha() {
+	const response = await fetch(captcha_image.dataset.refreshUrl, {
+		headers: { "X-Requested-With": "XMLHttpRequest" },
+	});
+	if (!response.ok) {
+		captcha_loaded = false;
+		return;
+	}
+
+	const challenge = await response.json();
+	captcha_key.value = challenge.key;
+	captcha_image.src = challenge.image_url;
+	captcha_image.hidden = false;
+}
+
+document.getElementById("comment_form").addEventListener("focusin", function () {
+	if (captcha_loaded) return;
+	captcha_loaded = true;
+	load_captcha();
+});
+
+// A click on the image requests a new challenge
+captcha_image.addEventListener("click", load_captcha);
@@ -0,0 +1,17 @@
+// Script to replace a "Show more replies" stub with the next page of replies
+document.addEventListener("click", async function (e) {
+	const button = e.target.closest(".load-replies > button");
+	if (!button) {
+		return;
+	}
+
+	const stub = button.parentElement;
+	button.disabled = true;
+
+	const response = await fetch(stub.dataset.url);
+	if (!response.ok) {
+		button.disabled = false;
+		return;
+	}
+	stub.outerHTML = await response.text();
+});
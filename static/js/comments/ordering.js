@@ -6,7 +6,7 @@ const order_dir = url_params.get("orderdir") || "desc";
 // Script to add .active class for dropdown-item
 const dropdown_items = document.querySelectorAll(".dropdown-item");
 
-let index = { u: 0, e: 1, c: 2 }[order_by];
+let index = { u: 0, e: 1, c: 2, a: 3 }[order_by];
 dropdown_items[index].classList.add("active");
 
 // Script to add .active class for btn of btn-group